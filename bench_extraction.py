@@ -0,0 +1,102 @@
+# 提取流程的微基准：在保存下来的详情页HTML上对比
+#   旧流程：crawl4ai 内置清洗 + markdown生成，再用 BeautifulSoup 重新解析整页并 html2text 转换
+#   新流程：lxml 解析一次定位 mainContent，再 html2text 转换
+# 用法:
+#   python bench_extraction.py --fetch 50          # 从目录文件下载50个详情页到 bench_pages/
+#   python bench_extraction.py                     # 对 bench_pages/ 中的页面做基准测试
+import argparse
+import glob
+import itertools
+import os
+import time
+
+import httpx
+
+from extraction import extract_main_content, extract_main_content_bs4, main_content_to_markdown
+from http_fetch import USER_AGENT
+from url_catalog import iter_catalog
+
+try:
+    from crawl4ai import DefaultMarkdownGenerator, WebScrapingStrategy
+except ImportError:
+    WebScrapingStrategy = None
+
+
+def save_sample_pages(catalog_filename, pages_dir, count):
+    """
+    从目录文件中取前 count 个成功的URL，下载页面HTML保存到 pages_dir
+    """
+    os.makedirs(pages_dir, exist_ok=True)
+    records = (item for item in iter_catalog(catalog_filename) if item.get('final_url', '').startswith('http'))
+    urls = [item['final_url'] for item in itertools.islice(records, count)]
+
+    saved = 0
+    with httpx.Client(timeout=30, follow_redirects=True, headers={"User-Agent": USER_AGENT}) as client:
+        for url in urls:
+            try:
+                response = client.get(url)
+            except httpx.HTTPError as e:
+                print(f"⚠️ 下载失败: {url} - {e}")
+                continue
+            if response.status_code == 200:
+                saved += 1
+                with open(os.path.join(pages_dir, f"{saved:04d}.html"), 'w', encoding='utf-8') as f:
+                    f.write(response.text)
+            time.sleep(0.2)
+    print(f"💾 已保存 {saved} 个页面到 {pages_dir}")
+
+
+def old_extraction(html, url):
+    if WebScrapingStrategy is not None:
+        scraped = WebScrapingStrategy().scrap(url, html, css_selector="#mainContent")
+        DefaultMarkdownGenerator().generate_markdown(input_html=scraped.cleaned_html, base_url=url)
+    page = extract_main_content_bs4(html)
+    return main_content_to_markdown(page['html']) if page else None
+
+
+def new_extraction(html, url):
+    page = extract_main_content(html)
+    return main_content_to_markdown(page['html']) if page else None
+
+
+def time_per_page(extract, pages, rounds):
+    start = time.process_time()
+    for _ in range(rounds):
+        for html in pages:
+            extract(html, "https://www.cqggzy.com/")
+    return (time.process_time() - start) / (rounds * len(pages)) * 1000
+
+
+def run_benchmark(pages_dir, rounds=3):
+    """
+    对 pages_dir 中的页面分别运行新旧提取流程，打印每页CPU耗时（毫秒）
+    """
+    pages = []
+    for filename in sorted(glob.glob(os.path.join(pages_dir, "*.html"))):
+        with open(filename, 'r', encoding='utf-8') as f:
+            pages.append(f.read())
+    if not pages:
+        print(f"❌ {pages_dir} 中没有页面，请先使用 --fetch 下载")
+        return None
+
+    old_ms = time_per_page(old_extraction, pages, rounds)
+    new_ms = time_per_page(new_extraction, pages, rounds)
+    old_label = "crawl4ai清洗+markdown, BeautifulSoup, html2text" if WebScrapingStrategy is not None else "BeautifulSoup, html2text (未安装crawl4ai)"
+    print(f"📄 页面数: {len(pages)}，轮数: {rounds}")
+    print(f"🐢 旧流程 ({old_label}): {old_ms:.2f} ms/页")
+    print(f"⚡ 新流程 (lxml, html2text): {new_ms:.2f} ms/页")
+    print(f"📉 每页节省CPU: {old_ms - new_ms:.2f} ms ({(old_ms - new_ms) / old_ms * 100:.1f}%)")
+    return {"pages": len(pages), "old_ms_per_page": old_ms, "new_ms_per_page": new_ms}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="mainContent 提取流程微基准")
+    parser.add_argument("--pages-dir", default="bench_pages")
+    parser.add_argument("--fetch", type=int, default=0, help="先从目录文件下载指定数量的页面")
+    parser.add_argument("--catalog", default="jyjg_final_urls.json")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.fetch:
+        save_sample_pages(args.catalog, args.pages_dir, args.fetch)
+    run_benchmark(args.pages_dir, args.rounds)
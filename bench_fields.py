@@ -0,0 +1,193 @@
+# 结构化字段提取的基准：
+#   提取：在已解析的 mainContent 元素上找出字段原始文本的CPU耗时（每页）
+#   规范化：金额 / 日期文本转换为数值和日期，对比逐行Python（re + datetime）和 pandas / NumPy 批量处理
+# 页面来自 bench_pages/（python bench_extraction.py --fetch N 下载），按 --documents 循环扩展为完整语料；
+# 没有页面时使用生成的公告。--output-dir 指定爬取输出目录时，规范化基准使用其中已保存的全部原始文本
+# 用法:
+#   python bench_fields.py                               # 20000 篇公告
+#   python bench_fields.py --documents 50000
+#   python bench_fields.py --output-dir crawl_results_break_20250603_101010
+import argparse
+import glob
+import itertools
+import os
+import random
+import re
+import sqlite3
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from extraction import extract_main_content
+from field_extraction import DATE_PART, MONEY_NUMBER, RAW_FIELDS, extract_fields, fields_filename, normalize_fields
+
+
+def synthetic_page(i, rng):
+    """
+    生成一个详情页：标签行、横向表格和候选人表格三种版式轮换，金额单位混用元和万元
+    """
+    code = f"WZQ25A{i:05d}"
+    day = date(2025, rng.randint(1, 12), rng.randint(1, 28))
+    budget = rng.randint(10000, 50000000) / 100
+    amount = budget * rng.uniform(0.8, 1.0)
+    company = f"重庆{rng.choice(['建工', '交通', '水利', '信息', '环境'])}{rng.choice(['集团', '有限公司', '股份有限公司'])}{i % 97}"
+    layout = i % 3
+    if layout == 0:
+        body = (f"<p>一、项目名称：职工之家设施设备项目包{i}</p><p>二、项目编号：{code}</p>"
+                f"<p>三、预算金额（万元）：{budget / 10000:.4f}</p><p>采购人：重庆市某某局{i % 31} 联系人：张三</p>"
+                f"<p>采购代理机构：</p><p>重庆某招标代理有限公司</p><p>中标供应商：{company}</p>"
+                f"<p>中标金额：¥{amount:,.2f}元</p><p>公示期：{day:%Y年%m月%d日}至{day:%Y年%m月}{day.day + 2:02d}日</p>")
+    elif layout == 1:
+        body = (f"<table><tr><td>项目名称</td><td>道路改造工程{i}</td><td>招标编号</td><td>{code}</td></tr>"
+                f"<tr><td>招标人</td><td>某区交通局</td><td>招标代理机构</td><td>丁咨询公司</td></tr>"
+                f"<tr><td>最高限价</td><td>{budget:.2f}元</td><td>开标时间</td><td>{day:%Y-%m-%d} 09:30</td></tr></table>"
+                f"<table><tr><th>排名</th><th>中标候选人名称</th><th>投标报价(万元)</th></tr>"
+                f"<tr><td>第一名</td><td>{company}</td><td>{amount / 10000:.4f}</td></tr>"
+                f"<tr><td>第二名</td><td>其他公司</td><td>{budget / 10000:.4f}</td></tr></table>")
+    else:
+        body = (f"<p>采购项目名称：设备采购({code})</p><p>采购单位：某医院</p><br>"
+                f"<p>采购预算：壹佰万元整（小写：{budget:.2f}元）</p><p>成交供应商：{company}</p>"
+                f"<p>成交金额：{amount / 10000:.2f}万元</p><p>发布日期：{day:%Y/%m/%d}</p>")
+    return f"<html><head><title>公告{i}</title></head><body><div id='mainContent'>{body}</div></body></html>"
+
+
+def load_pages(pages_dir, documents, seed=1):
+    pages = []
+    for filename in sorted(glob.glob(os.path.join(pages_dir, "*.html"))):
+        with open(filename, 'r', encoding='utf-8') as f:
+            pages.append(f.read())
+    if pages:
+        print(f"📄 使用 {pages_dir} 中的 {len(pages)} 个页面，循环扩展为 {documents} 篇")
+        return list(itertools.islice(itertools.cycle(pages), documents))
+    print(f"📄 {pages_dir} 中没有页面，生成 {documents} 篇公告")
+    rng = random.Random(seed)
+    return [synthetic_page(i, rng) for i in range(documents)]
+
+
+def money_python(text):
+    """
+    逐行版本的金额规范化，与 field_extraction.normalize_money 结果一致，作为对比基准
+    """
+    if not isinstance(text, str) or not text:
+        return float("nan")
+    text = re.sub(r"[\s　]", "", text)
+    if re.search(r"%|％|下浮|费率|折扣", text):
+        return float("nan")
+    match = re.search(r"(?:小写|[¥￥])[：:]?" + MONEY_NUMBER, text) or re.search(MONEY_NUMBER, text)
+    if not match:
+        return float("nan")
+    amount = float(match.group(1).replace(",", "").replace("，", ""))
+    unit = match.group(2)
+    if (unit or "").startswith("万") or (unit is None and "万元" in text):
+        amount *= 10000
+    return amount
+
+
+def date_python(text, last=False):
+    if not isinstance(text, str) or not text:
+        return pd.NaT
+    match = re.search((r".*" if last else "") + DATE_PART, text)
+    if not match:
+        return pd.NaT
+    try:
+        return pd.Timestamp(date(int(match.group(1)), int(match.group(2)), int(match.group(3))))
+    except ValueError:
+        return pd.NaT
+
+
+def normalize_python(raw):
+    rows = []
+    for record in raw.to_dict("records"):
+        rows.append({
+            "budget": money_python(record["budget"]),
+            "winning_amount": money_python(record["winning_amount"]),
+            "publish_date": date_python(record["publish_date"]),
+            "bid_open_date": date_python(record["bid_open_date"]),
+            "notice_start": date_python(record["notice_period"]),
+            "notice_end": date_python(record["notice_period"], last=True),
+        })
+    return pd.DataFrame(rows)
+
+
+def bench_extraction(pages):
+    """
+    提取阶段：解析页面（抓取时与markdown转换共用）和字段提取分别计时
+
+    Returns:
+        pandas.DataFrame: 原始文本表
+    """
+    parse_seconds = extract_seconds = 0.0
+    rows = []
+    for i, html in enumerate(pages):
+        start = time.process_time()
+        page = extract_main_content(html)
+        parse_seconds += time.process_time() - start
+        if page is None:
+            continue
+        start = time.process_time()
+        fields = extract_fields(page["element"], page["title"])
+        extract_seconds += time.process_time() - start
+        rows.append({"url_index": i + 1, "url": "", "title": page["title"], **fields})
+    print(f"🔍 页面解析 (与markdown转换共用): {parse_seconds / len(pages) * 1000:.3f} ms/页")
+    print(f"🔍 字段提取: {extract_seconds / len(pages) * 1000:.3f} ms/页，"
+          f"{len(pages)} 篇合计 {extract_seconds:.2f} 秒")
+    return pd.DataFrame(rows, columns=["url_index", "url", "title"] + list(RAW_FIELDS))
+
+
+def load_raw_fields(output_dir):
+    """
+    从输出目录的字段表中读取原始文本
+    """
+    conn = sqlite3.connect(fields_filename(output_dir))
+    try:
+        raw = pd.read_sql(
+            "SELECT url_index, url, title, project_name, project_code, purchaser, agency, budget_text AS budget, "
+            "winning_bidder, winning_amount_text AS winning_amount, publish_date_text AS publish_date, "
+            "bid_open_date_text AS bid_open_date, notice_period_text AS notice_period FROM announcement_fields", conn)
+    finally:
+        conn.close()
+    print(f"📄 使用 {output_dir} 中的 {len(raw)} 条字段记录")
+    return raw
+
+
+def bench_normalization(raw, rounds=3):
+    """
+    规范化阶段：逐行Python与批量处理对比，并检查两者结果一致
+    """
+    start = time.perf_counter()
+    for _ in range(rounds):
+        expected = normalize_python(raw)
+    python_seconds = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        frame = normalize_fields(raw)
+    vectorized_seconds = (time.perf_counter() - start) / rounds
+
+    for column in ("budget", "winning_amount"):
+        assert np.allclose(frame[column].to_numpy(), expected[column].to_numpy(), equal_nan=True), column
+    for column in ("bid_open_date", "notice_start", "notice_end"):
+        assert frame[column].reset_index(drop=True).astype("datetime64[ns]").equals(expected[column].astype("datetime64[ns]")), column
+
+    print(f"🐢 逐行Python: {python_seconds * 1000:.1f} ms ({len(raw) / python_seconds:,.0f} 条/秒)")
+    print(f"⚡ pandas / NumPy 批量: {vectorized_seconds * 1000:.1f} ms ({len(raw) / vectorized_seconds:,.0f} 条/秒)")
+    print(f"📉 加速: {python_seconds / vectorized_seconds:.1f}x")
+    print(f"💰 金额识别: 预算 {frame['budget'].notna().sum()}，中标金额 {frame['winning_amount'].notna().sum()} / {len(frame)}")
+    return {"records": len(raw), "python_seconds": python_seconds, "vectorized_seconds": vectorized_seconds}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="结构化字段提取基准")
+    parser.add_argument("--pages-dir", default="bench_pages")
+    parser.add_argument("--documents", type=int, default=20000)
+    parser.add_argument("--output-dir", help="使用爬取输出目录中已保存的字段原始文本做规范化基准")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.output_dir:
+        raw_fields = load_raw_fields(args.output_dir)
+    else:
+        raw_fields = bench_extraction(load_pages(args.pages_dir, args.documents))
+    bench_normalization(raw_fields, args.rounds)
@@ -0,0 +1,98 @@
+# 内容管道的去重：爬取前按 final_url 合并重复条目，爬取后按规范化markdown的哈希
+# 合并相同正文（同一公告以新ID重新发布），相同正文只保存一份，其余记录引用第一份
+import hashlib
+import json
+import os
+import re
+from urllib.parse import urlsplit, urlunsplit
+
+CONTENT_INDEX_FILENAME = "content_hashes.json"
+
+BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+
+
+def new_dedup_stats():
+    """
+    创建去重统计字典
+    """
+    return {
+        "duplicate_urls": 0,      # 爬取前合并的重复URL
+        "duplicate_contents": 0,  # 爬取后发现正文相同、只保存引用的记录
+    }
+
+
+def normalize_url(url):
+    """
+    规范化URL：去掉首尾空白和 #片段，主机名转小写
+    """
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ""))
+
+
+def is_new_url(item, seen_urls, stats=None):
+    """
+    条目的 final_url 是否第一次出现（没有 final_url 的条目总是保留），并记入 seen_urls
+    """
+    final_url = item.get('final_url')
+    if not final_url:
+        return True
+    key = normalize_url(final_url)
+    if key in seen_urls:
+        if stats is not None:
+            stats["duplicate_urls"] += 1
+        return False
+    seen_urls.add(key)
+    return True
+
+
+def iter_dedup_urls(records, stats=None):
+    """
+    按 final_url 去重的生成器，保留第一次出现的条目和原有顺序；没有 final_url 的条目原样保留
+
+    只保存已出现URL的集合，不保存条目本身，可用于流式读取的目录
+    """
+    seen_urls = set()
+    for item in records:
+        if is_new_url(item, seen_urls, stats):
+            yield item
+
+
+def dedup_url_list(url_list, stats=None):
+    """
+    按 final_url 去重，保留第一次出现的条目和原有顺序；没有 final_url 的条目原样保留
+
+    Returns:
+        list: 去重后的列表
+    """
+    return list(iter_dedup_urls(url_list, stats))
+
+
+def normalize_markdown(content):
+    """
+    规范化markdown：去掉每行首尾空白，合并多余空行
+    """
+    lines = [line.strip() for line in content.replace('\r\n', '\n').split('\n')]
+    return BLANK_LINES_PATTERN.sub('\n\n', '\n'.join(lines)).strip()
+
+
+def markdown_hash(content):
+    return hashlib.sha256(normalize_markdown(content).encode('utf-8')).hexdigest()
+
+
+def load_content_index(output_dir):
+    """
+    读取输出目录中的正文哈希索引 {哈希: 第一次保存的文件相对路径}，断点续传时沿用
+    """
+    index_file = os.path.join(output_dir, CONTENT_INDEX_FILENAME)
+    if not os.path.exists(index_file):
+        return {}
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_content_index(output_dir, content_index):
+    with open(os.path.join(output_dir, CONTENT_INDEX_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(content_index, f, ensure_ascii=False, indent=2)
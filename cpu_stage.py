@@ -0,0 +1,74 @@
+# CPU阶段：把 mainContent 提取和 html2text 转换放到 ProcessPoolExecutor 中执行，
+# 避免大表格页面阻塞事件循环；同时限制等待转换的页面数量，转换跟不上时让抓取端等待（背压）
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from extraction import convert_page
+
+
+def new_conversion_stats():
+    """
+    创建CPU阶段统计字典
+    """
+    return {
+        "converted": 0,          # 完成的转换次数
+        "convert_seconds": 0.0,  # 转换耗时合计（含进程间传输）
+        "wait_seconds": 0.0,     # 等待转换名额的时间合计（背压）
+    }
+
+
+class ConversionPool:
+    """
+    页面转换进程池
+
+    最多 max_pending 个页面同时处于“已提交或正在转换”状态，
+    更多的页面在 convert() 处等待，调用方（抓取任务）因此不会继续发起新的请求。
+    workers 为 0 时在当前进程内直接转换（不启动进程池）。
+    """
+
+    def __init__(self, workers=None, max_pending=None):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_pending = max_pending or max(1, self.workers) * 2
+        self.stats = new_conversion_stats()
+        self._pending = asyncio.Semaphore(self.max_pending)
+        # 使用 spawn 启动，避免子进程继承浏览器和事件循环的状态
+        self._executor = (
+            ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            if self.workers > 0 else None
+        )
+
+    async def convert(self, html, known_hash=None, require_text=True):
+        """
+        提取并转换页面，参数和返回值见 extraction.convert_page
+        """
+        wait_start = time.perf_counter()
+        async with self._pending:
+            convert_start = time.perf_counter()
+            self.stats["wait_seconds"] += convert_start - wait_start
+            if self._executor is None:
+                page = convert_page(html, known_hash, require_text)
+            else:
+                loop = asyncio.get_running_loop()
+                page = await loop.run_in_executor(self._executor, convert_page, html, known_hash, require_text)
+            self.stats["convert_seconds"] += time.perf_counter() - convert_start
+            self.stats["converted"] += 1
+            return page
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
+def print_conversion_stats(pool):
+    """
+    打印CPU阶段统计
+    """
+    stats = pool.stats
+    if not stats["converted"]:
+        return
+    print(f"🧮 转换进程: {pool.workers}，最多待转换页面: {pool.max_pending}，"
+          f"已转换 {stats['converted']} 页，平均 {stats['convert_seconds'] / stats['converted'] * 1000:.1f} ms/页")
+    print(f"   等待转换名额 (背压) 合计: {stats['wait_seconds']:.1f} 秒")
@@ -0,0 +1,45 @@
+# crawl4ai 的轻量运行配置：只负责渲染页面并返回HTML，
+# 关闭内置的HTML清洗、链接/媒体提取和markdown生成，由 extraction.py 统一提取和转换
+from crawl4ai import CacheMode, ContentScrapingStrategy, CrawlerRunConfig, MarkdownGenerationResult
+from crawl4ai.markdown_generation_strategy import MarkdownGenerationStrategy
+from crawl4ai.models import ScrapingResult
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+
+class PassthroughScrapingStrategy(ContentScrapingStrategy):
+    """
+    不解析HTML：不生成 cleaned_html，不提取链接、媒体和元数据
+    """
+
+    def scrap(self, url, html, **kwargs):
+        return ScrapingResult(cleaned_html="", success=True)
+
+    async def ascrap(self, url, html, **kwargs):
+        return self.scrap(url, html, **kwargs)
+
+
+class NoMarkdownGenerator(MarkdownGenerationStrategy):
+    """
+    不生成markdown，返回空结果
+    """
+
+    def generate_markdown(self, input_html, base_url="", html2text_options=None, content_filter=None,
+                          citations=True, **kwargs):
+        return MarkdownGenerationResult(raw_markdown="", markdown_with_citations="", references_markdown="")
+
+
+def lean_run_config(page_timeout=30000, user_agent=USER_AGENT):
+    """
+    生成只渲染页面的 CrawlerRunConfig：等待 #mainContent 出现，不使用crawl4ai自带缓存
+    （重新验证由 response_cache.py 负责）
+    """
+    return CrawlerRunConfig(
+        wait_for="css:#mainContent",
+        page_timeout=page_timeout,
+        user_agent=user_agent,
+        scraping_strategy=PassthroughScrapingStrategy(),
+        markdown_generator=NoMarkdownGenerator(),
+        cache_mode=CacheMode.BYPASS,
+        verbose=False,
+    )
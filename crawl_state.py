@@ -0,0 +1,238 @@
+# 按URL记录的爬取状态：每个URL完成后立即提交到 <输出目录>/crawl_state.sqlite，
+# 中断后只处理剩余的URL，批次内已完成的页面不再重新抓取，成功/失败数量按实际结果统计
+# 状态: pending（等待） / in_flight（处理中） / retry（失败后等待重试） / done（成功） / failed（失败）；
+# saved 表示所在批次已写入结果文件（或 crawl_store），此后不再保留正文
+# 用法（查看状态）: python crawl_state.py <输出目录>
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+STATE_FILENAME = "crawl_state.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS url_state (
+    url_index INTEGER PRIMARY KEY,
+    url TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    saved INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    started_at TEXT,
+    finished_at TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS url_state_saved ON url_state (saved, url_index);
+"""
+
+
+def state_filename(output_dir):
+    return os.path.join(output_dir, STATE_FILENAME)
+
+
+def now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class CrawlState:
+    """
+    URL级别的爬取状态
+
+    url_index 为URL在（去重后的）列表中的序号，从 1 开始，与批次文件编号一致。
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        # WAL + NORMAL: 进程崩溃不会丢失已提交的URL，每次提交也不需要等待 fsync
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def reset(self):
+        """
+        清除所有URL的状态（重新爬取已完成的输出目录时使用）
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM url_state")
+
+    def register(self, url_list, start_index=0):
+        """
+        登记URL：尚未记录的序号添加 pending 状态；序号上记录的URL与目录中的不一致时
+        （中断后目录插入或删除了条目，例如每日增量更新在开头加入新公告），该序号的状态作废，重新抓取
+
+        Args:
+            url_list: URL信息列表（可以是迭代器）
+            start_index: 第一个URL在总列表中的索引，流水线模式下逐条登记时使用
+
+        Returns:
+            int: 新增或重置的URL数量
+        """
+        with self.conn:
+            cursor = self.conn.executemany(
+                "INSERT INTO url_state (url_index, url) VALUES (?, ?) "
+                "ON CONFLICT (url_index) DO UPDATE SET url = excluded.url, status = 'pending', attempts = 0, "
+                "saved = 0, error = NULL, started_at = NULL, finished_at = NULL, result = NULL "
+                "WHERE url_state.url IS NOT excluded.url",
+                ((start_index + i + 1, item.get('final_url', '')) for i, item in enumerate(url_list)),
+            )
+        return cursor.rowcount
+
+    def truncate(self, count):
+        """
+        删除序号大于 count 的URL（目录变短时）
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM url_state WHERE url_index > ?", (count,))
+
+    def registered_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM url_state").fetchone()[0]
+
+    def recover(self):
+        """
+        上次运行中断时仍在处理中或等待重试的URL恢复为 pending
+
+        Returns:
+            int: 恢复的URL数量
+        """
+        with self.conn:
+            cursor = self.conn.execute("UPDATE url_state SET status = 'pending' WHERE status IN ('in_flight', 'retry')")
+        return cursor.rowcount
+
+    def mark_legacy_saved(self, processed_count):
+        """
+        旧版本（只有 progress_log.json）的输出目录：前 processed_count 个URL视为已完成并已保存
+        """
+        with self.conn:
+            self.conn.execute(
+                "UPDATE url_state SET status = 'done', saved = 1, finished_at = ? WHERE url_index <= ? AND saved = 0",
+                (now(), processed_count),
+            )
+
+    def mark_in_flight(self, url_index):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE url_state SET status = 'in_flight', attempts = attempts + 1, started_at = ? WHERE url_index = ?",
+                (now(), url_index),
+            )
+
+    def mark_finished(self, url_index, result):
+        """
+        提交一个URL的结果（包括正文，批次保存后清除）
+        """
+        with self.conn:
+            self.conn.execute(
+                "UPDATE url_state SET status = ?, error = ?, finished_at = ?, result = ? WHERE url_index = ?",
+                ('done' if result['success'] else 'failed', result.get('error'), now(),
+                 json.dumps(result, ensure_ascii=False), url_index),
+            )
+
+    def mark_retry(self, url_index, result):
+        """
+        记录失败并等待重试，不保存结果
+        """
+        with self.conn:
+            self.conn.execute(
+                "UPDATE url_state SET status = 'retry', error = ?, finished_at = ? WHERE url_index = ?",
+                (result.get('error'), now(), url_index),
+            )
+
+    def finished_results(self, first_index, last_index):
+        """
+        取出 [first_index, last_index] 范围内已完成但所在批次尚未保存的结果
+
+        Returns:
+            dict: {url_index: (登记的URL, 结果字典)}，结果带有 resumed 标记；
+                  调用方需确认URL与本次目录中同一序号的URL一致后再使用
+        """
+        rows = self.conn.execute(
+            "SELECT url_index, url, result FROM url_state WHERE url_index BETWEEN ? AND ? AND saved = 0 "
+            "AND status IN ('done', 'failed') AND result IS NOT NULL",
+            (first_index, last_index),
+        )
+        finished = {}
+        for row in rows:
+            result = json.loads(row['result'])
+            result['resumed'] = True
+            finished[row['url_index']] = (row['url'], result)
+        return finished
+
+    def mark_saved(self, first_index, last_index):
+        """
+        批次结果已保存：标记 saved 并清除状态库中的正文，只保留元数据
+        """
+        with self.conn:
+            rows = self.conn.execute(
+                "SELECT url_index, result FROM url_state WHERE url_index BETWEEN ? AND ? AND result IS NOT NULL",
+                (first_index, last_index),
+            ).fetchall()
+            for row in rows:
+                result = json.loads(row['result'])
+                result.pop('content', None)
+                self.conn.execute("UPDATE url_state SET result = ? WHERE url_index = ?",
+                                  (json.dumps(result, ensure_ascii=False), row['url_index']))
+            self.conn.execute("UPDATE url_state SET saved = 1 WHERE url_index BETWEEN ? AND ?", (first_index, last_index))
+
+    def first_unsaved_index(self):
+        """
+        第一个所在批次尚未保存的URL序号，全部保存后返回 None
+        """
+        row = self.conn.execute("SELECT MIN(url_index) FROM url_state WHERE saved = 0").fetchone()
+        return row[0]
+
+    def saved_results(self):
+        """
+        已保存URL的结果元数据（不含正文），按序号排列
+        """
+        results = []
+        for row in self.conn.execute("SELECT url_index, url, status, error, result FROM url_state WHERE saved = 1 ORDER BY url_index"):
+            if row['result']:
+                results.append(json.loads(row['result']))
+            else:
+                results.append({'success': row['status'] == 'done', 'url': row['url'], 'error': row['error']})
+        return results
+
+    def saved_counts(self, last_index):
+        """
+        序号不超过 last_index 的已保存URL中成功和失败的数量（只统计状态，不读取结果）
+
+        Returns:
+            tuple: (成功数量, 失败数量)
+        """
+        counts = dict(self.conn.execute(
+            "SELECT status, COUNT(*) FROM url_state WHERE saved = 1 AND url_index <= ? GROUP BY status", (last_index,)
+        ).fetchall())
+        return counts.get('done', 0), counts.get('failed', 0)
+
+    def counts(self):
+        """
+        各状态的URL数量，以及已保存的成功/失败数量
+        """
+        counts = {"pending": 0, "in_flight": 0, "retry": 0, "done": 0, "failed": 0, "saved_done": 0, "saved_failed": 0}
+        for row in self.conn.execute("SELECT status, saved, COUNT(*) FROM url_state GROUP BY status, saved"):
+            counts[row[0]] += row[2]
+            if row[1]:
+                counts["saved_" + row[0]] = counts.get("saved_" + row[0], 0) + row[2]
+        return counts
+
+
+def print_state_counts(counts):
+    print(f"📌 URL状态: 等待 {counts['pending']}，处理中 {counts['in_flight']}，等待重试 {counts['retry']}，"
+          f"成功 {counts['done']}，失败 {counts['failed']}（已保存: 成功 {counts['saved_done']}，失败 {counts['saved_failed']}）")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("用法: python crawl_state.py <输出目录>")
+        sys.exit(1)
+    if not os.path.exists(state_filename(sys.argv[1])):
+        print(f"❌ 没有找到状态文件: {state_filename(sys.argv[1])}")
+        sys.exit(1)
+    state = CrawlState(state_filename(sys.argv[1]))
+    print_state_counts(state.counts())
+    state.close()
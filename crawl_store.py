@@ -0,0 +1,360 @@
+# 单次写入的爬取结果存储：每个页面的元数据和正文只写入一次 SQLite（正文按规范化哈希去重并 zlib 压缩），
+# 单页markdown、批次汇总和最终汇总都由渲染函数按需生成，不再在爬取过程中重复写入
+# 用法:
+#   python crawl_store.py stats <输出目录或数据库>             # 磁盘占用和写放大
+#   python crawl_store.py export <数据库> <导出目录> [--batch N]  # 生成 markdown 视图
+#   python crawl_store.py show <数据库> <序号>                  # 打印单个页面
+import argparse
+import os
+import sqlite3
+import sys
+import zlib
+from datetime import datetime
+
+from content_dedup import markdown_hash
+
+STORE_FILENAME = "crawl_store.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contents (
+    hash TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    raw_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    url_index INTEGER PRIMARY KEY,
+    batch_num INTEGER NOT NULL,
+    name TEXT,
+    source TEXT,
+    url TEXT,
+    title TEXT,
+    success INTEGER NOT NULL,
+    error TEXT,
+    element_found INTEGER,
+    fetch_method TEXT,
+    content_hash TEXT,
+    raw_size INTEGER NOT NULL DEFAULT 0,
+    crawled_at TEXT
+);
+CREATE INDEX IF NOT EXISTS documents_batch ON documents (batch_num);
+CREATE INDEX IF NOT EXISTS documents_hash ON documents (content_hash);
+CREATE INDEX IF NOT EXISTS documents_url ON documents (url);
+"""
+
+
+def store_filename(output_dir):
+    return os.path.join(output_dir, STORE_FILENAME)
+
+
+def document_filename(batch_num, url_index, name):
+    """
+    单页markdown视图的相对路径，与 save_batch_results 的文件命名一致
+    """
+    safe_name = (name or 'unknown').replace('/', '_').replace(' ', '_')
+    return f"batch_{batch_num:03d}/{url_index:03d}_{safe_name}.md"
+
+
+class CrawlStore:
+    """
+    SQLite 结果存储
+
+    documents 表每个URL一行（按全局序号 url_index，重跑批次时覆盖），
+    contents 表按规范化markdown哈希保存压缩后的正文，相同正文只存一份。
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def first_document_with_hash(self, content_hash, url_index):
+        row = self.conn.execute(
+            "SELECT url_index, batch_num, name FROM documents WHERE content_hash = ? AND url_index < ? "
+            "ORDER BY url_index LIMIT 1",
+            (content_hash, url_index),
+        ).fetchone()
+        return row
+
+    def save_batch(self, results, batch_num, start_index):
+        """
+        在一个事务中保存一个批次的结果；正文与更早的页面相同时在结果中标记 duplicate_of
+
+        Args:
+            results: 爬取结果列表
+            batch_num: 批次号
+            start_index: 当前批次在总URL列表中的起始索引
+
+        Returns:
+            int: 成功数量
+        """
+        crawled_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        successful_count = 0
+        with self.conn:
+            for i, result in enumerate(results):
+                url_index = start_index + i + 1
+                content_hash = None
+                raw_size = 0
+                if result['success']:
+                    successful_count += 1
+                    data = result['content'].encode('utf-8')
+                    raw_size = len(data)
+                    content_hash = markdown_hash(result['content'])
+                    result['file'] = document_filename(batch_num, url_index, result.get('name'))
+                    first = self.first_document_with_hash(content_hash, url_index)
+                    if first is not None:
+                        result['duplicate_of'] = document_filename(first['batch_num'], first['url_index'], first['name'])
+                    body = zlib.compress(data)
+                    self.conn.execute(
+                        "INSERT OR IGNORE INTO contents (hash, body, raw_size, stored_size) VALUES (?, ?, ?, ?)",
+                        (content_hash, body, raw_size, len(body)),
+                    )
+                if result.get('url'):
+                    # 目录插入或删除条目后同一URL换了序号：删除旧序号上的记录，避免一个页面出现两次
+                    self.conn.execute("DELETE FROM documents WHERE url = ? AND url_index != ?", (result['url'], url_index))
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO documents (url_index, batch_num, name, source, url, title, success, error, "
+                    "element_found, fetch_method, content_hash, raw_size, crawled_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (url_index, batch_num, result.get('name'), result.get('source'), result.get('url'),
+                     result.get('title'), 1 if result['success'] else 0, result.get('error'),
+                     1 if result.get('element_found') else 0, result.get('fetch_method'), content_hash,
+                     raw_size, crawled_at),
+                )
+        return successful_count
+
+    def iter_documents(self, batch_num=None):
+        """
+        按序号遍历页面记录（不含正文）
+        """
+        if batch_num is None:
+            return self.conn.execute("SELECT * FROM documents ORDER BY url_index")
+        return self.conn.execute("SELECT * FROM documents WHERE batch_num = ? ORDER BY url_index", (batch_num,))
+
+    def get_document(self, url_index):
+        return self.conn.execute("SELECT * FROM documents WHERE url_index = ?", (url_index,)).fetchone()
+
+    def get_content(self, content_hash):
+        row = self.conn.execute("SELECT body FROM contents WHERE hash = ?", (content_hash,)).fetchone()
+        return zlib.decompress(row['body']).decode('utf-8') if row else None
+
+    def batch_numbers(self):
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT batch_num FROM documents ORDER BY batch_num")]
+
+    def stats(self):
+        """
+        存储统计：页面数、逻辑正文大小、实际存储大小和写放大
+
+        写放大 = 数据库文件（含WAL）大小 / 所有成功页面的markdown原始大小
+        """
+        # 先把WAL合并回主文件，磁盘占用只统计数据库本身
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        documents = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(success), 0), COALESCE(SUM(raw_size), 0) FROM documents"
+        ).fetchone()
+        contents = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) FROM contents"
+        ).fetchone()
+        disk_bytes = sum(os.path.getsize(path) for path in (self.db_path, self.db_path + "-wal") if os.path.exists(path))
+        logical_bytes = documents[2]
+        return {
+            "documents": documents[0],
+            "successful": documents[1],
+            "unique_contents": contents[0],
+            "logical_bytes": logical_bytes,
+            "unique_raw_bytes": contents[1],
+            "stored_bytes": contents[2],
+            "disk_bytes": disk_bytes,
+            "files": 1,
+            "write_amplification": disk_bytes / logical_bytes if logical_bytes else 0,
+        }
+
+
+def directory_stats(output_dir):
+    """
+    旧的文件存储（单页md + 批次汇总 + 最终汇总）的磁盘占用和写放大，用于对比
+
+    写放大 = 所有 .md 文件大小 / 单页 .md 文件大小
+    """
+    page_bytes = 0
+    total_bytes = 0
+    files = 0
+    for root, _, filenames in os.walk(output_dir):
+        for filename in filenames:
+            if not filename.endswith('.md'):
+                continue
+            size = os.path.getsize(os.path.join(root, filename))
+            files += 1
+            total_bytes += size
+            if filename[:3].isdigit():
+                page_bytes += size
+    return {
+        "files": files,
+        "logical_bytes": page_bytes,
+        "disk_bytes": total_bytes,
+        "write_amplification": total_bytes / page_bytes if page_bytes else 0,
+    }
+
+
+def print_storage_stats(stats):
+    print(f"🗄️ 文件数: {stats['files']}，磁盘占用: {stats['disk_bytes'] / 1024 / 1024:.2f} MB，"
+          f"正文原始大小: {stats['logical_bytes'] / 1024 / 1024:.2f} MB，写放大: {stats['write_amplification']:.2f}x")
+    if "documents" in stats:
+        print(f"   页面: {stats['documents']} (成功 {stats['successful']})，不同正文: {stats['unique_contents']}，"
+              f"压缩后正文: {stats['stored_bytes'] / 1024 / 1024:.2f} MB")
+
+
+def render_document(store, row):
+    """
+    渲染单页markdown视图（与 save_batch_results 写出的单页文件格式相同）
+    """
+    first = store.first_document_with_hash(row['content_hash'], row['url_index']) if row['content_hash'] else None
+    if first is not None:
+        first_path = document_filename(first['batch_num'], first['url_index'], first['name'])
+        body = f"> 正文与 [{first_path}](../{first_path}) 相同，不重复保存。\n"
+    else:
+        body = store.get_content(row['content_hash'])
+    return f"""# {row['name'] or 'Unknown'}
+
+**来源**: {row['source'] or 'Unknown'}  
+**URL**: {row['url']}  
+**页面标题**: {row['title']}  
+**mainContent元素**: {'已找到' if row['element_found'] else '未找到'}  
+**爬取时间**: {row['crawled_at']}
+
+---
+
+{body}
+"""
+
+
+def render_batch_summary(store, batch_num, f):
+    """
+    渲染批次汇总视图（与 batch_XXX_summary.md 格式相同），写入文件对象 f
+    """
+    rows = list(store.iter_documents(batch_num))
+    successful_count = sum(row['success'] for row in rows)
+    f.write(f"""# 批次 {batch_num} 爬取结果汇总
+
+**批次号**: {batch_num}  
+**处理范围**: {rows[0]['url_index'] if rows else 0} - {rows[-1]['url_index'] if rows else 0}  
+**爬取时间**: {rows[-1]['crawled_at'] if rows else ''}  
+**批次URL数量**: {len(rows)}  
+**成功数量**: {successful_count}  
+**失败数量**: {len(rows) - successful_count}  
+
+## 详细结果
+
+""")
+    for row in rows:
+        status = "✅ 成功" if row['success'] else "❌ 失败"
+        error_msg = f" - {row['error'] or ''}" if not row['success'] else ""
+        first = store.first_document_with_hash(row['content_hash'], row['url_index']) if row['content_hash'] else None
+        duplicate_msg = f" (正文同 {document_filename(first['batch_num'], first['url_index'], first['name'])})" if first else ""
+        f.write(f"{row['url_index']}. {status} | {row['source'] or 'Unknown'} | {row['name'] or 'Unknown'}{error_msg}{duplicate_msg}\n")
+    f.write("\n---\n\n")
+    for row in rows:
+        if row['success']:
+            f.write(f"\n\n{'='*80}\n")
+            f.write(render_document(store, row))
+
+
+def render_final_summary(store, f):
+    """
+    渲染最终汇总视图，逐条流式写入文件对象 f
+    """
+    stats = store.stats()
+    failed = stats['documents'] - stats['successful']
+    f.write(f"""# 📊 爬取汇总报告
+
+**报告生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
+**已处理URL数量**: {stats['documents']}  
+**✅ 总成功数量**: {stats['successful']}  
+**❌ 总失败数量**: {failed}
+
+## 📋 所有URL详细内容
+
+""")
+    first = True
+    for row in store.iter_documents():
+        if not first:
+            f.write(f"\n\n{'='*80}\n\n")
+        first = False
+        if row['success']:
+            f.write(render_document(store, row))
+        else:
+            f.write(f"""# 失败: {row['name'] or 'Unknown URL'}
+
+**来源**: {row['source'] or 'Unknown'}  
+**URL**: {row['url'] or 'N/A'}  
+**错误**: {row['error'] or 'N/A'}
+
+---
+""")
+
+
+def export_views(store, export_dir, batch_nums=None):
+    """
+    按需生成markdown视图：单页文件、批次汇总，未指定批次时再生成最终汇总
+
+    Returns:
+        int: 生成的单页文件数
+    """
+    count = 0
+    for batch_num in batch_nums or store.batch_numbers():
+        batch_dir = os.path.join(export_dir, f"batch_{batch_num:03d}")
+        os.makedirs(batch_dir, exist_ok=True)
+        for row in store.iter_documents(batch_num):
+            if row['success']:
+                with open(os.path.join(export_dir, document_filename(batch_num, row['url_index'], row['name'])), "w", encoding="utf-8") as f:
+                    f.write(render_document(store, row))
+                count += 1
+        with open(os.path.join(batch_dir, f"batch_{batch_num:03d}_summary.md"), "w", encoding="utf-8") as f:
+            render_batch_summary(store, batch_num, f)
+    if not batch_nums:
+        with open(os.path.join(export_dir, "00_FINAL_SUMMARY.md"), "w", encoding="utf-8") as f:
+            render_final_summary(store, f)
+    print(f"📄 已导出 {count} 个页面到 {export_dir}")
+    return count
+
+
+def open_store_path(path):
+    return store_filename(path) if os.path.isdir(path) else path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="爬取结果存储工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    stats_parser = subparsers.add_parser("stats", help="磁盘占用和写放大")
+    stats_parser.add_argument("path", help="输出目录或数据库文件")
+    export_parser = subparsers.add_parser("export", help="生成markdown视图")
+    export_parser.add_argument("path", help="输出目录或数据库文件")
+    export_parser.add_argument("export_dir")
+    export_parser.add_argument("--batch", type=int, action="append", help="只导出指定批次，可重复")
+    show_parser = subparsers.add_parser("show", help="打印单个页面")
+    show_parser.add_argument("path", help="输出目录或数据库文件")
+    show_parser.add_argument("url_index", type=int)
+    args = parser.parse_args()
+
+    db_path = open_store_path(args.path)
+    if args.command == "stats" and not os.path.exists(db_path):
+        # 没有数据库时按旧的文件存储统计
+        print_storage_stats(directory_stats(args.path))
+        sys.exit(0)
+
+    store = CrawlStore(db_path)
+    try:
+        if args.command == "stats":
+            print_storage_stats(store.stats())
+        elif args.command == "export":
+            export_views(store, args.export_dir, args.batch)
+        elif args.command == "show":
+            row = store.get_document(args.url_index)
+            print(render_document(store, row) if row and row['success'] else f"❌ 没有序号为 {args.url_index} 的成功页面")
+    finally:
+        store.close()
@@ -0,0 +1,97 @@
+# 单次解析提取 #mainContent：用 lxml 解析一次页面，定位 mainContent 和标题，再交给 html2text 转换为markdown；
+# convert_page 是可在进程池中运行的完整CPU阶段（同时在已解析的元素上提取结构化字段，见 field_extraction.py）
+import html2text
+import lxml.etree
+import lxml.html
+from bs4 import BeautifulSoup
+
+from field_extraction import extract_fields
+from response_cache import content_hash
+
+
+def main_content_to_markdown(maincontent_html):
+    """
+    把mainContent元素的HTML转换为markdown
+    """
+    # 设置html2text转换器
+    h = html2text.HTML2Text()
+    h.ignore_links = False
+    h.ignore_images = False
+    h.body_width = 0  # 不限制行宽
+    return h.handle(maincontent_html)
+
+
+def parse_html(html):
+    """
+    用 lxml 解析页面；带编码声明的页面按字节重新解析
+    """
+    try:
+        return lxml.html.fromstring(html)
+    except ValueError:
+        return lxml.html.fromstring(html.encode("utf-8"))
+
+
+def extract_main_content(html, require_text=True):
+    """
+    解析一次页面，提取 #mainContent 的HTML和页面标题
+
+    Args:
+        html: 页面HTML
+        require_text: 为 True 时 mainContent 没有文字也视为未找到
+
+    Returns:
+        dict: {'html': mainContent的HTML, 'title': 页面标题, 'element': mainContent的lxml元素}；元素缺失（或为空）时返回 None
+    """
+    if not html:
+        return None
+    try:
+        document = parse_html(html)
+    except (lxml.etree.ParserError, ValueError):
+        return None
+
+    maincontent_element = document.get_element_by_id("mainContent", None)
+    if maincontent_element is None:
+        return None
+    if require_text and not maincontent_element.text_content().strip():
+        return None
+    title_element = document.find(".//title")
+    title = title_element.text_content().strip() if title_element is not None else "N/A"
+    return {
+        "html": lxml.html.tostring(maincontent_element, encoding="unicode", with_tail=False),
+        "title": title or "N/A",
+        "element": maincontent_element,
+    }
+
+
+def extract_main_content_bs4(html):
+    """
+    旧的提取方式（BeautifulSoup html.parser），仅用于 bench_extraction.py 对比
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    maincontent_element = soup.find(id="mainContent")
+    if maincontent_element is None or not maincontent_element.get_text(strip=True):
+        return None
+    title = soup.title.get_text(strip=True) if soup.title else "N/A"
+    return {"html": str(maincontent_element), "title": title}
+
+
+def convert_page(html, known_hash=None, require_text=True):
+    """
+    CPU阶段：从整页HTML提取 mainContent 并转换为markdown，可在进程池中运行
+
+    Args:
+        html: 整页HTML
+        known_hash: 缓存中记录的 mainContent 哈希，相同时跳过markdown转换
+        require_text: 为 True 时 mainContent 没有文字也视为未找到
+
+    Returns:
+        dict: {'title', 'html_hash', 'content', 'fields'}，content 为 None 表示与 known_hash 相同而未转换，
+              fields 为结构化字段的原始文本（每次都提取）；未找到 mainContent 时返回 None
+    """
+    page = extract_main_content(html, require_text)
+    if page is None:
+        return None
+    html_hash = content_hash(page["html"])
+    content = None if html_hash == known_hash else main_content_to_markdown(page["html"])
+    fields = extract_fields(page["element"], page["title"])
+    return {"title": page["title"], "html_hash": html_hash, "content": content, "fields": fields}
@@ -0,0 +1,375 @@
+# 公告结构化字段提取：在CPU阶段（convert_page）从 #mainContent 元素中找出“标签：值”和表格中的字段，
+# 得到项目名称、项目编号、采购人、代理机构、预算、中标人、中标金额和关键日期的原始文本；
+# 每个批次保存时用 pandas / NumPy 批量把金额（元 / 万元）和日期规范化为数值和日期类型，
+# 写入 <输出目录>/announcement_fields.sqlite（同一序号重新保存时覆盖）
+# 用法:
+#   python field_extraction.py stats <输出目录>           # 各字段的提取率
+#   python field_extraction.py export <输出目录> <CSV文件>  # 导出字段表
+import argparse
+import os
+import re
+import sqlite3
+import sys
+
+import numpy as np
+import pandas as pd
+
+FIELDS_FILENAME = "announcement_fields.sqlite"
+
+# 每个字段可能使用的标签，按优先级排列；比较前去掉空白、编号、冒号和括号中的单位
+FIELD_LABELS = {
+    "project_name": ("项目名称", "采购项目名称", "招标项目名称", "工程名称", "比选项目名称"),
+    "project_code": ("项目编号", "采购项目编号", "招标项目编号", "招标编号", "采购编号", "项目代码", "比选编号"),
+    "purchaser": ("采购人", "采购人名称", "采购单位", "招标人", "招标人名称", "建设单位", "业主单位", "比选人"),
+    "agency": ("采购代理机构", "采购代理机构名称", "招标代理机构", "招标代理机构名称", "代理机构", "代理机构名称", "招标代理"),
+    "budget": ("预算金额", "采购预算", "采购预算金额", "项目预算", "预算", "最高限价", "最高投标限价", "招标控制价"),
+    "winning_bidder": ("中标人", "中标人名称", "中标供应商", "中标供应商名称", "中标单位", "成交供应商", "成交供应商名称",
+                       "成交单位", "成交人", "中选单位", "中选人", "第一中标候选人", "中标候选人名称", "中标候选人"),
+    "winning_amount": ("中标金额", "中标价", "中标价格", "中标报价", "成交金额", "成交价", "成交价格", "中选金额", "中选价",
+                       "合同金额", "投标报价"),
+    "publish_date": ("发布时间", "发布日期", "公告日期", "公告时间", "公示日期"),
+    "bid_open_date": ("开标时间", "开标日期", "响应文件开启时间"),
+    "notice_period": ("公示期", "公示时间", "公示期限"),
+}
+LABEL_FIELDS = {label: field for field, labels in FIELD_LABELS.items() for label in labels}
+RAW_FIELDS = tuple(FIELD_LABELS)
+MONEY_FIELDS = ("budget", "winning_amount")
+DATE_FIELDS = ("publish_date", "bid_open_date")
+
+# 项目编号，例如 WZQ25A00236、WLQ25A00353
+PROJECT_CODE = re.compile(r"[A-Z]{2,5}\d{2}[A-Z]\d{4,6}")
+LABEL_PREFIX = re.compile(r"^[\s　]*(?:[（(]?[一二三四五六七八九十\d]{1,2}[)）、.．]\s*)+")
+LABEL_UNIT = re.compile(r"[（(]([^）)]*)[）)]")
+LABEL_LINE = re.compile(r"^([^：:]{2,20}?)\s*[：:]\s*(.*)$")
+# 同一行中的下一个“标签：”之前为当前值
+NEXT_LABEL = re.compile(r"\s+(?=[^\s：:]{2,12}[：:])")
+BLOCK_TAGS = {"p", "div", "li", "tr", "td", "th", "table", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article", "ul", "ol"}
+
+MONEY_NUMBER = r"[¥￥]?\s*([0-9][0-9,，]*(?:\.[0-9]+)?)\s*(万元|万|元)?"
+# 有“小写”或货币符号时取其后的数字，否则取第一个数字
+MONEY_PATTERN = r"^(?:.*?(?:小写|[¥￥])[：:]?(?=[¥￥]?[0-9])|.*?)" + MONEY_NUMBER
+DATE_PART = r"(\d{4})\s*[年\-/.]\s*(\d{1,2})\s*[月\-/.]\s*(\d{1,2})"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS announcement_fields (
+    url_index INTEGER PRIMARY KEY,
+    url TEXT,
+    title TEXT,
+    project_name TEXT,
+    project_code TEXT,
+    purchaser TEXT,
+    agency TEXT,
+    budget_text TEXT,
+    budget REAL,
+    winning_bidder TEXT,
+    winning_amount_text TEXT,
+    winning_amount REAL,
+    publish_date_text TEXT,
+    publish_date TEXT,
+    bid_open_date_text TEXT,
+    bid_open_date TEXT,
+    notice_period_text TEXT,
+    notice_start TEXT,
+    notice_end TEXT
+);
+CREATE INDEX IF NOT EXISTS announcement_fields_url ON announcement_fields (url);
+"""
+
+
+def fields_filename(output_dir):
+    return os.path.join(output_dir, FIELDS_FILENAME)
+
+
+def normalize_label(text):
+    """
+    标签规范化：去掉编号、空白和冒号，括号中的单位单独返回
+
+    Returns:
+        tuple: (标签, 单位)，例如 "3、预算金额（万元）：" -> ("预算金额", "万元")
+    """
+    text = LABEL_PREFIX.sub("", text or "")
+    unit = LABEL_UNIT.search(text)
+    text = LABEL_UNIT.sub("", text)
+    text = re.sub(r"[\s　:：]+", "", text)
+    return text, (unit.group(1) if unit else "")
+
+
+def clean_value(text):
+    return re.sub(r"[\s　]+", " ", text or "").strip()
+
+
+def element_lines(element):
+    """
+    按块级元素和 <br> 把元素文字切分为行
+    """
+    parts = []
+
+    def walk(node):
+        tag = node.tag if isinstance(node.tag, str) else None
+        block = tag in BLOCK_TAGS
+        if block or tag == "br":
+            parts.append("\n")
+        if tag and node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+        if block:
+            parts.append("\n")
+        if node.tail:
+            parts.append(node.tail)
+
+    walk(element)
+    return [line.strip() for line in "".join(parts).split("\n") if line.strip()]
+
+
+def table_pairs(element):
+    """
+    表格中的（标签, 单位, 值）：同一行中标签单元格后面的单元格为值；
+    第一行为标签的表格（中标候选人列表）取第一条数据行
+    """
+    pairs = []
+    for table in element.iter("table"):
+        rows = [[clean_value(cell.text_content()) for cell in row if cell.tag in ("td", "th")] for row in table.iter("tr")]
+        rows = [row for row in rows if any(row)]
+        for row_index, row in enumerate(rows):
+            labels = [normalize_label(cell) for cell in row]
+            known = [label in LABEL_FIELDS for label, _ in labels]
+            next_row = rows[row_index + 1] if row_index + 1 < len(rows) else []
+            if sum(known) >= 2 and len(next_row) == len(row) and not any(normalize_label(cell)[0] in LABEL_FIELDS for cell in next_row):
+                # 表头行，对应下一行
+                pairs.extend((label, unit, value) for (label, unit), value, is_known in zip(labels, next_row, known) if is_known)
+                continue
+            for i in range(len(row) - 1):
+                if known[i] and row[i + 1]:
+                    pairs.append((labels[i][0], labels[i][1], row[i + 1]))
+    return pairs
+
+
+def line_pairs(lines):
+    """
+    文字行中的（标签, 单位, 值），值为空时取下一行
+    """
+    pairs = []
+    for i, line in enumerate(lines):
+        match = LABEL_LINE.match(line)
+        if not match:
+            continue
+        label, unit = normalize_label(match.group(1))
+        if label not in LABEL_FIELDS:
+            continue
+        value = NEXT_LABEL.split(match.group(2).strip(), 1)[0]
+        if not value and i + 1 < len(lines) and not LABEL_LINE.match(lines[i + 1]):
+            value = lines[i + 1]
+        pairs.append((label, unit, value))
+    return pairs
+
+
+def extract_fields(element, title=""):
+    """
+    从 mainContent 元素中提取字段的原始文本（在 convert_page 中调用，可在进程池中运行）
+
+    Args:
+        element: mainContent 的 lxml 元素
+        title: 页面标题，没有项目编号字段时从标题中查找
+
+    Returns:
+        dict: RAW_FIELDS 中每个字段的原始文本（未找到为 None）；金额的单位写在标签上时补在值后面
+    """
+    fields = dict.fromkeys(RAW_FIELDS)
+    lines = element_lines(element)
+    for label, unit, value in table_pairs(element) + line_pairs(lines):
+        field = LABEL_FIELDS[label]
+        value = clean_value(value)
+        if fields[field] or not value:
+            continue
+        if field in MONEY_FIELDS and "元" not in value and "元" in unit:
+            value += unit
+        fields[field] = value
+
+    if fields["project_code"]:
+        code = PROJECT_CODE.search(fields["project_code"])
+        fields["project_code"] = code.group(0) if code else fields["project_code"]
+    else:
+        code = PROJECT_CODE.search(title or "") or PROJECT_CODE.search(" ".join(lines))
+        fields["project_code"] = code.group(0) if code else None
+    return fields
+
+
+def unique_apply(texts, normalize):
+    """
+    对不重复的文本调用 normalize，再按位置展开（同一批公告中日期和金额大量重复）
+
+    Args:
+        texts: pandas.Series
+        normalize: 接受并返回 pandas.Series 的批量函数
+
+    Returns:
+        pandas.Series: 与 texts 对齐
+    """
+    codes, uniques = pd.factorize(texts.fillna("").astype(str))
+    values = normalize(pd.Series(uniques, dtype=object)).to_numpy()
+    return pd.Series(values[codes], index=texts.index)
+
+
+def _money_values(texts):
+    parts = texts.str.replace(r"[\s　]", "", regex=True).str.extract(MONEY_PATTERN)
+    amount = pd.to_numeric(parts[0].str.replace(r"[,，]", "", regex=True), errors="coerce").to_numpy(dtype="float64")
+    unit = parts[1].fillna("").to_numpy(dtype=str)
+    in_wan = np.char.startswith(unit, "万") | ((unit == "") & texts.str.contains("万元", regex=False).to_numpy(dtype=bool))
+    rate = texts.str.contains(r"%|％|下浮|费率|折扣", regex=True).to_numpy(dtype=bool)
+    # 万元换算后保留到分
+    return pd.Series(np.where(rate, np.nan, np.round(amount * np.where(in_wan, 10000.0, 1.0), 2)))
+
+
+def normalize_money(texts):
+    """
+    批量把金额文本转换为以元为单位的数值
+
+    Args:
+        texts: pandas.Series，例如 "123.45万元"、"¥1,234,567.00元"、"壹佰万元整（小写：1000000元）"
+
+    Returns:
+        pandas.Series: float64，无法识别（或为费率、下浮率）时为 NaN
+    """
+    return unique_apply(texts, _money_values).astype("float64")
+
+
+def normalize_dates(texts, last=False):
+    """
+    批量提取日期
+
+    Args:
+        texts: pandas.Series，例如 "2025年6月3日 9:30"、"2025-06-03至2025-06-06"
+        last: 为 True 时取最后一个日期（公示期的结束日期）
+
+    Returns:
+        pandas.Series: datetime64，无法识别时为 NaT
+    """
+    def dates(unique_texts):
+        parts = unique_texts.str.extract((r".*" if last else "") + DATE_PART)
+        return pd.to_datetime(parts[0] + "-" + parts[1] + "-" + parts[2], format="%Y-%m-%d", errors="coerce")
+
+    return pd.to_datetime(unique_apply(texts, dates))
+
+
+def fields_frame(results, start_index):
+    """
+    把一个批次的提取结果整理为类型化的表（金额和日期批量规范化）
+
+    Args:
+        results: 批次结果列表，成功的结果带有 fields
+        start_index: 批次在总URL列表中的起始索引
+
+    Returns:
+        pandas.DataFrame: 每个成功页面一行，金额为 float64（元），日期为 datetime64
+    """
+    rows = []
+    for i, result in enumerate(results):
+        if not result.get('success') or not result.get('fields'):
+            continue
+        row = {"url_index": start_index + i + 1, "url": result.get('url'), "title": result.get('title')}
+        row.update({field: result['fields'].get(field) for field in RAW_FIELDS})
+        rows.append(row)
+    raw = pd.DataFrame(rows, columns=["url_index", "url", "title"] + list(RAW_FIELDS))
+    return normalize_fields(raw)
+
+
+def normalize_fields(raw):
+    """
+    原始文本表 -> 类型化的表，列顺序与 announcement_fields 表一致
+    """
+    frame = raw[["url_index", "url", "title", "project_name", "project_code", "purchaser", "agency"]].copy()
+    for field in MONEY_FIELDS:
+        frame[field + "_text"] = raw[field]
+        frame[field] = normalize_money(raw[field])
+    frame.insert(frame.columns.get_loc("winning_amount_text"), "winning_bidder", raw["winning_bidder"])
+    for field in DATE_FIELDS:
+        frame[field + "_text"] = raw[field]
+        frame[field] = normalize_dates(raw[field])
+    # 没有发布日期字段时使用URL中的日期（/20250603/）
+    url_dates = raw["url"].fillna("").astype(str).str.extract(r"/(\d{4})(\d{2})(\d{2})/")
+    url_dates = pd.to_datetime(url_dates[0] + "-" + url_dates[1] + "-" + url_dates[2], format="%Y-%m-%d", errors="coerce")
+    frame["publish_date"] = frame["publish_date"].fillna(url_dates)
+    frame["notice_period_text"] = raw["notice_period"]
+    frame["notice_start"] = normalize_dates(raw["notice_period"])
+    frame["notice_end"] = normalize_dates(raw["notice_period"], last=True)
+    return frame
+
+
+def save_fields(frame, db_path):
+    """
+    写入字段表，已有的同序号或同URL记录先删除（重新保存批次时覆盖）
+
+    Returns:
+        int: 写入的行数
+    """
+    if frame.empty:
+        return 0
+    stored = frame.copy()
+    for column in ("publish_date", "bid_open_date", "notice_start", "notice_end"):
+        stored[column] = stored[column].dt.strftime("%Y-%m-%d")
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            conn.executemany("DELETE FROM announcement_fields WHERE url_index = ?",
+                             ((int(url_index),) for url_index in stored["url_index"]))
+            # 目录插入或删除条目后同一URL换了序号：旧序号上的记录一并删除
+            conn.executemany("DELETE FROM announcement_fields WHERE url = ?",
+                             ((url,) for url in stored["url"].dropna() if url))
+            stored.to_sql("announcement_fields", conn, if_exists="append", index=False)
+    finally:
+        conn.close()
+    return len(stored)
+
+
+def load_fields(output_dir):
+    """
+    读取输出目录的字段表，金额为 float64，日期为 datetime64
+
+    Returns:
+        pandas.DataFrame
+    """
+    conn = sqlite3.connect(fields_filename(output_dir))
+    try:
+        return pd.read_sql("SELECT * FROM announcement_fields ORDER BY url_index", conn,
+                           parse_dates=["publish_date", "bid_open_date", "notice_start", "notice_end"])
+    finally:
+        conn.close()
+
+
+def print_field_stats(frame):
+    """
+    打印各字段的提取率
+    """
+    print(f"📋 页面数: {len(frame)}")
+    if frame.empty:
+        return
+    for column in ("project_name", "project_code", "purchaser", "agency", "budget", "winning_bidder",
+                   "winning_amount", "publish_date", "bid_open_date", "notice_start"):
+        found = int(frame[column].notna().sum())
+        print(f"   {column}: {found} ({found / len(frame) * 100:.1f}%)")
+    amounts = frame["winning_amount"].dropna()
+    if not amounts.empty:
+        print(f"💰 中标金额合计: {amounts.sum() / 10000:,.2f} 万元，中位数: {amounts.median() / 10000:,.2f} 万元")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="公告结构化字段")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    stats_parser = subparsers.add_parser("stats", help="各字段的提取率")
+    stats_parser.add_argument("output_dir")
+    export_parser = subparsers.add_parser("export", help="导出CSV")
+    export_parser.add_argument("output_dir")
+    export_parser.add_argument("csv_file")
+    args = parser.parse_args()
+
+    if not os.path.exists(fields_filename(args.output_dir)):
+        print(f"❌ 没有找到字段表: {fields_filename(args.output_dir)}")
+        sys.exit(1)
+    fields = load_fields(args.output_dir)
+    if args.command == "stats":
+        print_field_stats(fields)
+    elif args.command == "export":
+        fields.to_csv(args.csv_file, index=False, encoding="utf-8-sig")
+        print(f"💾 已导出 {len(fields)} 行到 {args.csv_file}")
@@ -0,0 +1,61 @@
+# 按主机限制并发数和请求间隔，避免对同一站点请求过快
+import asyncio
+from urllib.parse import urlsplit
+
+
+class HostRateLimiter:
+    """
+    单个主机的限流器：最多 max_concurrency 个请求同时进行，
+    且相邻两个请求的开始时间至少间隔 min_interval 秒
+
+    用法:
+        async with limiter:
+            await page.goto(url)
+    """
+
+    def __init__(self, max_concurrency=4, min_interval=0.0):
+        self.max_concurrency = max_concurrency
+        self.min_interval = min_interval
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+        self._last_start = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            async with self._lock:
+                loop = asyncio.get_running_loop()
+                wait = self._last_start + self.min_interval - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._last_start = loop.time()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+        return False
+
+
+class HostLimiterPool:
+    """
+    按URL的主机名分配 HostRateLimiter，同一主机共享一个限流器
+    """
+
+    def __init__(self, max_concurrency=4, min_interval=0.0):
+        self.max_concurrency = max_concurrency
+        self.min_interval = min_interval
+        self._limiters = {}
+
+    def for_url(self, url):
+        """
+        获取URL所属主机的限流器
+        """
+        host = urlsplit(url).netloc.lower()
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = HostRateLimiter(self.max_concurrency, self.min_interval)
+            self._limiters[host] = limiter
+        return limiter
@@ -0,0 +1,166 @@
+# 详情页的纯HTTP快速通道：先用连接池复用的 httpx.AsyncClient 直接GET页面，
+# 提取不到 #mainContent（缺失或为空）时再交给 crawl4ai 浏览器渲染；按URL模式记住哪种方式可用
+import json
+import os
+import re
+from urllib.parse import urlsplit
+
+import httpx
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# 路径中的日期目录，例如 /20250531/
+DATE_SEGMENT_PATTERN = re.compile(r"^\d{8}$")
+
+# 某个URL模式至少尝试多少次HTTP后才根据成功率做决定
+MIN_HTTP_ATTEMPTS = 5
+# HTTP成功率低于该值的URL模式直接使用浏览器
+MIN_HTTP_SUCCESS_RATE = 0.2
+# 直接使用浏览器的URL模式每隔多少个URL重新尝试一次HTTP（页面可能已改为服务端渲染）
+HTTP_REPROBE_INTERVAL = 50
+# 记录的次数达到该值后减半，较早的结果逐渐失去权重
+HTTP_HISTORY_LIMIT = 100
+
+
+def create_http_client(max_connections=8, timeout=30):
+    """
+    创建连接池复用的异步HTTP客户端，使用完后需调用 aclose()
+    """
+    return httpx.AsyncClient(
+        timeout=timeout,
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT},
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+    )
+
+
+def url_pattern_key(url):
+    """
+    URL模式：主机名 + 去掉日期目录和文件名的路径，
+    例如 https://www.cqggzy.com/jyxx/004005/004005001/20250531/xxx.html -> www.cqggzy.com/jyxx/004005/004005001
+    """
+    parts = urlsplit(url)
+    segments = [segment for segment in parts.path.split("/")[:-1] if segment and not DATE_SEGMENT_PATTERN.match(segment)]
+    return "/".join([parts.netloc.lower()] + segments)
+
+
+def load_strategy_memory(filename):
+    """
+    读取按URL模式记录的HTTP成功/回退次数，文件不存在时返回空字典
+    """
+    if not filename or not os.path.exists(filename):
+        return {}
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_strategy_memory(memory, filename):
+    if not filename:
+        return
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(memory, f, ensure_ascii=False, indent=2)
+
+
+def http_success_rate(record):
+    attempts = record.get("http_success", 0) + record.get("http_fallback", 0)
+    if attempts < MIN_HTTP_ATTEMPTS:
+        return None
+    return record.get("http_success", 0) / attempts
+
+
+def should_try_http(memory, url):
+    """
+    判断该URL是否先走HTTP：尝试次数不足时总是尝试，之后按成功率决定；
+    成功率低的URL模式每 HTTP_REPROBE_INTERVAL 个URL仍尝试一次HTTP
+    """
+    record = memory.get(url_pattern_key(url))
+    if not record:
+        return True
+    rate = http_success_rate(record)
+    if rate is None or rate >= MIN_HTTP_SUCCESS_RATE:
+        return True
+    record["browser_direct"] = record.get("browser_direct", 0) + 1
+    if record["browser_direct"] >= HTTP_REPROBE_INTERVAL:
+        record["browser_direct"] = 0
+        return True
+    return False
+
+
+def record_http_outcome(memory, url, success):
+    """
+    记录一次HTTP返回 200 后是否提取到 mainContent；
+    超时、403、5xx 等请求失败与页面是否需要浏览器渲染无关，不应记录
+
+    Args:
+        memory: 按URL模式记录的字典
+        url: 页面URL
+        success: 是否提取到 mainContent
+    """
+    key = url_pattern_key(url)
+    record = memory.setdefault(key, {"http_success": 0, "http_fallback": 0})
+    rate = http_success_rate(record)
+    if success and rate is not None and rate < MIN_HTTP_SUCCESS_RATE:
+        # 重新尝试时HTTP已可用，重新统计
+        memory[key] = {"http_success": 1, "http_fallback": 0}
+        return
+    record["http_success" if success else "http_fallback"] += 1
+    if record["http_success"] + record["http_fallback"] >= HTTP_HISTORY_LIMIT:
+        record["http_success"] //= 2
+        record["http_fallback"] //= 2
+
+
+def new_fetch_stats():
+    """
+    创建抓取方式统计字典
+    """
+    return {
+        "http": 0,            # HTTP直接成功
+        "http_fallback": 0,   # 尝试HTTP失败后改用浏览器
+        "browser": 0,         # 最终由浏览器抓取（包括回退和直接使用浏览器）
+        "browser_direct": 0,  # 根据URL模式记录直接使用浏览器
+    }
+
+
+async def fetch_page_http(client, url, headers=None):
+    """
+    用HTTP直接获取整页HTML（mainContent 的提取和转换在CPU阶段进行，见 cpu_stage.py）
+
+    Args:
+        client: create_http_client() 创建的客户端
+        url: 页面URL
+        headers: 额外的请求头（例如条件请求头）
+
+    Returns:
+        dict: {'html': 整页HTML, 'etag', 'last_modified'}，
+              服务器返回 304 时为 {'not_modified': True}；请求失败或状态码不是 200 时返回 None
+    """
+    try:
+        response = await client.get(url, headers=headers)
+        if response.status_code == 304:
+            return {"not_modified": True}
+        if response.status_code != 200:
+            return None
+        html = response.text
+    except (httpx.HTTPError, UnicodeDecodeError):
+        return None
+
+    return {
+        "html": html,
+        "etag": response.headers.get("etag"),
+        "last_modified": response.headers.get("last-modified"),
+    }
+
+
+def print_fetch_stats(stats):
+    """
+    打印HTTP/浏览器抓取比例
+    """
+    total = stats["http"] + stats["browser"]
+    if not total:
+        return
+    print(f"🌐 抓取方式: HTTP {stats['http']} ({stats['http'] / total * 100:.1f}%)，"
+          f"浏览器 {stats['browser']} ({stats['browser'] / total * 100:.1f}%)")
+    print(f"   HTTP回退浏览器: {stats['http_fallback']}，按URL模式直接使用浏览器: {stats['browser_direct']}")
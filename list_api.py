@@ -0,0 +1,515 @@
+# 记录列表页 #showList 翻页背后的数据接口请求模板，之后直接用HTTP客户端翻页，
+# 把接口返回的JSON记录转换为与 safe_get_url.py 相同的 {source, name, final_url} 格式
+from playwright.sync_api import sync_playwright
+import httpx
+import json
+import re
+import time
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from safe_get_url import (
+    SITE_BASE_URL,
+    build_final_url,
+    get_all_popup_urls_with_redirect,
+    get_list_section,
+    new_resolve_stats,
+    resolve_summary,
+    save_urls_to_json_batch,
+)
+
+# 常见的分页字段名 (页码字段, 每页条数字段)
+PAGE_FIELD_CANDIDATES = [
+    ("pn", "rn"),
+    ("pageIndex", "pageSize"),
+    ("pageindex", "pagesize"),
+    ("pageNo", "pageSize"),
+    ("page", "size"),
+]
+
+# 分类字段名
+CATEGORY_FIELD_CANDIDATES = ["categorynum", "categoryNum", "cnum"]
+
+# 只保留回放时需要的请求头
+REPLAY_HEADERS = ["content-type", "accept", "referer", "origin", "user-agent", "x-requested-with"]
+
+HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+
+def parse_request_params(url, method, post_data):
+    """
+    解析请求参数
+
+    Returns:
+        tuple: (body_format, params) body_format 为 "json" / "form" / "query"
+    """
+    if method.upper() != "GET" and post_data:
+        try:
+            return "json", json.loads(post_data)
+        except ValueError:
+            return "form", dict(parse_qsl(post_data, keep_blank_values=True))
+    return "query", dict(parse_qsl(urlsplit(url).query, keep_blank_values=True))
+
+
+def find_records_path(data, path=()):
+    """
+    在接口返回的JSON中查找包含 infoid 的记录列表，返回其路径
+    """
+    if isinstance(data, list):
+        if data and isinstance(data[0], dict) and any(key.lower() == "infoid" for key in data[0]):
+            return list(path)
+        return None
+    if isinstance(data, dict):
+        for key, value in data.items():
+            found = find_records_path(value, path + (key,))
+            if found is not None:
+                return found
+    return None
+
+
+def find_category_path(params, path=()):
+    """
+    在请求参数中查找分类编号所在的位置，支持:
+    - 顶层字段 categorynum / cnum
+    - condition 列表中 {"fieldName": "categorynum", "equal": "..."} 的条件
+    """
+    if isinstance(params, dict):
+        if str(params.get("fieldName", "")).lower() == "categorynum" and "equal" in params:
+            return list(path) + ["equal"]
+        for key in CATEGORY_FIELD_CANDIDATES:
+            if key in params and isinstance(params[key], str):
+                return list(path) + [key]
+        for key, value in params.items():
+            found = find_category_path(value, path + (key,))
+            if found is not None:
+                return found
+    elif isinstance(params, list):
+        for index, value in enumerate(params):
+            found = find_category_path(value, path + (index,))
+            if found is not None:
+                return found
+    return None
+
+
+def get_by_path(data, path):
+    for key in path:
+        data = data[key]
+    return data
+
+
+def set_by_path(data, path, value):
+    for key in path[:-1]:
+        data = data[key]
+    data[path[-1]] = value
+
+
+def to_number(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def build_template(first_request, second_request, records_path):
+    """
+    根据第1页和第2页的请求推断接口模板
+
+    Args:
+        first_request: 第1页请求 {url, method, headers, post_data}
+        second_request: 第2页请求，可为 None（无法判断页码是偏移量还是页序号时按偏移量处理）
+        records_path: 返回JSON中记录列表的路径
+
+    Returns:
+        dict: 可保存为JSON的请求模板，无法识别分页字段时返回 None
+    """
+    body_format, params = parse_request_params(first_request["url"], first_request["method"], first_request["post_data"])
+
+    page_field = size_field = None
+    for page_key, size_key in PAGE_FIELD_CANDIDATES:
+        if page_key in params and size_key in params:
+            page_field, size_field = page_key, size_key
+            break
+    if not page_field:
+        return None
+
+    first_value = to_number(params[page_field]) or 0
+    page_size = to_number(params[size_field]) or 20
+
+    # 通过第2页的取值判断页码字段是记录偏移量还是页序号
+    page_mode = "offset"
+    if second_request:
+        _, second_params = parse_request_params(second_request["url"], second_request["method"], second_request["post_data"])
+        second_value = to_number(second_params.get(page_field))
+        if second_value is not None and second_value - first_value == 1 and page_size != 1:
+            page_mode = "index"
+
+    headers = {key: value for key, value in first_request["headers"].items() if key.lower() in REPLAY_HEADERS}
+
+    return {
+        "url": first_request["url"],
+        "method": first_request["method"].upper(),
+        "headers": headers,
+        "body_format": body_format,
+        "params": params,
+        "page_field": page_field,
+        "size_field": size_field,
+        "page_mode": page_mode,
+        "page_start": first_value,
+        "page_size": page_size,
+        "category_path": find_category_path(params),
+        "records_path": records_path,
+    }
+
+
+def capture_list_api_template(target_url, headless=True):
+    """
+    在浏览器中打开列表页并翻到第2页，记录 #showList 的数据接口请求模板
+
+    Args:
+        target_url: 列表页URL (transaction_detail.html)
+        headless: 是否使用无头模式
+
+    Returns:
+        tuple: (模板字典, cookies列表)，未捕获到接口或页面加载出错时模板为 None
+    """
+    template = None
+    cookies = []
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless)
+        context = browser.new_context(locale="zh-CN")
+        page = context.new_page()
+
+        captured = []
+
+        def on_response(response):
+            if response.request.resource_type in ("xhr", "fetch"):
+                captured.append(response)
+
+        page.on("response", on_response)
+
+        try:
+            page.goto(target_url, wait_until="domcontentloaded")
+            page.wait_for_load_state("networkidle", timeout=8000)
+            page.wait_for_selector(".info-item", state="attached", timeout=8000)
+            first_page_responses = list(captured)
+
+            # 翻到第2页，用于判断分页字段的含义
+            captured.clear()
+            next_button = page.query_selector('a.next')
+            if next_button:
+                next_button.click()
+                page.wait_for_load_state("networkidle", timeout=8000)
+            second_page_responses = list(captured)
+
+            for response in first_page_responses:
+                try:
+                    records_path = find_records_path(response.json())
+                except Exception:
+                    continue
+                if records_path is None:
+                    continue
+
+                request = response.request
+                first_request = {
+                    "url": request.url,
+                    "method": request.method,
+                    "headers": request.headers,
+                    "post_data": request.post_data,
+                }
+                second_request = None
+                for second_response in second_page_responses:
+                    if second_response.request.url.split('?')[0] == request.url.split('?')[0]:
+                        second_request = {
+                            "url": second_response.request.url,
+                            "method": second_response.request.method,
+                            "headers": second_response.request.headers,
+                            "post_data": second_response.request.post_data,
+                        }
+                        break
+
+                template = build_template(first_request, second_request, records_path)
+                if template:
+                    template["referer_page"] = target_url
+                    break
+
+            cookies = context.cookies()
+        except Exception as e:
+            # 页面加载或翻页超时等错误：返回 None，由调用方改用浏览器翻页
+            print(f"❌ 捕获列表接口时出错: {e}")
+            template = None
+        finally:
+            browser.close()
+
+    if template:
+        print(f"🎯 已捕获列表接口: {template['method']} {template['url']}")
+        print(f"📑 分页字段: {template['page_field']} ({template['page_mode']}), 每页条数字段: {template['size_field']}")
+    else:
+        print("❌ 未能识别列表数据接口")
+    return template, cookies
+
+
+def save_template(template, filename):
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(template, f, ensure_ascii=False, indent=2)
+    print(f"💾 接口模板已保存到 {filename}")
+
+
+def load_template(filename):
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_list_request(template, page_num, category=None, page_size=None):
+    """
+    根据模板生成指定页的请求
+
+    Args:
+        template: 接口模板
+        page_num: 页码（从0开始）
+        category: 分类编号，为 None 时沿用模板中的分类
+        page_size: 每页条数，为 None 时沿用模板中的值
+
+    Returns:
+        dict: {method, url, headers, content/params}
+    """
+    params = json.loads(json.dumps(template["params"]))
+    page_size = page_size or template["page_size"]
+
+    if template["page_mode"] == "index":
+        page_value = template["page_start"] + page_num
+    else:
+        page_value = template["page_start"] + page_num * page_size
+
+    # 保持原参数的类型（字符串或数字）
+    params[template["page_field"]] = str(page_value) if isinstance(params[template["page_field"]], str) else page_value
+    params[template["size_field"]] = str(page_size) if isinstance(params[template["size_field"]], str) else page_size
+
+    if category is not None:
+        if not template.get("category_path"):
+            raise ValueError("接口模板中没有分类字段，无法指定分类")
+        set_by_path(params, template["category_path"], category)
+
+    request = {"method": template["method"], "headers": dict(template["headers"])}
+    if template["body_format"] == "json":
+        request["url"] = template["url"]
+        request["content"] = json.dumps(params, ensure_ascii=False).encode("utf-8")
+    elif template["body_format"] == "form":
+        request["url"] = template["url"]
+        request["content"] = urlencode(params).encode("utf-8")
+    else:
+        parts = urlsplit(template["url"])
+        request["url"] = urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(params), parts.fragment))
+    return request
+
+
+def record_field(record, *names):
+    """
+    不区分大小写读取记录字段
+    """
+    lowered = {key.lower(): value for key, value in record.items()}
+    for name in names:
+        value = lowered.get(name.lower())
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def records_to_url_items(records, section, page_num, stats=None):
+    """
+    把接口记录转换为 {source, name, final_url}
+
+    Args:
+        records: 接口返回的记录列表
+        section: 栏目名 (jyxx / jyjg)
+        page_num: 页码（从0开始）
+        stats: 可选的统计字典 {'built': n, 'fallback': n}
+    """
+    items = []
+    for i, record in enumerate(records):
+        infoid = record_field(record, "infoid")
+        categorynum = record_field(record, "categorynum")
+        info_date = record_field(record, "infodate", "webdate", "infodateformat") or ""
+        title = record_field(record, "title", "titlenew") or "未知"
+
+        final_url = build_final_url(section, str(infoid or ""), str(categorynum or ""), str(info_date)[:10])
+        if final_url:
+            if stats is not None:
+                stats['built'] += 1
+        else:
+            # 无法构造时保留跳转地址，与点击方式得到的结果一致
+            final_url = f"{SITE_BASE_URL}/jumpnew.html?infoid={infoid}&categorynum={categorynum}" if infoid else '获取失败'
+            if stats is not None:
+                stats['fallback'] += 1
+
+        items.append({
+            'source': f'第 {page_num + 1} 页第 {i+1} 个元素',
+            'name': HTML_TAG_PATTERN.sub('', str(title)).strip(),
+            'final_url': final_url,
+        })
+    return items
+
+
+def fetch_list_page(client, template, page_num, category=None, page_size=None):
+    """
+    直接请求列表接口获取一页记录
+    """
+    request = build_list_request(template, page_num, category, page_size)
+    response = client.request(request["method"], request["url"], headers=request["headers"],
+                              content=request.get("content"))
+    response.raise_for_status()
+    return get_by_path(response.json(), template["records_path"])
+
+
+def get_all_urls_via_dom(target_url, max_pages, category=None, batch_size=50,
+                         output_filename="jyxx_final_urls.json", timebegin=None):
+    """
+    接口不可用时改用浏览器翻页（直接解析模式）获取URL
+
+    浏览器翻页只能读取列表页默认分类，指定了 category 时不回退，避免把其他分类的公告写入目录；
+    没有获取到任何URL时不保存，已有的目录保持不变
+
+    Returns:
+        包含所有URL信息的列表
+    """
+    if category is not None:
+        print(f"❌ 浏览器翻页不支持指定分类（category={category}），请检查列表接口后重试")
+        return []
+    print("↩️ 改用浏览器翻页获取URL")
+    resolve_stats = new_resolve_stats()
+    urls = get_all_popup_urls_with_redirect(
+        target_url=target_url,
+        max_pages=max_pages,
+        batch_size=batch_size,
+        output_filename=output_filename,
+        resume=False,
+        resolve_mode="direct",
+        resolve_stats=resolve_stats,
+    )
+    if urls:
+        save_urls_to_json_batch(urls, output_filename, timebegin, is_final=True,
+                                extra_statistics=resolve_summary(resolve_stats, "direct"))
+    else:
+        print("❌ 浏览器翻页也没有获取到URL，不保存目录")
+    return urls
+
+
+def get_all_urls_via_list_api(target_url, max_pages, category=None, page_size=20, batch_size=50,
+                              output_filename="jyxx_final_urls.json", template_file=None, request_interval=0.2):
+    """
+    通过列表数据接口获取所有公告的最终URL
+
+    首次运行在浏览器中记录接口模板（可保存到 template_file 复用），
+    之后用HTTP客户端直接翻页，不再点击 a.next。
+    从 template_file 加载的模板请求第1页失败时（模板过期或缺少会话cookie）重新捕获一次；
+    未能获取接口模板或第1页仍然失败时改用浏览器翻页（直接解析模式）。
+    中途请求失败时只保存已获取的部分（不标记为完成），没有获取到任何URL时不保存。
+
+    Args:
+        target_url: 列表页URL
+        max_pages: 最大处理页数
+        category: 分类编号，为 None 时使用列表页默认分类
+        page_size: 每页条数
+        batch_size: 每处理多少页保存一次
+        output_filename: 输出文件名
+        template_file: 接口模板文件，存在时直接加载，不存在时捕获后保存
+        request_interval: 两次请求之间的间隔（秒）
+
+    Returns:
+        包含所有URL信息的列表
+    """
+    template = None
+    cookies = []
+    template_loaded = False
+    if template_file:
+        try:
+            template = load_template(template_file)
+            template_loaded = True
+            print(f"📂 已加载接口模板: {template_file}")
+        except (OSError, ValueError):
+            template = None
+
+    timebegin = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if template is None:
+        template, cookies = capture_list_api_template(target_url)
+        if template is None:
+            return get_all_urls_via_dom(target_url, max_pages, category, batch_size, output_filename, timebegin)
+        if template_file:
+            save_template(template, template_file)
+
+    section = get_list_section(target_url)
+    stats = {'built': 0, 'fallback': 0}
+    all_urls = []
+    aborted = False
+    started = time.monotonic()
+
+    def open_client():
+        return httpx.Client(timeout=15, follow_redirects=True,
+                            cookies={cookie["name"]: cookie["value"] for cookie in cookies})
+
+    client = open_client()
+    try:
+        for page_num in range(max_pages):
+            try:
+                records = fetch_list_page(client, template, page_num, category, page_size)
+            except Exception as e:
+                print(f"❌ 获取第 {page_num + 1} 页数据时出错: {e}")
+                if page_num > 0:
+                    aborted = True
+                    break
+                if not template_loaded:
+                    return get_all_urls_via_dom(target_url, max_pages, category, batch_size, output_filename, timebegin)
+                # 加载的模板可能已过期，重新捕获后再试一次第1页
+                print("🔁 已加载的接口模板不可用，重新捕获接口模板")
+                template_loaded = False
+                template, cookies = capture_list_api_template(target_url)
+                if template is None:
+                    return get_all_urls_via_dom(target_url, max_pages, category, batch_size, output_filename, timebegin)
+                if template_file:
+                    save_template(template, template_file)
+                client.close()
+                client = open_client()
+                try:
+                    records = fetch_list_page(client, template, page_num, category, page_size)
+                except Exception as e:
+                    print(f"❌ 重新捕获模板后获取第 1 页数据仍然出错: {e}")
+                    return get_all_urls_via_dom(target_url, max_pages, category, batch_size, output_filename, timebegin)
+
+            if not records:
+                print(f"⚠️ 第 {page_num + 1} 页没有数据，可能已到达最后一页")
+                break
+
+            all_urls.extend(records_to_url_items(records, section, page_num, stats))
+            print(f"📄 第 {page_num + 1} 页: {len(records)} 条，累计 {len(all_urls)} 条")
+
+            if (page_num + 1) % batch_size == 0:
+                save_urls_to_json_batch(all_urls, output_filename, timebegin, is_final=False,
+                                        extra_statistics={"list_api": dict(stats)})
+
+            if request_interval:
+                time.sleep(request_interval)
+    finally:
+        client.close()
+
+    elapsed = time.monotonic() - started
+    print(f"⏱️ 接口翻页完成: {len(all_urls)} 条，耗时 {elapsed:.1f}s")
+    print(f"🎯 直接构造URL: {stats['built']}，保留跳转地址: {stats['fallback']}")
+    if not all_urls:
+        print("❌ 接口没有返回任何记录，不保存目录")
+        return all_urls
+    if aborted:
+        print(f"💾 接口翻页中途出错，只保存已获取的 {len(all_urls)} 条（未完成）")
+    save_urls_to_json_batch(all_urls, output_filename, timebegin, is_final=not aborted,
+                            extra_statistics={"list_api": dict(stats)})
+    return all_urls
+
+
+# 使用示例
+if __name__ == "__main__":
+    urls = get_all_urls_via_list_api(
+        target_url="https://www.cqggzy.com/jyjg/transaction_detail.html",
+        max_pages=500,
+        page_size=20,
+        output_filename="jyjg_final_urls.json",
+        template_file="jyjg_list_api_template.json",
+    )
+    print(f"🏁 共获取 {len(urls)} 条URL")
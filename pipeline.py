@@ -0,0 +1,106 @@
+# 端到端流水线：发现阶段（safe_get_url_async）和内容阶段（safe_get_content）在同一个事件循环中同时运行，
+# 通过有界队列连接。每解析出一个最终URL，内容阶段立即开始抓取；
+# 内容阶段跟不上时队列被填满，发现阶段暂停翻页；发现阶段较慢时内容阶段等待新的URL。
+# 目录文件（jyjg_final_urls.json）和内容输出目录与分别运行两个脚本时相同。
+# 用法: python pipeline.py
+import asyncio
+import os
+from datetime import datetime
+
+from resource_blocking import CONTENT_PROFILE, DISCOVERY_PROFILE
+from safe_get_content import crawl_multiple_webpages_to_markdown
+from safe_get_url import new_resolve_stats, print_summary, resolve_summary, save_urls_to_json_batch
+from safe_get_url_async import get_all_popup_urls_with_redirect_async
+from search_index import SEARCH_INDEX_FILENAME
+
+DEFAULT_QUEUE_SIZE = 200
+
+
+async def run_pipeline(target_url, catalog_filename, max_pages=500, output_dir=None, queue_size=DEFAULT_QUEUE_SIZE,
+                       resolve_mode="click", discovery_options=None, content_options=None):
+    """
+    同时运行URL发现和内容爬取
+
+    Args:
+        target_url: 列表页URL
+        catalog_filename: 发现阶段的目录文件，和单独运行 safe_get_url_async.py 时一样保存
+        max_pages: 最大处理页数
+        output_dir: 内容输出目录；续传时应与发现阶段的续传一起使用（记录顺序相同），
+                    为 None 时自动创建 crawl_results_break_<时间戳> 目录
+        queue_size: 两个阶段之间的队列长度，也是发现阶段最多领先内容阶段的URL数
+        resolve_mode: 发现阶段的解析方式，"click" 或 "direct"
+        discovery_options: 传给 get_all_popup_urls_with_redirect_async 的其他参数
+        content_options: 传给 crawl_multiple_webpages_to_markdown 的其他参数
+
+    Returns:
+        tuple: (目录记录列表, 内容爬取统计)；各URL的内容结果在输出目录中（见 crawl_multiple_webpages_to_markdown）
+    """
+    resolved_queue = asyncio.Queue(maxsize=queue_size)
+    resolve_stats = new_resolve_stats()
+    timebegin = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    async def discover():
+        try:
+            urls = await get_all_popup_urls_with_redirect_async(
+                target_url=target_url,
+                max_pages=max_pages,
+                output_filename=catalog_filename,
+                resolve_mode=resolve_mode,
+                resolve_stats=resolve_stats,
+                resolved_queue=resolved_queue,
+                **(discovery_options or {})
+            )
+            if urls:
+                print_summary(urls)
+                save_urls_to_json_batch(urls, catalog_filename, timebegin, is_final=True,
+                                        extra_statistics=resolve_summary(resolve_stats, resolve_mode))
+            else:
+                print("💥 没有获取到任何URL数据")
+            return urls
+        finally:
+            # 结束标记：内容阶段处理完已收到的URL后结束
+            await resolved_queue.put(None)
+
+    content_options = dict(content_options or {})
+    # 全文索引中按目录文件名区分
+    content_options.setdefault("catalog_name", os.path.basename(catalog_filename))
+
+    discovery_task = asyncio.create_task(discover())
+    try:
+        summary = await crawl_multiple_webpages_to_markdown(resolved_queue, output_dir=output_dir, **content_options)
+    except BaseException:
+        discovery_task.cancel()
+        raise
+    urls = await discovery_task
+    return urls, summary
+
+
+if __name__ == "__main__":
+    target_url = "https://www.cqggzy.com/jyjg/transaction_detail.html"
+    catalog_filename = "jyjg_final_urls.json"
+
+    print("🚀 开始流水线：URL发现 → 内容爬取")
+    print(f"🎯 目标URL: {target_url}")
+    print("-" * 80)
+
+    asyncio.run(run_pipeline(
+        target_url,
+        catalog_filename,
+        max_pages=500,
+        resolve_mode="click",
+        discovery_options={
+            "batch_size": 1,
+            "resume": True,
+            "pool_size": 4,
+            "blocking_profile": DISCOVERY_PROFILE,
+        },
+        content_options={
+            "batch_size": 50,
+            "blocking_profile": CONTENT_PROFILE,
+            "concurrency": 8,
+            "host_concurrency": 4,
+            "min_request_interval": 0.25,
+            "storage": "sqlite",
+            "search_index_path": SEARCH_INDEX_FILENAME,
+        },
+    ))
@@ -0,0 +1,206 @@
+# 增量报告索引：每个批次完成后向 <输出目录>/report_index.jsonl 追加一行（只有元数据，不含正文），
+# 00_FINAL_SUMMARY.md 只在任务完成时或手动调用 render_final_summary 时，由索引和批次文件流式渲染
+# 用法（手动渲染）: python report_index.py crawl_results_break_20250601_120000
+import json
+import os
+import sys
+from datetime import datetime
+
+REPORT_INDEX_FILENAME = "report_index.jsonl"
+
+INDEX_FIELDS = ("name", "source", "url", "title", "success", "error", "file", "duplicate_of")
+
+
+def append_batch_index(output_dir, batch_num, start_index, batch_size, results):
+    """
+    追加一个批次的索引记录，耗时只与本批次大小有关
+
+    Args:
+        output_dir: 输出目录
+        batch_num: 批次号
+        start_index: 当前批次在总URL列表中的起始索引
+        batch_size: 批次大小
+        results: 本批次的结果列表（save_batch_results 处理后，成功的结果带有 file 字段）
+    """
+    record = {
+        "batch_num": batch_num,
+        "start_index": start_index,
+        "batch_size": batch_size,
+        "successful": sum(1 for result in results if result.get('success')),
+        "failed": sum(1 for result in results if not result.get('success')),
+        "results": [{field: result.get(field) for field in INDEX_FIELDS} for result in results],
+    }
+    with open(os.path.join(output_dir, REPORT_INDEX_FILENAME), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def load_batch_index(output_dir):
+    """
+    读取所有批次的索引记录，同一批次重复写入时（中断后重跑）以最后一次为准
+
+    Returns:
+        list: 按批次号排序的记录
+    """
+    index_file = os.path.join(output_dir, REPORT_INDEX_FILENAME)
+    batches = {}
+    if os.path.exists(index_file):
+        with open(index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 写入过程中崩溃留下的半行
+                    continue
+                batches[record["batch_num"]] = record
+    return [batches[batch_num] for batch_num in sorted(batches)]
+
+
+def load_progress_data(output_dir):
+    try:
+        with open(os.path.join(output_dir, "progress_log.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def format_duration(start_time, end_time):
+    try:
+        start_dt = datetime.strptime(start_time, '%Y-%m-%d %H:%M:%S')
+        end_dt = datetime.strptime(end_time, '%Y-%m-%d %H:%M:%S')
+    except (TypeError, ValueError):
+        return None
+    return str(end_dt - start_dt).split('.')[0]
+
+
+def write_entry(f, output_dir, entry):
+    """
+    写出单个URL的详细内容：成功的结果直接复制已保存的文件，不在内存中保留正文
+    """
+    if entry.get('duplicate_of'):
+        f.write(f"""# {entry.get('name') or 'Unknown'}
+
+**来源**: {entry.get('source') or 'Unknown'}  
+**URL**: {entry.get('url')}  
+**正文**: 与 `{entry['duplicate_of']}` 相同，不重复保存
+
+---
+""")
+        return
+
+    file_path = os.path.join(output_dir, entry['file']) if entry.get('success') and entry.get('file') else None
+    if file_path and os.path.exists(file_path):
+        with open(file_path, 'r', encoding='utf-8') as source_file:
+            for chunk in iter(lambda: source_file.read(64 * 1024), ''):
+                f.write(chunk)
+        return
+
+    f.write(f"""# 失败: {entry.get('name') or 'Unknown URL'}
+
+**来源**: {entry.get('source') or 'Unknown'}  
+**URL**: {entry.get('url') or 'N/A'}  
+**错误**: {entry.get('error') or 'N/A'}
+
+---
+""")
+
+
+def render_final_summary(output_dir, total_urls=None, start_time=None, end_time=None):
+    """
+    由索引和批次文件流式渲染 00_FINAL_SUMMARY.md
+
+    Args:
+        output_dir: 输出目录
+        total_urls: 总URL数量，默认取 progress_log.json 中的记录
+        start_time: 爬取开始时间，默认取 progress_log.json 中的记录
+        end_time: 报告时间，默认当前时间
+
+    Returns:
+        str: 报告文件路径
+    """
+    progress_data = load_progress_data(output_dir)
+    batches = load_batch_index(output_dir)
+    end_time = end_time or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    start_time = start_time or progress_data.get("start_time")
+    total_urls = total_urls if total_urls is not None else progress_data.get("total_count", 0)
+    batch_size = batches[0]["batch_size"] if batches else 0
+    total_batches = (total_urls + batch_size - 1) // batch_size if batch_size else 0
+
+    processed_count = progress_data.get("processed_count", sum(len(batch["results"]) for batch in batches))
+    total_successful = progress_data.get("successful_count", sum(batch["successful"] for batch in batches))
+    total_failed = progress_data.get("failed_count", sum(batch["failed"] for batch in batches))
+    is_completed = processed_count >= total_urls
+    duration = format_duration(start_time, end_time)
+    duration_info = f"**{'总耗时' if is_completed else '当前累计耗时'}**: {duration}  \n" if duration else ""
+
+    final_summary_file = os.path.join(output_dir, "00_FINAL_SUMMARY.md")
+    with open(final_summary_file, "w", encoding="utf-8") as f:
+        status_emoji = "🎉" if is_completed else "📊"
+        status_text = "最终爬取汇总报告" if is_completed else "累计爬取汇总报告 (按需生成)"
+
+        f.write(f"""# {status_emoji} {status_text}
+
+**爬取开始时间**: {start_time}  
+**报告生成时间**: {end_time}  
+{duration_info}**总URL数量**: {total_urls}  
+**已处理URL数量**: {processed_count}  
+**批次数量**: {total_batches}  
+**批次大小**: {batch_size}  
+**✅ 总成功数量**: {total_successful}  
+**❌ 总失败数量**: {total_failed}  
+**成功率**: {(total_successful/processed_count*100) if processed_count else 0:.2f}% (基于已处理的URL)
+
+## 📁 文件结构说明
+- `00_OVERALL_SUMMARY.md` - 总体汇总报告（实时进度）
+- `00_FINAL_SUMMARY.md` - 本文件，任务完成时生成（也可运行 `python report_index.py <输出目录>` 随时生成）
+- `progress_log.json` - 进度日志文件
+- `report_index.jsonl` - 每批次追加的结果索引
+- `batch_001/` - 第1批次结果
+- `batch_002/` - 第2批次结果
+- ... 依此类推
+
+每个批次目录包含:
+- `batch_XXX_summary.md` - 批次汇总文件
+- `001_xxx.md`, `002_xxx.md` - 单个URL的爬取结果
+
+## 📊 详细结果统计 (基于已处理的URL)
+
+""")
+
+        for batch in batches:
+            batch_num = batch["batch_num"]
+            f.write(f"### 批次 {batch_num} (URL {batch['start_index'] + 1}-{batch['start_index'] + len(batch['results'])})\n")
+            f.write(f"- ✅ 成功: {batch['successful']}\n")
+            f.write(f"- ❌ 失败: {batch['failed']}\n")
+            f.write(f"- 📁 目录: `batch_{batch_num:03d}/`\n\n")
+
+        f.write("## 📋 所有URL详细内容 (累计)\n\n")
+
+        first = True
+        for batch in batches:
+            for entry in batch["results"]:
+                if not first:
+                    f.write(f"\n\n{'='*80}\n\n")
+                first = False
+                write_entry(f, output_dir, entry)
+
+        if is_completed:
+            f.write(f"\n---\n\n## 🎊 爬取任务已全部完成！\n\n")
+            f.write(f"感谢您的耐心等待，所有 {processed_count} 个URL已处理完毕。\n")
+            f.write(f"详细结果请查看各批次目录中的文件。\n")
+        else:
+            f.write(f"\n---\n\n## ⏱️ 任务进行中...\n\n")
+            f.write(f"此报告为按需生成的累计结果，任务完成时会重新生成。\n")
+            f.write(f"您可以查看 `00_OVERALL_SUMMARY.md` 获取更实时的进度。\n")
+
+    print(f"📄 已生成汇总报告: {final_summary_file}")
+    return final_summary_file
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("用法: python report_index.py <输出目录>")
+        sys.exit(1)
+    render_final_summary(sys.argv[1])
@@ -0,0 +1,176 @@
+# 浏览器请求拦截配置：屏蔽抓取时用不到的图片、字体、样式、统计脚本和第三方脚本，
+# 同时保留驱动 opendetailjyxx 和 #mainContent 的站内脚本，并统计屏蔽/放行的请求和字节数
+# （放行的字节数按浏览器实际收到的响应体统计，屏蔽的字节数只能按资源类型估算）
+import fnmatch
+from urllib.parse import urlsplit
+
+# 各类资源的典型大小（字节），被屏蔽的请求没有下载，只能按类型估算节省的流量
+ESTIMATED_BYTES_BY_TYPE = {
+    "image": 30 * 1024,
+    "font": 50 * 1024,
+    "media": 200 * 1024,
+    "stylesheet": 20 * 1024,
+    "script": 40 * 1024,
+}
+
+# 统计和广告脚本
+ANALYTICS_URL_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*hm.baidu.com*",
+    "*cnzz.com*",
+    "*51.la*",
+    "*growingio.com*",
+    "*doubleclick.net*",
+]
+
+# 列表页：需要点击列表项和分页器，保留样式表，避免元素布局变化导致点击失败
+DISCOVERY_PROFILE = {
+    "name": "discovery",
+    "block_resource_types": ["image", "font", "media"],
+    "block_url_patterns": ANALYTICS_URL_PATTERNS,
+    # 只允许站内脚本（opendetailjyxx、分页器、列表接口都在站内）
+    "allow_script_hosts": ["www.cqggzy.com", "cqggzy.com"],
+    "allow_url_patterns": [],
+}
+
+# 详情页：只需要 #mainContent 的HTML，样式表也可以屏蔽
+CONTENT_PROFILE = {
+    "name": "content",
+    "block_resource_types": ["image", "font", "media", "stylesheet"],
+    "block_url_patterns": ANALYTICS_URL_PATTERNS,
+    "allow_script_hosts": ["www.cqggzy.com", "cqggzy.com"],
+    "allow_url_patterns": [],
+}
+
+
+def should_block(profile, resource_type, url):
+    """
+    判断请求是否应被屏蔽
+
+    Args:
+        profile: 拦截配置
+        resource_type: Playwright 的 request.resource_type
+        url: 请求URL
+
+    Returns:
+        str: 屏蔽原因，放行时返回 None
+    """
+    if any(fnmatch.fnmatch(url, pattern) for pattern in profile.get("allow_url_patterns", [])):
+        return None
+    if resource_type == "document":
+        return None
+    if resource_type in profile.get("block_resource_types", []):
+        return resource_type
+    if any(fnmatch.fnmatch(url, pattern) for pattern in profile.get("block_url_patterns", [])):
+        return "pattern"
+    allow_script_hosts = profile.get("allow_script_hosts")
+    if resource_type == "script" and allow_script_hosts:
+        if urlsplit(url).hostname not in allow_script_hosts:
+            return "third_party_script"
+    return None
+
+
+def new_blocking_stats():
+    """
+    创建拦截统计字典
+    """
+    return {
+        "allowed_requests": 0,
+        "allowed_bytes": 0,
+        "blocked_requests": 0,
+        "blocked_bytes_estimate": 0,
+        "blocked_by_reason": {},
+    }
+
+
+def record_blocked(stats, reason, resource_type):
+    stats["blocked_requests"] += 1
+    stats["blocked_bytes_estimate"] += ESTIMATED_BYTES_BY_TYPE.get(resource_type, 0)
+    stats["blocked_by_reason"][reason] = stats["blocked_by_reason"].get(reason, 0) + 1
+
+
+def record_allowed_sizes(stats, sizes):
+    """
+    记录一个已完成请求实际收到的响应体字节数（request.sizes() 的结果，不依赖 Content-Length）
+    """
+    stats["allowed_bytes"] += sizes.get("responseBodySize", 0) or 0
+
+
+def install_blocking(context, profile, stats):
+    """
+    为同步 Playwright 的 BrowserContext 安装请求拦截
+
+    Args:
+        context: playwright.sync_api.BrowserContext
+        profile: 拦截配置（DISCOVERY_PROFILE / CONTENT_PROFILE 或自定义）
+        stats: new_blocking_stats() 创建的统计字典
+    """
+    def handle_route(route, request):
+        reason = should_block(profile, request.resource_type, request.url)
+        if reason:
+            record_blocked(stats, reason, request.resource_type)
+            route.abort()
+        else:
+            stats["allowed_requests"] += 1
+            route.continue_()
+
+    def on_request_finished(request):
+        try:
+            record_allowed_sizes(stats, request.sizes())
+        except Exception:
+            pass
+
+    context.route("**/*", handle_route)
+    context.on("requestfinished", on_request_finished)
+
+
+async def install_blocking_async(context_or_page, profile, stats):
+    """
+    为异步 Playwright 的 BrowserContext 或 Page 安装请求拦截
+    """
+    async def handle_route(route, request):
+        reason = should_block(profile, request.resource_type, request.url)
+        if reason:
+            record_blocked(stats, reason, request.resource_type)
+            await route.abort()
+        else:
+            stats["allowed_requests"] += 1
+            await route.continue_()
+
+    async def on_request_finished(request):
+        try:
+            record_allowed_sizes(stats, await request.sizes())
+        except Exception:
+            pass
+
+    await context_or_page.route("**/*", handle_route)
+    context_or_page.on("requestfinished", on_request_finished)
+
+
+def crawl4ai_blocking_hook(profile, stats):
+    """
+    生成 crawl4ai 的 on_page_context_created 钩子，在页面创建时安装请求拦截
+
+    用法:
+        crawler.crawler_strategy.set_hook("on_page_context_created", crawl4ai_blocking_hook(CONTENT_PROFILE, stats))
+    """
+    async def on_page_context_created(page, context=None, **kwargs):
+        await install_blocking_async(page, profile, stats)
+        return page
+
+    return on_page_context_created
+
+
+def print_blocking_stats(stats):
+    """
+    打印屏蔽/放行统计
+    """
+    total_requests = stats["allowed_requests"] + stats["blocked_requests"]
+    blocked_rate = stats["blocked_requests"] / total_requests * 100 if total_requests else 0
+    print(f"🚫 屏蔽请求: {stats['blocked_requests']} ({blocked_rate:.1f}%)，"
+          f"估算节省约 {stats['blocked_bytes_estimate'] / 1024 / 1024:.1f} MB（未下载，按各类资源的典型大小估算）")
+    print(f"🌐 放行请求: {stats['allowed_requests']}，实际下载 {stats['allowed_bytes'] / 1024 / 1024:.1f} MB（响应体）")
+    if stats["blocked_by_reason"]:
+        reasons = ", ".join(f"{reason}: {count}" for reason, count in sorted(stats["blocked_by_reason"].items()))
+        print(f"   屏蔽原因: {reasons}")
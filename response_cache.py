@@ -0,0 +1,167 @@
+# 详情页响应缓存：按URL保存 ETag / Last-Modified、mainContent 的哈希和转换好的markdown，
+# 重新爬取时发送条件请求，未变化的页面直接复用缓存，不再转换markdown和重写文件；
+# 缓存按总大小做LRU淘汰
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+from url_catalog import write_json_atomic
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def content_hash(html):
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+def new_cache_stats():
+    """
+    创建缓存统计字典
+    """
+    return {
+        "hit": 0,          # 服务器返回 304，直接复用缓存
+        "revalidated": 0,  # 重新下载但 mainContent 哈希未变，复用缓存
+        "miss": 0,         # 没有缓存
+        "changed": 0,      # 有缓存但内容已变化，重新转换
+        "evicted": 0,      # 因超出大小被淘汰的条目
+    }
+
+
+class ResponseCache:
+    """
+    磁盘响应缓存
+
+    索引保存在 <cache_dir>/index.json，按最近使用顺序排列（最旧在前），
+    每个URL的markdown保存在 <cache_dir>/<sha1(url)>.md。
+    """
+
+    def __init__(self, cache_dir="response_cache", max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_filename = os.path.join(cache_dir, "index.json")
+        self.stats = new_cache_stats()
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.entries = OrderedDict()
+        if os.path.exists(self.index_filename):
+            try:
+                with open(self.index_filename, "r", encoding="utf-8") as f:
+                    self.entries = OrderedDict(json.load(f).get("entries", []))
+            except (OSError, ValueError):
+                print(f"⚠️ 缓存索引损坏，将重建: {self.index_filename}")
+        self.total_bytes = sum(entry.get("size", 0) for entry in self.entries.values())
+
+    def markdown_filename(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".md")
+
+    def conditional_headers(self, url):
+        """
+        生成条件请求头（If-None-Match / If-Modified-Since）
+        """
+        entry = self.entries.get(url)
+        headers = {}
+        # 没有结构化字段的旧条目不发条件请求：304 时没有HTML可以提取字段，取回整页后补充
+        if entry and entry.get("fields") is not None and os.path.exists(self.markdown_filename(url)):
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def known_hash(self, url):
+        """
+        缓存中记录的 mainContent 哈希，没有缓存时返回 None
+        """
+        entry = self.entries.get(url)
+        return entry.get("content_hash") if entry else None
+
+    def lookup(self, url, html_hash=None):
+        """
+        取出未变化页面的缓存结果
+
+        Args:
+            url: 页面URL
+            html_hash: 本次获取到的 mainContent 哈希，为 None 表示服务器返回了 304
+
+        Returns:
+            dict: {'title', 'content', 'fields'}；没有缓存或内容已变化时返回 None
+        """
+        entry = self.entries.get(url)
+        if entry is None:
+            self.stats["miss"] += 1
+            return None
+        if html_hash is not None and html_hash != entry.get("content_hash"):
+            self.stats["changed"] += 1
+            return None
+        try:
+            with open(self.markdown_filename(url), "r", encoding="utf-8") as f:
+                content = f.read()
+        except OSError:
+            self.stats["miss"] += 1
+            return None
+
+        self.entries.move_to_end(url)
+        self.stats["hit" if html_hash is None else "revalidated"] += 1
+        return {"title": entry.get("title", "N/A"), "content": content, "fields": entry.get("fields")}
+
+    def store(self, url, html_hash, title, content, etag=None, last_modified=None, fields=None):
+        """
+        保存（或更新）页面缓存，超出大小时淘汰最久未使用的条目；
+        fields 为结构化字段的原始文本，服务器返回 304 时没有HTML可以重新提取
+        """
+        data = content.encode("utf-8")
+        with open(self.markdown_filename(url), "wb") as f:
+            f.write(data)
+
+        old_entry = self.entries.pop(url, None)
+        if old_entry:
+            self.total_bytes -= old_entry.get("size", 0)
+        self.entries[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": html_hash,
+            "title": title,
+            "fields": fields,
+            "size": len(data),
+        }
+        self.total_bytes += len(data)
+        self.evict()
+
+    def update_fields(self, url, fields):
+        """
+        为没有结构化字段的旧条目补充字段原始文本
+        """
+        entry = self.entries.get(url)
+        if entry is not None:
+            entry["fields"] = fields
+
+    def evict(self):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            url, entry = self.entries.popitem(last=False)
+            self.total_bytes -= entry.get("size", 0)
+            self.stats["evicted"] += 1
+            try:
+                os.remove(self.markdown_filename(url))
+            except OSError:
+                pass
+
+    def save(self):
+        """
+        原子写入缓存索引
+        """
+        write_json_atomic(self.index_filename, {"entries": list(self.entries.items())})
+
+
+def print_cache_stats(stats):
+    """
+    打印缓存命中统计
+    """
+    total = stats["hit"] + stats["revalidated"] + stats["miss"] + stats["changed"]
+    if not total:
+        return
+    reused = stats["hit"] + stats["revalidated"]
+    print(f"🗃️ 响应缓存: 命中(304) {stats['hit']}，重新验证未变化 {stats['revalidated']}，"
+          f"未命中 {stats['miss']}，内容已变化 {stats['changed']}，复用率 {reused / total * 100:.1f}%")
+    if stats["evicted"]:
+        print(f"   LRU淘汰: {stats['evicted']} 条")
@@ -0,0 +1,210 @@
+# 失败重试队列：按错误类型（网络 / 服务器限流 / 永久或提取失败）决定是否重试和最多尝试次数，
+# 可重试的URL按带抖动的指数退避时间放入延迟队列，由 serve_retries 在抓取新URL的同时取出执行，
+# 等待退避期间爬虫继续处理新的URL
+import asyncio
+import heapq
+import itertools
+import random
+import time
+
+NETWORK = "network"
+SERVER = "server"
+PERMANENT = "permanent"
+
+# 每类错误的最多尝试次数（含第一次）和退避参数（秒）
+RETRY_POLICY = {
+    NETWORK: {"max_attempts": 4, "base_delay": 5.0, "max_delay": 120.0},
+    SERVER: {"max_attempts": 5, "base_delay": 30.0, "max_delay": 300.0},
+    PERMANENT: {"max_attempts": 1, "base_delay": 0.0, "max_delay": 0.0},
+}
+
+SERVER_STATUS_CODES = {403, 408, 425, 429, 500, 502, 503, 504}
+
+NETWORK_ERROR_MARKERS = (
+    "timeout", "timed out", "net::err_", "connection", "econnreset", "econnrefused",
+    "socket", "dns", "name resolution", "target closed", "navigat",
+)
+SERVER_ERROR_MARKERS = ("429", "too many requests", "502", "503", "504", "bad gateway", "service unavailable")
+
+
+def classify_failure(result):
+    """
+    判断失败结果的错误类型
+
+    Args:
+        result: 失败的爬取结果，使用其中的 status_code 和 error
+
+    Returns:
+        str: NETWORK（超时、连接、导航错误）、SERVER（5xx、429、403 等限流）或 PERMANENT（404、URL为空、找不到mainContent）
+    """
+    status_code = result.get('status_code')
+    if status_code in SERVER_STATUS_CODES:
+        return SERVER
+    if status_code and 400 <= status_code < 500:
+        return PERMANENT
+    error = (result.get('error') or '').lower()
+    if not error or not result.get('url'):
+        return PERMANENT
+    if any(marker in error for marker in SERVER_ERROR_MARKERS):
+        return SERVER
+    if any(marker in error for marker in NETWORK_ERROR_MARKERS):
+        return NETWORK
+    return PERMANENT
+
+
+def backoff_delay(failure_class, attempt, rng=random):
+    """
+    第 attempt 次尝试失败后的等待时间：在 [0, min(max_delay, base_delay * 2^(attempt-1))] 中均匀取值（full jitter），
+    避免多个失败的URL同时重试
+    """
+    policy = RETRY_POLICY[failure_class]
+    return rng.uniform(0, min(policy["max_delay"], policy["base_delay"] * 2 ** (attempt - 1)))
+
+
+def new_retry_stats():
+    """
+    创建重试统计字典
+    """
+    return {
+        "scheduled": 0,   # 放入重试队列的次数
+        "recovered": 0,   # 重试后成功的URL
+        "exhausted": 0,   # 达到最多尝试次数仍失败的URL
+        "permanent": 0,   # 不重试的失败
+        NETWORK: 0,       # 各类错误的失败次数
+        SERVER: 0,
+        PERMANENT: 0,
+    }
+
+
+class RetryQueue:
+    """
+    延迟重试队列，按到期时间排序
+
+    每个条目为 {'url_index', 'item', 'batch_num', 'attempt', 'failure_class', 'ready_at'}，
+    attempt 为已经尝试的次数。
+    """
+
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+        self.stats = new_retry_stats()
+        self._heap = []
+        self._counter = itertools.count()
+        self._batches = {}
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, url_index, item, batch_num, attempt, result):
+        """
+        对失败结果分类，可以重试时放入队列
+
+        Args:
+            url_index: URL的全局序号
+            item: URL信息
+            batch_num: 所属批次号
+            attempt: 已经尝试的次数
+            result: 本次失败的结果
+
+        Returns:
+            bool: 是否已放入重试队列
+        """
+        failure_class = classify_failure(result)
+        self.stats[failure_class] += 1
+        if failure_class == PERMANENT:
+            self.stats["permanent"] += 1
+            return False
+        if attempt >= RETRY_POLICY[failure_class]["max_attempts"]:
+            self.stats["exhausted"] += 1
+            return False
+
+        delay = backoff_delay(failure_class, attempt, self.rng)
+        entry = {
+            "url_index": url_index,
+            "item": item,
+            "batch_num": batch_num,
+            "attempt": attempt,
+            "failure_class": failure_class,
+            "ready_at": time.monotonic() + delay,
+        }
+        heapq.heappush(self._heap, (entry["ready_at"], next(self._counter), entry))
+        self._batches[batch_num] = self._batches.get(batch_num, 0) + 1
+        self.stats["scheduled"] += 1
+        return True
+
+    def pop_ready(self):
+        """
+        取出一个已到期的条目，没有时返回 None
+        """
+        if not self._heap or self._heap[0][0] > time.monotonic():
+            return None
+        entry = heapq.heappop(self._heap)[2]
+        self._batches[entry["batch_num"]] -= 1
+        return entry
+
+    def seconds_until_next(self):
+        """
+        距离下一个条目到期的秒数，队列为空时返回 None
+        """
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def has_batch(self, batch_num):
+        """
+        批次中是否还有等待重试的URL
+        """
+        return self._batches.get(batch_num, 0) > 0
+
+
+async def serve_retries(queue, retry_entry, done=None, poll_interval=1.0):
+    """
+    执行到期的重试条目，直到 done 被设置；done 为 None 时一直执行到队列清空。
+    重试中抛出的异常向调用方抛出，同时取消其余重试
+
+    Args:
+        queue: RetryQueue
+        retry_entry: 协程函数 retry_entry(entry)，执行一次重试（失败时可再次放入队列）
+        done: asyncio.Event，新URL处理完成时设置
+        poll_interval: 检查新条目的最长间隔（秒）
+    """
+    tasks = set()
+    try:
+        while True:
+            for task in [task for task in tasks if task.done()]:
+                tasks.discard(task)
+                task.result()
+            if done is not None and done.is_set():
+                break
+            entry = queue.pop_ready()
+            if entry is not None:
+                tasks.add(asyncio.create_task(retry_entry(entry)))
+                continue
+            if done is None and not len(queue) and not tasks:
+                break
+            wait = queue.seconds_until_next()
+            wait = poll_interval if wait is None else min(wait, poll_interval)
+            if done is None:
+                await asyncio.sleep(wait)
+            else:
+                try:
+                    await asyncio.wait_for(done.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+        if tasks:
+            await asyncio.gather(*tasks)
+    except BaseException:
+        # 避免调用方退出后仍有重试在使用浏览器
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+def print_retry_stats(stats):
+    """
+    打印重试统计
+    """
+    failures = stats[NETWORK] + stats[SERVER] + stats[PERMANENT]
+    if not failures:
+        return
+    print(f"🔁 失败 {failures} 次 (网络 {stats[NETWORK]}，服务器/限流 {stats[SERVER]}，永久/提取 {stats[PERMANENT]})，"
+          f"重试 {stats['scheduled']} 次，重试后成功 {stats['recovered']}，达到重试上限 {stats['exhausted']}")
@@ -1,29 +1,50 @@
 import json
 import asyncio
+import itertools
 from crawl4ai import AsyncWebCrawler
-from bs4 import BeautifulSoup
-import html2text
 import os
+import time
 from datetime import datetime
 
+from content_dedup import is_new_url, iter_dedup_urls, load_content_index, markdown_hash, new_dedup_stats, save_content_index
+from cpu_stage import ConversionPool, print_conversion_stats
+from crawl_state import CrawlState, print_state_counts, state_filename
+from crawl_store import CrawlStore, print_storage_stats, store_filename
+from crawl4ai_lean import lean_run_config
+from extraction import convert_page
+from field_extraction import fields_filename, fields_frame, save_fields
+from host_limiter import HostLimiterPool
+from http_fetch import (
+    create_http_client,
+    fetch_page_http,
+    load_strategy_memory,
+    new_fetch_stats,
+    print_fetch_stats,
+    record_http_outcome,
+    save_strategy_memory,
+    should_try_http,
+)
+from report_index import append_batch_index, render_final_summary
+from response_cache import DEFAULT_MAX_BYTES, ResponseCache, print_cache_stats
+from resource_blocking import CONTENT_PROFILE, crawl4ai_blocking_hook, new_blocking_stats, print_blocking_stats
+from retry_queue import RetryQueue, print_retry_stats, serve_retries
+from search_index import SEARCH_INDEX_FILENAME, SearchIndex, search_index_filename
+from url_catalog import iter_catalog
 
-def get_urls(json_file_path):
+
+def get_urls(json_file_path, skip=0):
     """
-    从指定的JSON文件中获取urls键值
+    从指定的目录文件中获取urls键值（旧版JSON或JSONL，逐条读取）
     
     Args:
-        json_file_path: JSON文件的路径
+        json_file_path: 目录文件的路径
+        skip: 跳过前 skip 条记录
         
     Returns:
-        list: 包含URL信息的列表
+        list: 包含URL信息的列表；大目录请直接把文件名传给 crawl_multiple_webpages_to_markdown
     """
     try:
-        # 读取JSON文件
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # 获取urls键值
-        urls = data.get('urls', [])
+        urls = list(iter_catalog(json_file_path, skip))
         
         print(f"✅ 成功从 {json_file_path} 获取 {len(urls)} 个URL")
         return urls
@@ -32,74 +53,131 @@ def get_urls(json_file_path):
         print(f"❌ 读取文件失败: {json_file_path} - {str(e)}")
         return []
 
-async def crawl_single_webpage_to_markdown(url, source_info=""):
+def crawl_summary(output_dir=None, total=0, successful=0, failed=0):
+    """
+    crawl_multiple_webpages_to_markdown 的返回值
+    """
+    return {
+        "output_dir": output_dir,
+        "total": total,
+        "successful": successful,
+        "failed": failed,
+    }
+
+async def open_crawler(blocking_profile=None, blocking_stats=None):
+    """
+    启动一个可复用的crawl4ai爬虫实例（一个浏览器进程），使用完后需调用 close()
+    
+    Args:
+        blocking_profile: 请求拦截配置（见 resource_blocking.py），为 None 时不拦截
+        blocking_stats: 拦截统计字典（new_blocking_stats()）
+    """
+    crawler = AsyncWebCrawler(verbose=True)
+    await crawler.start()
+    if blocking_profile:
+        crawler.crawler_strategy.set_hook(
+            "on_page_context_created",
+            crawl4ai_blocking_hook(blocking_profile, blocking_stats if blocking_stats is not None else new_blocking_stats())
+        )
+    return crawler
+
+async def extract_markdown(url, html, cache=None, converter=None, require_text=True):
+    """
+    在CPU阶段提取mainContent并转换为markdown；mainContent 哈希与缓存一致时跳过转换，直接复用缓存
+    
+    Args:
+        url: 网页URL
+        html: 整页HTML
+        cache: ResponseCache，为 None 时不使用缓存
+        converter: ConversionPool，为 None 时在当前进程内转换
+        require_text: 为 True 时 mainContent 没有文字也视为未找到
+    
+    Returns:
+        dict: {'title', 'html_hash', 'content', 'unchanged'}；未找到mainContent时返回 None
+    """
+    known_hash = cache.known_hash(url) if cache is not None else None
+    if converter is None:
+        page = convert_page(html, known_hash, require_text)
+    else:
+        page = await converter.convert(html, known_hash, require_text)
+    if page is None:
+        return None
+    
+    page['unchanged'] = False
+    if cache is not None:
+        cached = cache.lookup(url, page['html_hash'])
+        if cached:
+            page.update(title=cached['title'], content=cached['content'], unchanged=True)
+            if cached['fields'] is None:
+                cache.update_fields(url, page['fields'])
+        elif page['content'] is None:
+            # 哈希一致但缓存文件已丢失，重新转换
+            return await extract_markdown(url, html, converter=converter, require_text=require_text)
+    return page
+
+async def crawl_single_webpage_to_markdown(url, source_info="", crawler=None, blocking_profile=None, blocking_stats=None, cache=None, converter=None):
     """
     使用crawl4ai爬取指定网页的mainContent元素并返回markdown格式内容
+    
+    Args:
+        url: 网页URL
+        source_info: 来源描述
+        crawler: 已启动的爬虫实例（open_crawler()），为 None 时为本次调用单独启动并关闭一个浏览器
+        blocking_profile: 请求拦截配置（见 resource_blocking.py），仅在 crawler 为 None 时使用
+        blocking_stats: 拦截统计字典（new_blocking_stats()），仅在 crawler 为 None 时使用
+        cache: ResponseCache，mainContent 未变化时直接复用缓存的markdown
+        converter: ConversionPool，mainContent 提取和markdown转换在进程池中进行；为 None 时在当前进程内转换
     """
+    own_crawler = crawler is None
     try:
-        # 创建异步爬虫实例
-        async with AsyncWebCrawler(verbose=True) as crawler:
-            # 爬取网页
-            result = await crawler.arun(
-                url=url,
-                # 等待mainContent元素加载完成
-                wait_for_selector="#mainContent",
-                timeout=30000,  # 30秒超时
-                # 设置用户代理
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                # 使用CSS选择器只提取mainContent内容
-                css_selector="#mainContent"
-            )
+        if own_crawler:
+            crawler = await open_crawler(blocking_profile, blocking_stats)
+        # 爬取网页：crawl4ai只负责渲染（等待mainContent出现），不做清洗和markdown转换
+        result = await crawler.arun(url=url, config=lean_run_config())
+        
+        if result.success:
+            # 只解析一次页面，提取mainContent和标题并转换为markdown
+            page = await extract_markdown(url, result.html, cache=cache, converter=converter, require_text=False)
+            print(f"✅ 爬取成功! {source_info}")
+            print(f"📄 页面标题: {page['title'] if page else 'N/A'}")
+            print(f"🔗 URL: {url}")
             
-            if result.success:
-                print(f"✅ 爬取成功! {source_info}")
-                print(f"📄 页面标题: {result.metadata.get('title', 'N/A')}")
-                print(f"🔗 URL: {url}")
+            if page:
+                print("🔍 找到 mainContent 元素")
+                if page['unchanged']:
+                    print("🗃️ mainContent 未变化，复用缓存")
+                    return unchanged_result(source_info, url, page)
                 
-                # 从HTML内容中提取mainContent并转换为markdown
-                soup = BeautifulSoup(result.html, 'html.parser')
-                maincontent_element = soup.find(id='mainContent')
+                print(f"📝 转换后内容长度: {len(page['content'])} 字符")
+                if cache is not None:
+                    cache.store(url, page['html_hash'], page['title'], page['content'], fields=page['fields'])
                 
-                if maincontent_element:
-                    print("🔍 找到 mainContent 元素")
-                    
-                    # 设置html2text转换器
-                    h = html2text.HTML2Text()
-                    h.ignore_links = False
-                    h.ignore_images = False
-                    h.body_width = 0  # 不限制行宽
-                    
-                    # 转换mainContent为markdown
-                    print("📋 处理 mainContent 元素...")
-                    maincontent_html = str(maincontent_element)
-                    markdown_content = h.handle(maincontent_html)
-                    
-                    print(f"📝 转换后内容长度: {len(markdown_content)} 字符")
-                    
-                    return {
-                        'success': True,
-                        'source': source_info,
-                        'url': url,
-                        'title': result.metadata.get('title', 'N/A'),
-                        'content': markdown_content,
-                        'element_found': True
-                    }
-                else:
-                    print(f"❌ 未找到mainContent元素: {source_info}")
-                    return {
-                        'success': False,
-                        'source': source_info,
-                        'url': url,
-                        'error': '未找到mainContent元素'
-                    }
+                return {
+                    'success': True,
+                    'source': source_info,
+                    'url': url,
+                    'title': page['title'],
+                    'content': page['content'],
+                    'fields': page['fields'],
+                    'element_found': True
+                }
             else:
-                print(f"❌ 爬取失败: {source_info} - {result.error_message}")
+                print(f"❌ 未找到mainContent元素: {source_info}")
                 return {
                     'success': False,
                     'source': source_info,
                     'url': url,
-                    'error': result.error_message
+                    'error': '未找到mainContent元素'
                 }
+        else:
+            print(f"❌ 爬取失败: {source_info} - {result.error_message}")
+            return {
+                'success': False,
+                'source': source_info,
+                'url': url,
+                'error': result.error_message,
+                'status_code': getattr(result, 'status_code', None)
+            }
                 
     except Exception as e:
         print(f"❌ 发生错误: {source_info} - {str(e)}")
@@ -109,8 +187,128 @@ async def crawl_single_webpage_to_markdown(url, source_info=""):
             'url': url,
             'error': str(e)
         }
+    finally:
+        if own_crawler and crawler is not None:
+            try:
+                await crawler.close()
+            except Exception:
+                pass
+
+def unchanged_result(source_info, url, cached):
+    """
+    由缓存生成未变化页面的结果，unchanged 标记让 save_batch_results 跳过已存在的文件
+    """
+    return {
+        'success': True,
+        'source': source_info,
+        'url': url,
+        'title': cached['title'],
+        'content': cached['content'],
+        'fields': cached.get('fields'),
+        'element_found': True,
+        'unchanged': True
+    }
 
-def save_batch_results(results, output_dir, batch_num, start_index):
+async def fetch_webpage_to_markdown(url, source_info, crawler, http_client=None, strategy_memory=None, fetch_stats=None, cache=None, converter=None):
+    """
+    先用HTTP直接获取页面并提取mainContent，元素缺失或为空时改用浏览器爬取
+    
+    Args:
+        url: 网页URL
+        source_info: 来源描述
+        crawler: 共享的爬虫实例，用于浏览器回退
+        http_client: create_http_client() 创建的客户端，为 None 时只用浏览器
+        strategy_memory: 按URL模式记录HTTP成功/回退次数的字典（见 http_fetch.py）
+        fetch_stats: new_fetch_stats() 创建的统计字典
+        cache: ResponseCache，HTTP请求带上条件请求头，未变化的页面直接复用缓存
+        converter: ConversionPool，为 None 时在当前进程内转换
+    
+    Returns:
+        dict: 与 crawl_single_webpage_to_markdown 相同的结果，并附带 fetch_method ('http' / 'browser')
+    """
+    if strategy_memory is None:
+        strategy_memory = {}
+    if fetch_stats is None:
+        fetch_stats = new_fetch_stats()
+    
+    if http_client is not None:
+        if should_try_http(strategy_memory, url):
+            headers = cache.conditional_headers(url) if cache is not None else None
+            response = await fetch_page_http(http_client, url, headers=headers)
+            if response is not None and response.get('not_modified'):
+                cached = cache.lookup(url) if cache is not None else None
+                if cached:
+                    record_http_outcome(strategy_memory, url, True)
+                    fetch_stats['http'] += 1
+                    print(f"🗃️ 页面未修改 (304)，复用缓存: {source_info}")
+                    result = unchanged_result(source_info, url, cached)
+                    result['fetch_method'] = 'http'
+                    return result
+                response = await fetch_page_http(http_client, url)
+            page = await extract_markdown(url, response['html'], cache=cache, converter=converter) if response else None
+            if response is not None:
+                # 只有拿到页面却没有 mainContent 才说明该URL模式需要浏览器，请求失败不计入
+                record_http_outcome(strategy_memory, url, page is not None)
+            if page is not None:
+                fetch_stats['http'] += 1
+                if page['unchanged']:
+                    print(f"🗃️ mainContent 未变化，复用缓存: {source_info}")
+                    result = unchanged_result(source_info, url, page)
+                    result['fetch_method'] = 'http'
+                    return result
+                if cache is not None:
+                    cache.store(url, page['html_hash'], page['title'], page['content'],
+                                etag=response['etag'], last_modified=response['last_modified'], fields=page['fields'])
+                print(f"⚡ HTTP获取成功! {source_info}")
+                print(f"📝 转换后内容长度: {len(page['content'])} 字符")
+                return {
+                    'success': True,
+                    'source': source_info,
+                    'url': url,
+                    'title': page['title'],
+                    'content': page['content'],
+                    'fields': page['fields'],
+                    'element_found': True,
+                    'fetch_method': 'http'
+                }
+            fetch_stats['http_fallback'] += 1
+            print(f"↪️ HTTP未获取到mainContent，改用浏览器: {source_info}")
+        else:
+            fetch_stats['browser_direct'] += 1
+    
+    result = await crawl_single_webpage_to_markdown(url, source_info, crawler=crawler, cache=cache, converter=converter)
+    fetch_stats['browser'] += 1
+    result['fetch_method'] = 'browser'
+    return result
+
+def page_file_name(file_index, result):
+    return f"{file_index:03d}_{result.get('name', 'unknown').replace('/', '_').replace(' ', '_')}"
+
+
+def page_file_index(file_path):
+    """
+    单页文件（batch_001/003_名称.md）的全局序号
+    """
+    return int(os.path.basename(file_path).split('_', 1)[0])
+
+
+def remove_stale_page_files(batch_dir, batch_num, results, start_index, content_index=None):
+    """
+    删除批次目录中不属于本批次结果的单页文件（目录插入或删除条目后，同一序号换了页面），
+    并从正文哈希索引中去掉指向这些文件的记录
+    """
+    expected = {f"{page_file_name(start_index + i + 1, result)}.md" for i, result in enumerate(results) if result['success']}
+    stale = set()
+    for filename in os.listdir(batch_dir):
+        if filename.endswith(".md") and not filename.startswith("batch_") and filename not in expected:
+            os.remove(os.path.join(batch_dir, filename))
+            stale.add(f"batch_{batch_num:03d}/{filename}")
+    if stale and content_index:
+        for content_hash in [content_hash for content_hash, path in content_index.items() if path in stale]:
+            del content_index[content_hash]
+
+
+def save_batch_results(results, output_dir, batch_num, start_index, content_index=None):
     """
     保存批次结果到文件
     
@@ -119,12 +317,19 @@ def save_batch_results(results, output_dir, batch_num, start_index):
         output_dir: 输出目录
         batch_num: 批次号
         start_index: 起始索引 (当前批次在总URL列表中的起始索引)
+        content_index: 正文哈希索引 {哈希: 文件相对路径}，正文与已保存文件相同的记录只写引用，
+                       并在结果中标记 duplicate_of；为 None 时不做正文去重
+    
+    缓存确认未变化且文件已存在的页面不重写单页文件，在批次汇总中只写引用；
+    整个批次都是这样的页面时，已有的批次汇总也保持不变
     """
     batch_dir = os.path.join(output_dir, f"batch_{batch_num:03d}")
     os.makedirs(batch_dir, exist_ok=True)
+    remove_stale_page_files(batch_dir, batch_num, results, start_index, content_index)
     
     batch_content = ""
     successful_count = 0
+    all_unchanged = bool(results)
     
     for i, result in enumerate(results):
         # 文件的全局索引是批次起始索引 + 批次内索引 + 1
@@ -133,8 +338,30 @@ def save_batch_results(results, output_dir, batch_num, start_index):
         if result['success']:
             successful_count += 1
             # 生成安全的文件名
-            safe_filename = f"{file_index:03d}_{result.get('name', 'unknown').replace('/', '_').replace(' ', '_')}" # Use name for filename
+            safe_filename = page_file_name(file_index, result) # Use name for filename
             file_path = os.path.join(batch_dir, f"{safe_filename}.md")
+            unchanged_file_exists = result.get('unchanged') and os.path.exists(file_path)
+            
+            result['file'] = f"batch_{batch_num:03d}/{safe_filename}.md"
+            
+            # 正文与之前保存的文件相同时只保存引用
+            body = result['content']
+            if content_index is not None:
+                content_hash = markdown_hash(result['content'])
+                first_path = content_index.get(content_hash)
+                if first_path is None or page_file_index(first_path) >= file_index:
+                    # 序号不在本页之前的引用来自目录变化前的运行，以本页为准
+                    first_path = content_index[content_hash] = result['file']
+                if first_path != result['file']:
+                    result['duplicate_of'] = first_path
+                    body = f"> 正文与 [{first_path}](../{first_path}) 相同，不重复保存。\n"
+            
+            batch_content += f"\n\n{'='*80}\n"
+            if unchanged_file_exists:
+                # 缓存确认未变化且文件已存在时不再重写，批次汇总中只写引用
+                batch_content += f"# {result.get('name', 'Unknown')}\n\n> 页面未变化，见 [{result['file']}](../{result['file']})。\n"
+                continue
+            all_unchanged = False
             
             # 构建文件内容
             file_content = f"""# {result.get('name', 'Unknown')}
@@ -147,7 +374,7 @@ def save_batch_results(results, output_dir, batch_num, start_index):
 
 ---
 
-{result['content']}
+{body}
 """
             
             # 保存单个文件
@@ -155,11 +382,15 @@ def save_batch_results(results, output_dir, batch_num, start_index):
                 f.write(file_content)
             
             # 添加到批次汇总内容中
-            batch_content += f"\n\n{'='*80}\n"
             batch_content += file_content
+        else:
+            all_unchanged = False
     
     # 保存批次汇总文件
     batch_summary_file = os.path.join(batch_dir, f"batch_{batch_num:03d}_summary.md")
+    if all_unchanged and os.path.exists(batch_summary_file):
+        print(f"💾 批次 {batch_num} 的页面均未变化，保留已有文件: {batch_dir}")
+        return successful_count
     with open(batch_summary_file, "w", encoding="utf-8") as f:
         f.write(f"""# 批次 {batch_num} 爬取结果汇总
 
@@ -178,25 +409,28 @@ def save_batch_results(results, output_dir, batch_num, start_index):
             # 这里的索引也是批次内的相对索引
             status = "✅ 成功" if result['success'] else "❌ 失败"
             error_msg = f" - {result.get('error', '')}" if not result['success'] else ""
-            f.write(f"{start_index + i + 1}. {status} | {result.get('source', 'Unknown')} | {result.get('name', 'Unknown')}{error_msg}\n")
+            duplicate_msg = f" (正文同 {result['duplicate_of']})" if result.get('duplicate_of') else ""
+            f.write(f"{start_index + i + 1}. {status} | {result.get('source', 'Unknown')} | {result.get('name', 'Unknown')}{error_msg}{duplicate_msg}\n")
         
         f.write(f"\n---\n\n{batch_content}")
     
     print(f"💾 批次 {batch_num} 结果已保存到 {batch_dir}")
     return successful_count
 
-def save_progress_log(output_dir, processed_count, total_count, successful_count, failed_count, start_time=None, end_time=None, output_dir_name=None):
+def save_progress_log(output_dir, processed_count, total_count, successful_count, failed_count, start_time=None, end_time=None, output_dir_name=None, pages_per_second=None, dedup_stats=None):
     """
     保存进度日志
     Args:
         output_dir: 结果输出目录的完整路径
         processed_count: 截至目前已处理的URL总数
-        total_count: 总URL数量
+        total_count: 总URL数量，流水线模式下发现阶段结束前为 None
         successful_count: 截至目前成功的URL总数
         failed_count: 截至目前失败的URL总数
         start_time: 爬取任务开始时间
         end_time: 爬取任务结束时间 (如果已完成)
         output_dir_name: 结果输出目录的名称 (例如: crawl_results_break_20240101_120000)
+        pages_per_second: 本次运行的爬取速度 (页/秒)，为 None 时沿用已有记录
+        dedup_stats: 去重统计 (new_dedup_stats())，为 None 时沿用已有记录
     """
     progress_file = os.path.join(output_dir, "progress_log.json")
     
@@ -216,9 +450,11 @@ def save_progress_log(output_dir, processed_count, total_count, successful_count
         "total_count": total_count,
         "successful_count": successful_count,
         "failed_count": failed_count,
-        "progress_percentage": round((processed_count / total_count) * 100, 2) if total_count > 0 else 0,
-        "is_completed": processed_count >= total_count,
-        "output_dir_name": output_dir_name or existing_data.get("output_dir_name")
+        "progress_percentage": round((processed_count / total_count) * 100, 2) if total_count else 0,
+        "is_completed": total_count is not None and processed_count >= total_count,
+        "output_dir_name": output_dir_name or existing_data.get("output_dir_name"),
+        "pages_per_second": pages_per_second if pages_per_second is not None else existing_data.get("pages_per_second"),
+        "dedup": dedup_stats if dedup_stats is not None else existing_data.get("dedup")
     }
     
     if progress_data["start_time"] and progress_data["end_time"]:
@@ -234,12 +470,15 @@ def save_progress_log(output_dir, processed_count, total_count, successful_count
     with open(progress_file, "w", encoding="utf-8") as f:
         json.dump(progress_data, f, ensure_ascii=False, indent=2)
 
-def load_progress_log(output_dir_prefix="crawl_results_break"):
+def load_progress_log(output_dir_prefix="crawl_results_break", output_dir=None):
     """
     加载最新的进度日志。
-    查找最近创建的且未完成的爬取目录及其进度日志。
+    查找最近创建的且未完成的爬取目录及其进度日志；指定 output_dir 时只检查该目录。
     """
-    existing_dirs = [d for d in os.listdir('.') if os.path.isdir(d) and d.startswith(output_dir_prefix)]
+    if output_dir:
+        existing_dirs = [output_dir] if os.path.isdir(output_dir) else []
+    else:
+        existing_dirs = [d for d in os.listdir('.') if os.path.isdir(d) and d.startswith(output_dir_prefix)]
     if not existing_dirs:
         return None, None
 
@@ -266,107 +505,101 @@ def load_progress_log(output_dir_prefix="crawl_results_break"):
     return None, None
 
 
-def update_overall_summary(output_dir, all_results, total_successful, total_failed, current_batch, total_batches, batch_size, start_time, total_urls_overall):
+def update_overall_summary(output_dir, processed_count, total_successful, total_failed, current_batch, total_batches, batch_size, start_time, total_urls_overall,
+                           last_batch_results=None, dedup_stats=None, end_time=None, storage="files"):
     """
     更新总体汇总报告 (00_OVERALL_SUMMARY.md) - 实时进度报告
+    
+    只写入固定大小的进度信息和最近一个批次的失败URL，耗时与已完成的批次数无关；
+    每个批次的完整结果见 report_index.jsonl，完整报告在任务完成时由 render_final_summary 生成。
+    
+    Args:
+        processed_count: 截至目前已处理的URL总数
+        last_batch_results: 最近完成批次的结果列表，用于列出失败URL
+        dedup_stats: 去重统计
+        end_time: 任务结束时间 (如果已完成)
+        storage: 结果存储方式，"files" 或 "sqlite"（见 crawl_store.py）
     """
     current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    processed_count = len(all_results) # This now includes dummy data for resumed runs
     total_urls = total_urls_overall # Use the explicitly passed total URL count
+    # 流水线模式下发现阶段结束前 total_urls 和 total_batches 为 None
+    is_completed = total_urls is not None and processed_count >= total_urls # Check if all URLs are processed based on the actual total_urls
     
     duration_info = ""
-    is_completed = processed_count >= total_urls # Check if all URLs are processed based on the actual total_urls
+    try:
+        start_dt = datetime.strptime(start_time, '%Y-%m-%d %H:%M:%S')
+        end_dt = datetime.strptime(end_time, '%Y-%m-%d %H:%M:%S') if end_time else datetime.now()
+        duration_label = "总耗时" if end_time else "当前耗时"
+        duration_info = f"**{duration_label}**: {str(end_dt - start_dt).split('.')[0]}  \n"
+    except (TypeError, ValueError):
+        pass
     
-    progress_file = os.path.join(output_dir, "progress_log.json")
-    if os.path.exists(progress_file):
-        try:
-            with open(progress_file, "r", encoding="utf-8") as f:
-                progress_data = json.load(f)
-                if progress_data.get("total_duration_formatted"):
-                    duration_info = f"**总耗时**: {progress_data['total_duration_formatted']}  \n"
-                elif progress_data.get("start_time"):
-                    try:
-                        start_dt = datetime.strptime(progress_data["start_time"], '%Y-%m-%d %H:%M:%S')
-                        current_dt = datetime.now()
-                        current_duration = current_dt - start_dt
-                        duration_info = f"**当前耗时**: {str(current_duration).split('.')[0]}  \n"
-                    except ValueError:
-                        pass
-        except Exception:
-            pass
+    dedup_info = ""
+    if dedup_stats:
+        dedup_info = (f"**重复URL (已合并)**: {dedup_stats['duplicate_urls']}  \n"
+                      f"**重复正文 (只保存引用)**: {dedup_stats['duplicate_contents']}  \n")
     
     summary_file = os.path.join(output_dir, "00_OVERALL_SUMMARY.md")
     
     with open(summary_file, "w", encoding="utf-8") as f:
-        status_emoji = "🎉" if is_completed and processed_count == total_urls else "🔄"
-        status_text = "最终爬取汇总报告" if is_completed and processed_count == total_urls else "实时爬取进度报告"
+        status_emoji = "🎉" if is_completed else "🔄"
+        status_text = "最终爬取汇总报告" if is_completed else "实时爬取进度报告"
         
         f.write(f"""# {status_emoji} {status_text}
 
 **爬取开始时间**: {start_time}  
 **最后更新时间**: {current_time}  
-{duration_info}**总URL数量**: {total_urls}  
+{duration_info}**总URL数量**: {total_urls if total_urls is not None else '未知 (发现阶段进行中)'}  
 **已处理URL数量**: {processed_count}  
-**已完成批次**: {current_batch}/{total_batches}  
+**已完成批次**: {current_batch}/{total_batches or '?'}  
 **批次大小**: {batch_size}  
 **✅ 总成功数量**: {total_successful}  
 **❌ 总失败数量**: {total_failed}  
-**当前成功率**: {(total_successful/processed_count*100):.2f}% (基于已处理的URL)
-**整体进度**: {(processed_count/total_urls*100):.1f}%
-""")
+**当前成功率**: {(total_successful/processed_count*100) if processed_count else 0:.2f}% (基于已处理的URL)
+**整体进度**: {f"{processed_count/total_urls*100:.1f}%" if total_urls else '-'}
+{dedup_info}""")
         
-        if is_completed and processed_count == total_urls:
-            f.write("""
-## 📁 文件结构说明
+        if storage == "sqlite":
+            f.write(f"""
+## 📁 文件结构说明{'' if is_completed else ' (实时更新)'}
 
 - `00_OVERALL_SUMMARY.md` - 本文件，总体汇总报告（实时更新）
-- `00_FINAL_SUMMARY.md` - 最终汇总报告（每批次更新）
+- `crawl_store.sqlite` - 所有页面的元数据和正文（每个页面只写入一次）
 - `progress_log.json` - 详细进度日志文件
+
+单页文件、批次汇总和最终汇总运行 `python crawl_store.py export <输出目录> <导出目录>` 按需生成。
 """)
         else:
-            f.write("""
-## 📁 文件结构说明 (实时更新)
+            f.write(f"""
+## 📁 文件结构说明{'' if is_completed else ' (实时更新)'}
 
 - `00_OVERALL_SUMMARY.md` - 本文件，总体汇总报告（实时更新）
-- `00_FINAL_SUMMARY.md` - 最终汇总报告（每批次更新）
+- `00_FINAL_SUMMARY.md` - 最终汇总报告（任务完成时生成，也可运行 `python report_index.py <输出目录>` 随时生成）
+- `report_index.jsonl` - 每批次追加的结果索引
 - `progress_log.json` - 详细进度日志文件
 """)
 
         f.write("\n## 📊 批次处理状态\n\n")
+        if current_batch:
+            f.write(f"- ✅ 批次 1-{current_batch} (URL 1-{processed_count}) - 已完成 - `batch_001/` ... `batch_{current_batch:03d}/`\n")
+        if total_batches is None or current_batch < total_batches:
+            start_idx = current_batch * batch_size
+            end_idx = start_idx + batch_size if total_urls is None else min(start_idx + batch_size, total_urls)
+            f.write(f"- 🔄 批次 {current_batch + 1} (URL {start_idx + 1}-{end_idx}) - 处理中...\n")
+        if total_batches is not None and current_batch + 1 < total_batches:
+            f.write(f"- ⏳ 批次 {current_batch + 2}-{total_batches} (URL {(current_batch + 1) * batch_size + 1}-{total_urls}) - 等待处理\n")
         
-        for batch_num_iter in range(1, total_batches + 1):
-            start_idx = (batch_num_iter - 1) * batch_size
-            end_idx = min(start_idx + batch_size, total_urls)
-            
-            if batch_num_iter <= current_batch:
-                # 已完成的批次
-                # Note: `all_results` contains dummy results for previous batches on resume.
-                # To get actual success/fail for previous batches, one might need to read `batch_XXX_summary.md`.
-                # For this implementation, we rely on total_successful/total_failed and assume previous batches were successful
-                # based on `progress_log.json`'s `processed_count`.
-                f.write(f"- ✅ 批次 {batch_num_iter} (URL {start_idx + 1}-{end_idx}) - 已完成 - `batch_{batch_num_iter:03d}/`\n")
-            elif batch_num_iter == current_batch + 1:
-                # 正在处理的批次
-                f.write(f"- 🔄 批次 {batch_num_iter} (URL {start_idx + 1}-{end_idx}) - 处理中...\n")
-            else:
-                # 待处理的批次
-                f.write(f"- ⏳ 批次 {batch_num_iter} (URL {start_idx + 1}-{end_idx}) - 等待处理\n")
-        
-        # Display failed URLs only for the current run's failures, or all if we rebuild full all_results
-        # For this batch-level resume, we show failures from the *current* run's `all_results`.
-        # If `all_results` is only populated with dummy data for previous runs,
-        # then this section will only show failures from the current execution segment.
-        failed_results_current_run = [r for r in all_results[processed_count - (processed_count - (total_successful + total_failed)):] if not r.get('success', False)] # Slice to get only current run's results
+        failed_results_last_batch = [r for r in (last_batch_results or []) if not r.get('success', False)]
         
-        if failed_results_current_run:
-            f.write(f"\n## 🔍 失败URL详情 (共{len(failed_results_current_run)}个 - 当前运行批次)\n\n")
-            for i, result in enumerate(failed_results_current_run, 1):
+        if failed_results_last_batch:
+            f.write(f"\n## 🔍 失败URL详情 (共{len(failed_results_last_batch)}个 - 最近完成的批次 {current_batch})\n\n")
+            for i, result in enumerate(failed_results_last_batch, 1):
                 f.write(f"{i}. **{result.get('name', 'Unknown')}**\n")
                 f.write(f"   - 来源: {result.get('source', 'Unknown')}\n")
                 f.write(f"   - URL: {result.get('url', '')}\n")
                 f.write(f"   - 错误: {result.get('error', '')}\n\n")
         
-        if is_completed and processed_count == total_urls:
+        if is_completed:
             f.write(f"\n---\n\n## 🎊 爬取任务已全部完成！\n\n")
             f.write(f"感谢您的耐心等待，所有 {processed_count} 个URL已处理完毕。\n")
             f.write(f"详细结果请查看各批次目录中的文件。\n")
@@ -376,343 +609,564 @@ def update_overall_summary(output_dir, all_results, total_successful, total_fail
             f.write(f"您可以随时查看此文件了解最新进度。\n")
 
 
-def generate_final_summary_report(output_dir, all_results, total_successful, total_failed, url_list_original, batch_size, start_time, current_end_time, total_urls_overall):
-    """
-    生成或更新最终汇总报告 (00_FINAL_SUMMARY.md)
-    这个报告会随着每批次处理完成而更新，反映当前的累计结果。
+async def crawl_url_item(item, global_index, total_count, crawler, global_semaphore, limiters, position="", state=None, **fetch_options):
     """
-    total_urls = total_urls_overall # Use the explicitly passed total URL count
-    processed_urls_count = len(all_results) # This now includes dummy data for resumed runs
-    total_batches = (total_urls + batch_size - 1) // batch_size
-
-    final_summary_file = os.path.join(output_dir, "00_FINAL_SUMMARY.md")
-
-    progress_file = os.path.join(output_dir, "progress_log.json")
-    duration_info = ""
-    is_completed = processed_urls_count >= total_urls 
+    抓取单个URL：先占用全局并发名额，再经过所属主机的限流器（并发数 + 最小请求间隔）
     
-    if os.path.exists(progress_file):
-        try:
-            with open(progress_file, "r", encoding="utf-8") as f:
-                progress_data = json.load(f)
-                if progress_data.get("total_duration_formatted"):
-                    duration_info = f"**总耗时**: {progress_data['total_duration_formatted']}  \n"
-                elif progress_data.get("start_time") and current_end_time:
-                    try:
-                        start_dt = datetime.strptime(progress_data["start_time"], '%Y-%m-%d %H:%M:%S')
-                        current_dt = datetime.strptime(current_end_time, '%Y-%m-%d %H:%M:%S')
-                        current_duration = current_dt - start_dt
-                        duration_info = f"**当前累计耗时**: {str(current_duration).split('.')[0]}  \n"
-                    except ValueError:
-                        pass
-        except Exception:
-            pass
-
-    with open(final_summary_file, "w", encoding="utf-8") as f:
-        status_emoji = "🎉" if is_completed else "📊"
-        status_text = "最终爬取汇总报告" if is_completed else "累计爬取汇总报告 (实时更新)"
-
-        f.write(f"""# {status_emoji} {status_text}
-
-**爬取开始时间**: {start_time}  
-**报告生成时间**: {current_end_time}  
-{duration_info}**总URL数量**: {total_urls}  
-**已处理URL数量**: {processed_urls_count}  
-**批次数量**: {total_batches}  
-**批次大小**: {batch_size}  
-**✅ 总成功数量**: {total_successful}  
-**❌ 总失败数量**: {total_failed}  
-**成功率**: {(total_successful/processed_urls_count*100):.2f}% (基于已处理的URL)
-
-## 📁 文件结构说明
-- `00_OVERALL_SUMMARY.md` - 总体汇总报告（实时进度）
-- `00_FINAL_SUMMARY.md` - 本文件，累计/最终汇总报告
-- `progress_log.json` - 进度日志文件
-- `batch_001/` - 第1批次结果
-- `batch_002/` - 第2批次结果
-- ... 依此类推
-
-每个批次目录包含:
-- `batch_XXX_summary.md` - 批次汇总文件
-- `001_xxx.md`, `002_xxx.md` - 单个URL的爬取结果
+    Args:
+        item: URL信息，包含 'final_url', 'source', 'name'
+        global_index: URL的全局序号
+        total_count: 总URL数量（仅用于显示）
+        position: 附加的位置说明（仅用于显示）
+        state: CrawlState，开始抓取时标记为处理中
+        fetch_options: 传给 fetch_webpage_to_markdown 的参数
+    
+    Returns:
+        dict: 爬取结果，带有 name 字段
+    """
+    source_info = f"{item.get('source', 'Unknown')} - {item.get('name', 'Unknown')}"
+    async with global_semaphore:
+        async with limiters.for_url(item['final_url']):
+            print(f"\n{'.'*60}")
+            print(f"处理第 {global_index}/{total_count} 个URL{position}")
+            print(f"来源: {item.get('source', 'Unknown')}")
+            print(f"名称: {item.get('name', 'Unknown')}")
+            print(f"URL: {item['final_url']}")
+            print(f"{'.'*60}")
+            if state is not None:
+                state.mark_in_flight(global_index)
+            result = await fetch_webpage_to_markdown(item['final_url'], source_info, crawler, **fetch_options)
+    result['name'] = item.get('name', 'Unknown')
+    return result
 
-## 📊 详细结果统计 (基于已处理的URL)
 
-""")
-        
-        # Group results by batch for accurate statistics from all_results
-        batch_wise_results = {}
-        for result in all_results:
-            batch_num = result.get('batch_num')
-            if batch_num not in batch_wise_results:
-                batch_wise_results[batch_num] = []
-            batch_wise_results[batch_num].append(result)
-
-        for batch_num in sorted(batch_wise_results.keys()):
-            batch_results = batch_wise_results[batch_num]
-            # Use sum(1 for r in batch_results if r.get('success', False)) if using dummy data
-            # If using actual data (if rebuilt from files), then check 'success'
-            batch_success = sum(1 for r in batch_results if r.get('success', False))
-            batch_fail = len(batch_results) - batch_success
-            
-            start_idx_original = (batch_num - 1) * batch_size
-            end_idx_original = min(start_idx_original + batch_size, total_urls)
+def finish_item(result, global_index, item, batch_num, attempt, state=None, retry_queue=None):
+    """
+    记录一次尝试的结果：可以重试的失败放入重试队列，否则提交为最终结果
 
-            f.write(f"### 批次 {batch_num} (URL {start_idx_original + 1}-{end_idx_original})\n")
-            f.write(f"- ✅ 成功: {batch_success}\n")
-            f.write(f"- ❌ 失败: {batch_fail}\n")
-            f.write(f"- 📁 目录: `batch_{batch_num:03d}/`\n\n")
-        
-        f.write("## 📋 所有URL详细内容 (累计)\n\n") 
-        
-        cumulative_content_for_final_report = ""
-        for i, result in enumerate(all_results, 1):
-            # If `all_results` contains dummy entries for previous runs,
-            # this part will only show full content for the current run's processed items.
-            # For previously processed (resumed) items, it will only show success/fail status
-            # unless a more complex `all_results` reconstruction from files is implemented.
-            if result.get('success', False) and 'content' in result: # Only show content if available
-                cumulative_content_for_final_report += f"""# {result.get('name', 'Unknown')}
+    Returns:
+        bool: 是否已放入重试队列
+    """
+    result['batch_num'] = batch_num
+    result['attempts'] = attempt
+    if not result['success'] and retry_queue is not None and retry_queue.schedule(global_index, item, batch_num, attempt, result):
+        if state is not None:
+            state.mark_retry(global_index, result)
+        return True
+    if state is not None:
+        state.mark_finished(global_index, result)
+    return False
 
-**来源**: {result.get('source', 'Unknown')}  
-**URL**: {result['url']}  
-**页面标题**: {result['title']}  
-**mainContent元素**: {'已找到' if result.get('element_found') else '未找到'}  
-**爬取时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
----
+async def crawl_batch_concurrently(batch_items, start_index, total_count, batch_num, crawler, global_semaphore, limiters,
+                                   http_client=None, strategy_memory=None, fetch_stats=None, cache=None, converter=None,
+                                   state=None, finished=None, retry_queue=None, results=None):
+    """
+    并发爬取一个批次的URL
+    
+    每个请求先占用全局并发名额，再经过所属主机的限流器（并发数 + 最小请求间隔）。
+    结果按 batch_items 的原始顺序返回，保证批次文件的编号和内容与逐个处理时一致。
+    
+    Args:
+        batch_items: 当前批次的URL信息列表，也可以是异步迭代器（流水线模式，每收到一条就开始抓取）
+        start_index: 当前批次在总URL列表中的起始索引
+        total_count: 总URL数量（仅用于显示）
+        batch_num: 批次号
+        crawler: 共享的爬虫实例
+        global_semaphore: 全局并发信号量
+        limiters: HostLimiterPool
+        http_client: HTTP快速通道客户端，为 None 时只用浏览器
+        strategy_memory: 按URL模式记录的抓取方式
+        fetch_stats: 抓取方式统计字典
+        cache: ResponseCache，为 None 时不使用缓存
+        converter: ConversionPool，转换跟不上时抓取任务在此等待，不再占用新的抓取名额
+        state: CrawlState，每个URL开始和完成时提交状态，为 None 时不记录
+        finished: 上次运行中已完成的结果 {全局序号: (URL, 结果)}，URL与本次条目一致时不再抓取
+        retry_queue: RetryQueue，可以重试的失败放入队列（结果中暂时保留失败记录），为 None 时不重试
+        results: 写入结果的列表，调用方可预先登记（批次仍在抓取时重试结果也写入同一列表），为 None 时新建
+    
+    Returns:
+        list: 与 batch_items 顺序一致的结果列表
+    """
+    if results is None:
+        results = []
+    tasks = []
+    batch_length = len(batch_items) if isinstance(batch_items, list) else '?'
 
-{result['content']}
-"""
-            else:
-                # For failed or dummy items, include their details and error, but no content
-                status_text = "成功 (旧批次)" if result.get('success', False) else "失败"
-                cumulative_content_for_final_report += f"""# {status_text}: {result.get('name', 'Unknown URL')}
+    async def crawl_item(i, item):
+        global_index = start_index + i + 1
 
-**来源**: {result.get('source', 'Unknown')}  
-**URL**: {result.get('url', 'N/A')}  
-**错误**: {result.get('error', 'N/A')}  
-**爬取时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        if finished and global_index in finished:
+            finished_url, finished_result = finished[global_index]
+            # 流水线模式下批次开始后才登记URL，目录在同一序号换了URL时上次的结果不能复用
+            if finished_url == item.get('final_url', ''):
+                results[i] = finished_result
+                return
 
----
-"""
-            
-            if i < len(all_results):
-                cumulative_content_for_final_report += f"\n\n{'='*80}\n\n"
+        if not item.get('final_url'):
+            print(f"❌ 第 {global_index} 个URL为空，跳过此项: {item.get('source', 'Unknown')} - {item.get('name', 'Unknown')}")
+            results[i] = {
+                'success': False,
+                'source': item.get('source', 'Unknown'),
+                'name': item.get('name', 'Unknown'),
+                'url': '',
+                'error': 'URL为空',
+                'batch_num': batch_num
+            }
+            if state is not None:
+                state.mark_finished(global_index, results[i])
+            return
 
-        f.write(cumulative_content_for_final_report)
+        result = await crawl_url_item(
+            item, global_index, total_count, crawler, global_semaphore, limiters,
+            position=f" (批次内第 {i+1}/{batch_length} 个)", state=state,
+            http_client=http_client, strategy_memory=strategy_memory, fetch_stats=fetch_stats, cache=cache,
+            converter=converter
+        )
+        results[i] = result
+        finish_item(result, global_index, item, batch_num, 1, state, retry_queue)
 
+    def start_item(item):
+        results.append(None)
+        tasks.append(asyncio.create_task(crawl_item(len(results) - 1, item)))
 
-        if is_completed:
-            f.write(f"\n---\n\n## 🎊 爬取任务已全部完成！\n\n")
-            f.write(f"感谢您的耐心等待，所有 {processed_urls_count} 个URL已处理完毕。\n")
-            f.write(f"详细结果请查看各批次目录中的文件。\n")
-        else:
-            f.write(f"\n---\n\n## ⏱️ 任务进行中...\n\n")
-            f.write(f"此报告将随每个批次的完成而更新，反映当前的累计结果。\n")
-            f.write(f"您可以查看 `00_OVERALL_SUMMARY.md` 获取更实时的进度。\n")
+    if isinstance(batch_items, list):
+        for item in batch_items:
+            start_item(item)
+    else:
+        async for item in batch_items:
+            start_item(item)
+    await asyncio.gather(*tasks)
+    return results
 
 
-async def crawl_multiple_webpages_to_markdown(url_list, batch_size=50):
+async def crawl_multiple_webpages_to_markdown(url_list, batch_size=50, blocking_profile=None, recycle_after=500,
+                                             concurrency=1, host_concurrency=None, min_request_interval=1.0,
+                                             http_first=True, strategy_file="fetch_strategy.json",
+                                             cache_dir="response_cache", cache_max_bytes=DEFAULT_MAX_BYTES, output_dir=None,
+                                             cpu_workers=None, max_pending_conversions=None, storage="files",
+                                             search_index_path=None, catalog_name=None, recrawl=False):
     """
     批量爬取多个网页的mainContent元素并返回markdown格式内容
     每处理指定数量的URL后进行一次文件保存操作，并支持以批次为单位的断点续传。
     
     Args:
-        url_list: 包含字典的列表，每个字典应包含 'url', 'source', 'name' 等字段
+        url_list: 包含字典的列表，每个字典应包含 'final_url', 'source', 'name' 等字段；
+                  也可以是目录文件名（旧版JSON或JSONL），此时逐批流式读取，不把整个目录载入内存；
+                  或者是 asyncio.Queue（流水线模式，见 pipeline.py），每收到一条就开始抓取，收到 None 时结束
         batch_size: 批次大小，默认50个URL一批
+        blocking_profile: 请求拦截配置（见 resource_blocking.py），为 None 时不拦截
+        recycle_after: 同一个浏览器最多处理多少个URL后关闭重启（防止内存增长），
+                       设为 1 等同于每个URL单独启动浏览器的旧行为；并发模式下在批次之间重启
+        concurrency: 全局同时进行的请求数，默认1（逐个处理）
+        host_concurrency: 同一主机同时进行的请求数，默认与 concurrency 相同
+        min_request_interval: 同一主机相邻两个请求开始时间的最小间隔（秒）
+        http_first: 是否先用HTTP直接获取页面，mainContent缺失或为空时再用浏览器
+        strategy_file: 按URL模式记录HTTP是否可用的文件，跨运行保留
+        cache_dir: 响应缓存目录，为 None 时不使用缓存
+        cache_max_bytes: 响应缓存的最大总大小（字节），超出后按LRU淘汰
+        output_dir: 指定结果输出目录，重新爬取时沿用同一目录可跳过未变化页面的文件写入；
+                    为 None 时自动创建 crawl_results_break_<时间戳> 目录
+        cpu_workers: mainContent 提取和markdown转换的进程数，默认CPU核数，0 表示在事件循环所在进程内转换
+        max_pending_conversions: 最多等待转换的页面数，默认 2 * cpu_workers；
+                                 达到上限时抓取任务暂停，不再发起新的请求（背压）
+        storage: 结果存储方式。"files" 写单页文件、批次汇总和最终汇总；
+                 "sqlite" 每个页面只写入一次 crawl_store.sqlite，markdown视图由 crawl_store.py 按需生成
+        search_index_path: 全文索引文件（见 search_index.py），每个批次保存后写入；
+                           为 None 时使用输出目录中的 search_index.sqlite，多次爬取可以共用同一个索引
+        catalog_name: 写入索引的目录名称，用于按目录过滤；为 None 时使用目录文件名（或输出目录名）
+        recrawl: 为 True 时忽略未完成的进度，所有URL重新抓取；output_dir 的上次爬取已完成时总是重新抓取。
+                 重新爬取时输出目录中的正文哈希索引保留，未变化的页面不重复写入
     
     Returns:
-        list: 包含爬取结果的列表
+        dict: 爬取统计（见 crawl_summary）。各URL的结果不在内存中累积：
+              结果元数据用 CrawlState(state_filename(output_dir)).saved_results() 读取，
+              正文见结果文件、crawl_store.py 或全文索引
     """
-    if not url_list:
-        print("❌ URL列表为空")
-        return []
+    # 流水线模式下URL总数在发现阶段结束前未知
+    streaming = isinstance(url_list, asyncio.Queue)
     
-    print(f"🚀 开始批量爬取 {len(url_list)} 个网页的mainContent元素...")
-    print(f"📦 批次大小: {batch_size} 个URL/批次")
+    def open_records():
+        if isinstance(url_list, str):
+            return iter_catalog(url_list)
+        return iter(url_list)
     
-    all_results = [] # Accumulates results (can include dummy entries for resumed items)
-    total_successful = 0
-    total_failed = 0
+    # 爬取前按 final_url 合并重复条目；这里只统计数量，不保留记录
+    dedup_stats = new_dedup_stats()
+    if streaming:
+        total_urls_to_process = None
+        total_batches = None
+        print(f"🚀 开始流水线爬取：发现阶段每解析出一个最终URL即开始抓取...")
+    else:
+        try:
+            total_urls_to_process = sum(1 for _ in iter_dedup_urls(open_records(), dedup_stats))
+        except (OSError, ValueError) as e:
+            print(f"❌ 读取目录失败: {url_list} - {str(e)}")
+            return crawl_summary()
+        if not total_urls_to_process:
+            print("❌ URL列表为空")
+            return crawl_summary()
+        if dedup_stats['duplicate_urls']:
+            print(f"🧹 合并重复URL {dedup_stats['duplicate_urls']} 个")
+        total_batches = (total_urls_to_process + batch_size - 1) // batch_size
+        print(f"🚀 开始批量爬取 {total_urls_to_process} 个网页的mainContent元素...")
+    print(f"📦 批次大小: {batch_size} 个URL/批次")
     
-    start_index_for_crawl = 0 # This will be the starting point for the current crawl session
-    output_dir = ""
+    blocking_stats = new_blocking_stats()
     start_time = ""
-
-    total_urls_to_process = len(url_list) # Total URLs from the input list
-    total_batches = (total_urls_to_process + batch_size - 1) // batch_size
     
 
     # 尝试加载进度日志
-    progress_data, existing_output_dir = load_progress_log()
+    if recrawl:
+        progress_data, existing_output_dir = None, None
+    else:
+        progress_data, existing_output_dir = load_progress_log(output_dir=output_dir)
 
     if progress_data and existing_output_dir:
-        start_index_for_crawl = progress_data.get("processed_count", 0)
         output_dir = existing_output_dir
         start_time = progress_data.get("start_time", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-        total_successful = progress_data.get("successful_count", 0)
-        total_failed = progress_data.get("failed_count", 0)
-
-        # Populate all_results with dummy entries for already processed URLs
-        # This is crucial for accurate 'processed_count' in summary reports
-        for i in range(start_index_for_crawl):
-            # Create a placeholder for already processed URLs.
-            # We don't need their actual content here, just a 'success' status
-            # to keep counts accurate for the summary reports.
-            # We assume URLs up to start_index_for_crawl were counted in successful/failed_count
-            # from the loaded progress_data.
-            # Add basic info to ensure name/url are available for reports, even if dummy
-            dummy_item = url_list[i] if i < len(url_list) else {}
-            all_results.append({
-                'success': True, # Assume success for already processed for general counts
-                'batch_num': (i // batch_size) + 1,
-                'name': dummy_item.get('name', f"Dummy URL {i+1}"),
-                'url': dummy_item.get('final_url', f"dummy_url_{i+1}"),
-                'source': dummy_item.get('source', 'Previous Run'),
-                'error': None, # No error for dummy success
-                'title': 'Previously Processed'
-            })
-
-
-        print(f"✅ 从断点续传，将从第 {start_index_for_crawl + 1} 个URL开始处理。")
-        print(f"   已成功: {total_successful}, 已失败: {total_failed}")
+        dedup_stats['duplicate_contents'] = (progress_data.get("dedup") or {}).get("duplicate_contents", 0)
+        print(f"✅ 从断点续传，输出目录: {output_dir}")
     else:
         # 创建新的输出目录
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_dir = f"crawl_results_break_{timestamp}"
+        output_dir = output_dir or f"crawl_results_break_{timestamp}"
         start_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         os.makedirs(output_dir, exist_ok=True)
         # 初始化进度日志，记录开始时间
         save_progress_log(output_dir, 0, total_urls_to_process, 0, 0, start_time=start_time, output_dir_name=output_dir)
         print(f"🆕 未找到有效进度，将开始新的爬取并创建目录: {output_dir}")
     
+    # URL级别的状态：已保存的批次直接跳过，批次内已完成的URL复用上次的结果
+    legacy_output_dir = bool(progress_data and existing_output_dir) and not os.path.exists(state_filename(output_dir))
+    state = CrawlState(state_filename(output_dir))
+    if not (progress_data and existing_output_dir):
+        # 新的爬取（包括沿用已完成的输出目录重新爬取）：上次的URL状态作废，所有URL重新抓取
+        state.reset()
+    if not streaming:
+        # 同一序号的URL与上次不一致（目录在中断后插入或删除了条目）时重置该序号，之后从该序号所在批次开始处理
+        registered_before = state.registered_count()
+        changed = state.register(iter_dedup_urls(open_records()))
+        changed -= state.registered_count() - registered_before
+        state.truncate(total_urls_to_process)
+        if changed:
+            print(f"⚠️ 目录自上次运行以来有变化：{changed} 个位置上的URL不同，这些位置将重新抓取")
+    if legacy_output_dir:
+        # 旧版本只记录了 processed_count，之前的URL按已保存处理
+        state.mark_legacy_saved(progress_data.get("processed_count", 0))
+    recovered = state.recover()
+    if recovered:
+        print(f"🔁 {recovered} 个URL在上次中断时正在处理，将重新抓取")
     
-    # 调整起始批次号
+    first_unsaved = state.first_unsaved_index()
+    start_index_for_crawl = first_unsaved - 1 if first_unsaved else state.registered_count()
+    # 已保存URL的成功/失败数量按实际状态统计；
+    # 不完整的最后一个批次（流水线提前结束时）从批次开头重新处理，不重复计数
     current_batch_start_index = start_index_for_crawl // batch_size
+    resume_index = current_batch_start_index * batch_size
+    total_successful, total_failed = state.saved_counts(resume_index)
+    processed_count = total_successful + total_failed
+    if resume_index:
+        print(f"✅ 已保存 {resume_index} 个URL，将从第 {resume_index + 1} 个URL开始处理。")
+        print(f"   已成功: {total_successful}, 已失败: {total_failed}")
     
-    for batch_num_idx in range(current_batch_start_index, total_batches):
-        start_index = batch_num_idx * batch_size # Start index of the current *full* batch in url_list
-        end_index = min(start_index + batch_size, total_urls_to_process)
-        current_batch_urls = url_list[start_index:end_index] # URLs for the *entire* current batch
-        
-        print(f"\n{'='*80}")
-        print(f"🔄 处理批次 {batch_num_idx + 1}/{total_batches}")
-        print(f"📋 URL范围: {start_index + 1} - {end_index}")
-        print(f"📊 当前批次大小: {len(current_batch_urls)}") 
-        print(f"{'='*80}")
-        
-        batch_results_current_run = [] # Collect results only for this batch in the current run
-        
-        # Process every URL in the current batch (even if partially done before)
-        for i, item in enumerate(current_batch_urls):
-            global_index = start_index + i + 1 # Correct global index for display and tracking within this batch
-
-            print(f"\n{'.'*60}")
-            print(f"处理第 {global_index}/{total_urls_to_process} 个URL (批次内第 {i+1}/{len(current_batch_urls)} 个)")
-            print(f"来源: {item.get('source', 'Unknown')}")
-            print(f"名称: {item.get('name', 'Unknown')}")
-            print(f"URL: {item.get('final_url', '')}")
-            print(f"{'.'*60}")
-            
-            if not item.get('final_url'):
-                print("❌ URL为空，跳过此项")
-                result = {
-                    'success': False,
-                    'source': item.get('source', 'Unknown'),
-                    'name': item.get('name', 'Unknown'),
-                    'url': '',
-                    'error': 'URL为空',
-                    'batch_num': batch_num_idx + 1 
-                }
-                batch_results_current_run.append(result)
-                total_failed += 1
-                continue
-            
-            # 爬取单个网页
-            result = await crawl_single_webpage_to_markdown(
-                item['final_url'],
-                f"{item.get('source', 'Unknown')} - {item.get('name', 'Unknown')}"
-            )
-            
-            # 添加额外信息
-            result['name'] = item.get('name', 'Unknown')
-            result['batch_num'] = batch_num_idx + 1 
-            batch_results_current_run.append(result)
-            
+    
+    # 正文哈希索引，断点续传时沿用输出目录中的记录；sqlite 存储自行按哈希去重
+    store = CrawlStore(store_filename(output_dir)) if storage == "sqlite" else None
+    content_index = load_content_index(output_dir) if store is None else None
+    
+    # 全文索引，每个批次保存后增量写入
+    search_index = SearchIndex(search_index_path or search_index_filename(output_dir))
+    if catalog_name is None:
+        catalog_name = os.path.basename(url_list) if isinstance(url_list, str) else os.path.basename(output_dir)
+    
+    # 整个运行共享一个浏览器，每 recycle_after 个URL重启一次
+    crawler = None
+    crawler_page_count = 0
+    crawled_pages = 0
+    crawl_start = time.perf_counter()
+    global_semaphore = asyncio.Semaphore(concurrency)
+    limiters = HostLimiterPool(max_concurrency=host_concurrency or concurrency, min_interval=min_request_interval)
+    http_client = create_http_client(max_connections=concurrency) if http_first else None
+    strategy_memory = load_strategy_memory(strategy_file)
+    fetch_stats = new_fetch_stats()
+    cache = ResponseCache(cache_dir, max_bytes=cache_max_bytes) if cache_dir else None
+    converter = ConversionPool(workers=cpu_workers, max_pending=max_pending_conversions)
+    print(f"🚦 并发数: {concurrency}, 单主机并发数: {host_concurrency or concurrency}, 请求间隔: {min_request_interval} 秒")
+    
+    # 等待保存的批次 {批次号: 批次信息}，按批次号顺序保存；有URL在等待重试的批次暂不保存
+    open_batches = {}
+    retry_queue = RetryQueue()
+    
+    def flush_batch(batch):
+        nonlocal total_successful, total_failed, processed_count
+        batch_num = batch['batch_num']
+        start_index = batch['start_index']
+        batch_results = batch['results']
+        for result in batch_results:
             if result['success']:
                 total_successful += 1
             else:
                 total_failed += 1
-            
-            # 添加延迟以避免过于频繁的请求
-            await asyncio.sleep(1)
         
-        # After processing all URLs in the current batch:
         # Save current batch's results (always use start_index for batch file naming)
-        batch_successful_count = save_batch_results(batch_results_current_run, output_dir, batch_num_idx + 1, start_index)
+        if store is not None:
+            batch_successful_count = store.save_batch(batch_results, batch_num, start_index)
+        else:
+            batch_successful_count = save_batch_results(batch_results, output_dir, batch_num, start_index, content_index)
+            save_content_index(output_dir, content_index)
+            append_batch_index(output_dir, batch_num, start_index, batch_size, batch_results)
+        search_index.add_documents(batch_results, catalog_name, output_dir)
+        save_fields(fields_frame(batch_results, start_index), fields_filename(output_dir))
+        state.mark_saved(start_index + 1, start_index + len(batch_results))
+        dedup_stats['duplicate_contents'] += sum(1 for result in batch_results if result.get('duplicate_of'))
+        
+        # 批次结果已写入结果文件（或 crawl_store）、全文索引和状态库，这里只累计数量，不保留结果
+        processed_count += len(batch_results)
         
-        # Extend all_results with the current batch's results
-        all_results.extend(batch_results_current_run) 
-
         # Update progress log - END OF BATCH update
-        processed_count_after_batch = len(all_results)
-        is_final_batch = (batch_num_idx == total_batches - 1)
+        processed_count_after_batch = processed_count
+        is_final_batch = (batch_num == total_batches)
         current_end_time_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        save_progress_log(output_dir, processed_count_after_batch, total_urls_to_process, total_successful, total_failed, end_time=current_end_time_str if is_final_batch else None, output_dir_name=output_dir)
+        pages_per_second = crawled_pages / (time.perf_counter() - crawl_start)
+        save_progress_log(output_dir, processed_count_after_batch, total_urls_to_process, total_successful, total_failed, end_time=current_end_time_str if is_final_batch else None, output_dir_name=output_dir, pages_per_second=round(pages_per_second, 3), dedup_stats=dedup_stats)
         
-        # Update overall summary (real-time progress report)
-        update_overall_summary(output_dir, all_results, total_successful, total_failed, batch_num_idx + 1, total_batches, batch_size, start_time, total_urls_to_process)
-
-        # Update final summary report (cumulative report) after each batch
-        generate_final_summary_report(output_dir, all_results, total_successful, total_failed, url_list, batch_size, start_time, current_end_time_str, total_urls_to_process)
+        if cache is not None:
+            cache.save()
+        
+        # Update overall summary (real-time progress report, constant size)
+        update_overall_summary(output_dir, processed_count_after_batch, total_successful, total_failed, batch_num, total_batches, batch_size, start_time, total_urls_to_process,
+                               last_batch_results=batch_results, dedup_stats=dedup_stats, storage=storage)
         
-        print(f"\n📊 批次 {batch_num_idx + 1} 完成统计:")
+        print(f"\n📊 批次 {batch_num} 完成统计:")
         print(f"✅ 批次成功: {batch_successful_count}")
-        print(f"❌ 批次失败: {len(batch_results_current_run) - batch_successful_count}")
-        print(f"📈 总体进度: {processed_count_after_batch}/{total_urls_to_process} ({(processed_count_after_batch/total_urls_to_process*100):.1f}%)")
+        print(f"❌ 批次失败: {len(batch_results) - batch_successful_count}")
+        if total_urls_to_process:
+            print(f"📈 总体进度: {processed_count_after_batch}/{total_urls_to_process} ({(processed_count_after_batch/total_urls_to_process*100):.1f}%)")
+        else:
+            print(f"📈 已处理: {processed_count_after_batch} (发现阶段进行中)")
         print(f"📊 累计成功: {total_successful}")
         print(f"📊 累计失败: {total_failed}")
+        print(f"⚡ 爬取速度: {pages_per_second:.2f} 页/秒")
+    
+    def flush_ready_batches():
+        for batch_num in list(open_batches):
+            if retry_queue.has_batch(batch_num):
+                print(f"⏳ 批次 {batch_num} 还有URL等待重试，暂不保存")
+                break
+            flush_batch(open_batches.pop(batch_num))
+    
+    async def retry_entry(entry):
+        nonlocal crawled_pages, crawler_page_count
+        batch = open_batches[entry['batch_num']]
+        global_index = entry['url_index']
+        attempt = entry['attempt'] + 1
+        result = await crawl_url_item(
+            entry['item'], global_index, total_urls_to_process or '?', crawler, global_semaphore, limiters,
+            position=f" (第 {attempt} 次尝试，上次失败类型: {entry['failure_class']})", state=state, **fetch_options
+        )
+        crawled_pages += 1
+        crawler_page_count += 1 if result.get('fetch_method') == 'browser' else 0
+        batch['results'][global_index - batch['start_index'] - 1] = result
+        if not finish_item(result, global_index, entry['item'], entry['batch_num'], attempt, state, retry_queue) and result['success']:
+            retry_queue.stats['recovered'] += 1
+    
+    fetch_options = dict(http_client=http_client, strategy_memory=strategy_memory, fetch_stats=fetch_stats, cache=cache, converter=converter)
+    
+    # 从第一个未保存的批次开始逐批读取，之前的记录只经过去重，不保留
+    skip_count = resume_index
+    
+    async def iter_pending_urls():
+        if not streaming:
+            for item in itertools.islice(iter_dedup_urls(open_records()), skip_count, None):
+                yield item
+            return
+        seen_urls = set()
+        received = 0
+        while True:
+            item = await url_list.get()
+            if item is None:
+                return
+            if not is_new_url(item, seen_urls, dedup_stats):
+                continue
+            received += 1
+            # 流水线模式下URL到达时才登记状态；已保存部分也要登记，位置上的URL变化时该位置下次运行重新抓取
+            changed = state.register([item], start_index=received - 1)
+            if received > skip_count:
+                yield item
+            elif changed:
+                print(f"⚠️ 第 {received} 个URL与上次运行时不同，该位置的已保存结果作废，下次运行时重新抓取")
+    
+    pending_urls = iter_pending_urls()
+    
+    async def take_batch_items(count):
+        for _ in range(count):
+            try:
+                item = await pending_urls.__anext__()
+            except StopAsyncIteration:
+                return
+            yield item
+    
+    try:
+        batch_num_idx = current_batch_start_index
+        while total_batches is None or batch_num_idx < total_batches:
+            start_index = batch_num_idx * batch_size # Start index of the current *full* batch in url_list
+            if streaming:
+                # 批次内的URL边到达边抓取
+                end_index = start_index + batch_size
+                current_batch_urls = take_batch_items(batch_size)
+            else:
+                end_index = min(start_index + batch_size, total_urls_to_process)
+                current_batch_urls = [item async for item in take_batch_items(end_index - start_index)] # URLs for the *entire* current batch
+        
+            print(f"\n{'='*80}")
+            print(f"🔄 处理批次 {batch_num_idx + 1}/{total_batches or '?'}")
+            print(f"📋 URL范围: {start_index + 1} - {end_index}")
+            if not streaming:
+                print(f"📊 当前批次大小: {len(current_batch_urls)}") 
+            print(f"{'='*80}")
         
-        # Pause between batches
-        if batch_num_idx < total_batches - 1:
-            print("⏸️  批次间暂停 3 秒...")
-            await asyncio.sleep(3)
+            # 浏览器重启只在批次之间进行，避免关闭仍有请求在使用的浏览器
+            if crawler is not None and crawler_page_count >= recycle_after:
+                print(f"♻️ 浏览器已处理 {crawler_page_count} 个URL，重启浏览器")
+                await crawler.close()
+                crawler = None
+            if crawler is None:
+                crawler = await open_crawler(blocking_profile, blocking_stats)
+                crawler_page_count = 0
+        
+            # 上次运行中本批次已完成的URL不再抓取
+            finished = state.finished_results(start_index + 1, end_index)
+            if finished:
+                print(f"⏭️ 本批次已有 {len(finished)} 个URL在上次运行中完成，不再重新抓取")
+        
+            # 并发处理当前批次，结果按批次内原始顺序返回；同时执行已到退避时间的重试
+            # 批次在开始抓取前登记，本批次的失败在批次完成前就到期重试时，结果写入同一列表
+            batch_done = asyncio.Event()
+            batch = {'batch_num': batch_num_idx + 1, 'start_index': start_index, 'results': []}
+            open_batches[batch['batch_num']] = batch
+            
+            async def crawl_current_batch():
+                try:
+                    return await crawl_batch_concurrently(
+                        current_batch_urls, start_index, total_urls_to_process or '?', batch['batch_num'],
+                        crawler, global_semaphore, limiters, state=state, finished=finished, retry_queue=retry_queue,
+                        results=batch['results'], **fetch_options
+                    )
+                finally:
+                    batch_done.set()
+            
+            batch_results_current_run, _ = await asyncio.gather(
+                crawl_current_batch(), serve_retries(retry_queue, retry_entry, batch_done)
+            )
+            if not batch_results_current_run:
+                # 流水线的URL恰好在批次边界结束
+                open_batches.pop(batch['batch_num'])
+                break
+            fetched_results = [result for result in batch_results_current_run if not result.get('resumed')]
+            crawled_pages += sum(1 for result in fetched_results if result.get('url'))
+            crawler_page_count += sum(1 for result in fetched_results if result.get('fetch_method') == 'browser')
+        
+            batch_num_idx += 1
+            if streaming and len(batch_results_current_run) < batch_size:
+                # 发现阶段已结束，总数确定
+                total_urls_to_process = start_index + len(batch_results_current_run)
+                total_batches = batch_num_idx
+            flush_ready_batches()
+        
+            # Pause between batches（流水线模式下由发现阶段控制节奏，不暂停）
+            if not streaming and batch_num_idx < total_batches:
+                print("⏸️  批次间暂停 3 秒...")
+                await asyncio.sleep(3)
+        
+        if total_urls_to_process is None:
+            total_urls_to_process = state.registered_count()
+            total_batches = batch_num_idx
+        
+        # 没有新的URL了，等待剩余的重试完成后保存最后的批次
+        if open_batches:
+            print(f"\n⏳ 等待 {len(retry_queue)} 个URL的重试完成...")
+            await serve_retries(retry_queue, retry_entry)
+            flush_ready_batches()
+    finally:
+        if crawler is not None:
+            await crawler.close()
+        if http_client is not None:
+            await http_client.aclose()
+        if http_first:
+            save_strategy_memory(strategy_memory, strategy_file)
+        if cache is not None:
+            cache.save()
+        converter.shutdown()
+        state_counts = state.counts()
+        state.close()
+        search_index.close()
+    
+    storage_stats = None
+    if store is not None:
+        storage_stats = store.stats()
+        store.close()
+    
+    crawl_seconds = time.perf_counter() - crawl_start
+    pages_per_second = crawled_pages / crawl_seconds if crawl_seconds > 0 else 0
     
     # Final updates after all batches are done
     final_end_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    save_progress_log(output_dir, total_urls_to_process, total_urls_to_process, total_successful, total_failed, end_time=final_end_time, output_dir_name=output_dir)
-    update_overall_summary(output_dir, all_results, total_successful, total_failed, total_batches, total_batches, batch_size, start_time, total_urls_to_process)
-    generate_final_summary_report(output_dir, all_results, total_successful, total_failed, url_list, batch_size, start_time, final_end_time, total_urls_to_process)
+    save_progress_log(output_dir, total_urls_to_process, total_urls_to_process, total_successful, total_failed, end_time=final_end_time, output_dir_name=output_dir, pages_per_second=round(pages_per_second, 3), dedup_stats=dedup_stats)
+    update_overall_summary(output_dir, total_urls_to_process, total_successful, total_failed, total_batches, total_batches, batch_size, start_time, total_urls_to_process,
+                           dedup_stats=dedup_stats, end_time=final_end_time, storage=storage)
+    # 完整报告只在任务完成时由索引渲染一次；sqlite 存储不生成，需要时再导出
+    if store is None:
+        render_final_summary(output_dir, total_urls_to_process, start_time, final_end_time)
 
     print(f"\n🎉 批量爬取全部完成！")
     print(f"📊 最终统计:")
     print(f"   总数量: {total_urls_to_process}")
     print(f"   ✅ 成功: {total_successful}")
     print(f"   ❌ 失败: {total_failed}")
-    print(f"   📈 成功率: {(total_successful/total_urls_to_process*100):.2f}%")
+    print(f"   📈 成功率: {(total_successful/total_urls_to_process*100) if total_urls_to_process else 0:.2f}%")
     print(f"   🗂️  批次数: {total_batches}")
+    print(f"   🧹 重复URL: {dedup_stats['duplicate_urls']}，重复正文: {dedup_stats['duplicate_contents']}")
+    print(f"   ⚡ 本次运行: {crawled_pages} 页, {crawl_seconds:.1f} 秒, {pages_per_second:.2f} 页/秒 (每 {recycle_after} 页重启浏览器)")
+    if http_first:
+        print_fetch_stats(fetch_stats)
+    if cache is not None:
+        print_cache_stats(cache.stats)
+    print_conversion_stats(converter)
+    print_retry_stats(retry_queue.stats)
+    if blocking_profile:
+        print_blocking_stats(blocking_stats)
+    print_state_counts(state_counts)
+    if storage_stats is not None:
+        print_storage_stats(storage_stats)
     print(f"📁 结果保存在目录: {output_dir}")
     print(f"📄 总体汇总文件: {os.path.join(output_dir, '00_OVERALL_SUMMARY.md')}")
-    print(f"📄 最终详细报告: {os.path.join(output_dir, '00_FINAL_SUMMARY.md')}")
+    if store is None:
+        print(f"📄 最终详细报告: {os.path.join(output_dir, '00_FINAL_SUMMARY.md')}")
+    else:
+        print(f"📄 导出markdown视图: python crawl_store.py export {output_dir} <导出目录>")
+    print(f"🔎 全文检索: python search_index.py query {search_index_path or output_dir} <关键词>")
+    print(f"📋 结构化字段: python field_extraction.py stats {output_dir}")
     
-    return all_results
+    return crawl_summary(output_dir, total_urls_to_process, total_successful, total_failed)
 
 # 同步版本函数（如果需要在同步环境中使用）
-def crawl_multiple_webpages_sync(url_list, batch_size=50):
+def crawl_multiple_webpages_sync(url_list, batch_size=50, recycle_after=500, concurrency=1, host_concurrency=None, min_request_interval=1.0):
     """
     同步版本的批量爬取函数
     """
-    return asyncio.run(crawl_multiple_webpages_to_markdown(url_list, batch_size))
+    return asyncio.run(crawl_multiple_webpages_to_markdown(
+        url_list, batch_size, recycle_after=recycle_after, concurrency=concurrency,
+        host_concurrency=host_concurrency, min_request_interval=min_request_interval
+    ))
 
 # 主函数
 async def main():
     """
     主函数，执行批量爬取任务
     """
-    # 从JSON文件获取URLs
+    # 目录文件按批次流式读取
     json_file_path = 'jyjg_final_urls.json'
-    jyxx_urls = get_urls(json_file_path)
 
     example_urls = [
             {
@@ -728,16 +1182,21 @@ async def main():
         ]
     
     # 执行批量爬取，可以自定义批次大小
-    # results = await crawl_multiple_webpages_to_markdown(example_urls, batch_size=50)
-    results = await crawl_multiple_webpages_to_markdown(jyxx_urls, batch_size=50)
+    # recycle_after=1 可复现每个URL单独启动浏览器的旧行为，用于对比页/秒
+    # summary = await crawl_multiple_webpages_to_markdown(example_urls, batch_size=50)
+    summary = await crawl_multiple_webpages_to_markdown(
+        json_file_path, batch_size=50, blocking_profile=CONTENT_PROFILE,
+        concurrency=8, host_concurrency=4, min_request_interval=0.25, storage="sqlite",
+        search_index_path=SEARCH_INDEX_FILENAME
+    )
     
-    return results
+    return summary
 
 # 使用示例
 if __name__ == "__main__":
     # 异步运行
-    results = asyncio.run(main())
+    summary = asyncio.run(main())
     
     # 或者直接调用批量爬取函数
     # your_url_list = [...]  # 你的URL列表
-    # results = crawl_multiple_webpages_sync(your_url_list, batch_size=50)
+    # summary = crawl_multiple_webpages_sync(your_url_list, batch_size=50)
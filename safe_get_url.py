@@ -1,111 +1,502 @@
 # 通过模拟点击获取所有新标签页的最终重定向URL，支持翻页操作，并保存到JSON文件
 # 优化版本：支持分批保存、断点续传、容错处理
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 import json
 import os
+import re
 import time
+from collections import Counter
 from datetime import datetime
+from urllib.parse import parse_qsl, urljoin, urlsplit
 
-def get_final_redirect_url(page, initial_url, wait_time=5):
+from resource_blocking import DISCOVERY_PROFILE, install_blocking, new_blocking_stats, print_blocking_stats
+from url_catalog import (
+    get_catalog_writer,
+    is_jsonl_catalog,
+    iter_records_from,
+    load_catalog_meta,
+    open_catalog_writer,
+    read_tail_records,
+)
+
+# 站点根地址，最终URL形如 /jyxx/004005/004005001/20250531/<infoid>.html
+SITE_BASE_URL = "https://www.cqggzy.com"
+
+# 最终公告页URL格式，重定向跟踪时匹配到即可提前返回
+FINAL_URL_PATTERN = re.compile(r"^https?://www\.cqggzy\.com/(jyxx|jyjg)/(\d{6,}/)+\d{8}/[^/?#]+\.html$")
+
+# 重定向跟踪时URL保持不变多久（秒）即认为已到达最终页面
+DEFAULT_QUIET_PERIOD = 1.0
+
+# 无法从目录推断时使用的每页条数（站点列表默认每页20条）
+DEFAULT_PAGE_SIZE = 20
+
+# 分页器中的页码输入框和跳转按钮，按顺序尝试（常见分页组件的写法，未在站点上逐一确认；
+# 都不匹配时回退到逐页点击，并由 warn_click_fallback 提示）
+PAGER_INPUT_SELECTORS = [
+    ".m-pagination-jump input",
+    ".pagination input[type='text']",
+    ".page-jump input",
+    "input.page-input",
+    "input.pagination-input",
+]
+PAGER_GO_SELECTORS = [
+    ".m-pagination-jump .m-pagination-btn",
+    ".m-pagination-jump a",
+    ".pagination .go",
+    ".page-jump a",
+    "a.go",
+    "button.go",
+]
+
+# 逐页点击下一页时每页大约需要的时间（秒）：等待 networkidle 加上 click_next_page 的稳定时间
+CLICK_SKIP_SECONDS_PER_PAGE = 2
+
+# 列表页 onclick="opendetailjyxx('<infoid>','<categorynum>')" 的参数提取
+OPENDETAIL_PATTERN = re.compile(r"opendetailjyxx\(\s*['\"]([^'\"]+)['\"]\s*,\s*['\"]([^'\"]+)['\"]\s*\)")
+
+# 一次性从列表DOM中批量读取每个 .info-item 的标题、onclick 和发布日期
+LIST_ITEMS_JS = """els => els.map(el => {
+    const a = el.querySelector('a');
+    const d = el.querySelector('.info-date');
+    return {
+        title: a ? (a.getAttribute('title') || a.innerText.trim()) : null,
+        onclick: a ? a.getAttribute('onclick') : null,
+        date: d ? d.innerText.trim() : null
+    };
+})"""
+
+
+def parse_opendetail_args(onclick):
+    """
+    从 onclick 属性中解析 opendetailjyxx 的参数
+
+    Args:
+        onclick: onclick属性字符串
+
+    Returns:
+        tuple: (infoid, categorynum)，无法解析时返回 None
+    """
+    if not onclick:
+        return None
+    match = OPENDETAIL_PATTERN.search(onclick)
+    if not match:
+        return None
+    return match.group(1).strip(), match.group(2).strip()
+
+
+def get_list_section(target_url):
+    """
+    从列表页URL中获取栏目名 (jyxx / jyjg)
+    """
+    path_parts = [part for part in urlsplit(target_url).path.split('/') if part]
+    return path_parts[0] if path_parts else ""
+
+
+def build_final_url(section, infoid, categorynum, info_date):
+    """
+    根据列表页参数直接构造最终URL
+
+    最终URL的目录是 categorynum 从6位开始每3位一级的前缀，例如:
+    004002009001 -> /jyxx/004002/004002009/004002009001/20250531/<infoid>.html
+
+    Args:
+        section: 栏目名 (jyxx / jyjg)
+        infoid: 公告ID
+        categorynum: 分类编号
+        info_date: 列表中的发布日期 (2025-05-31)
+
+    Returns:
+        str: 最终URL，参数不合法时返回 None
+    """
+    if not section or not infoid or not categorynum or not info_date:
+        return None
+    if '/' in infoid or not categorynum.isdigit():
+        return None
+    if len(categorynum) < 6 or len(categorynum) % 3 != 0:
+        return None
+
+    date_part = info_date.strip().replace('-', '')
+    if len(date_part) != 8 or not date_part.isdigit():
+        return None
+
+    category_path = '/'.join(categorynum[:n] for n in range(6, len(categorynum) + 1, 3))
+    return f"{SITE_BASE_URL}/{section}/{category_path}/{date_part}/{infoid}.html"
+
+
+def resolve_list_item_direct(item, section):
+    """
+    不打开浏览器页面，直接用列表项的 onclick 参数和日期解析最终URL
+
+    Args:
+        item: LIST_ITEMS_JS 返回的单条数据 {title, onclick, date}
+        section: 栏目名
+
+    Returns:
+        str: 最终URL，无法解析时返回 None
+    """
+    args = parse_opendetail_args(item.get('onclick'))
+    if not args:
+        return None
+    infoid, categorynum = args
+    return build_final_url(section, infoid, categorynum, item.get('date'))
+
+
+def infoid_from_url(url):
+    """
+    从最终URL (/<infoid>.html) 或跳转URL (jumpnew.html?infoid=...) 中提取 infoid
+    """
+    if not url or not url.startswith('http'):
+        return None
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    if query.get('infoid'):
+        return query['infoid']
+    last_segment = parts.path.rsplit('/', 1)[-1]
+    if last_segment.endswith('.html') and last_segment != 'jumpnew.html':
+        return last_segment[:-len('.html')]
+    return None
+
+
+def list_item_infoid(item):
+    """
+    获取列表项 (LIST_ITEMS_JS 返回的数据) 的 infoid
+    """
+    args = parse_opendetail_args(item.get('onclick'))
+    return args[0] if args else None
+
+
+def checkpoint_page_rows(existing_urls, page_number):
+    """
+    从已保存的数据中取出第 page_number 页（从1开始）的记录
+    """
+    prefix = f'第 {page_number} 页第 '
+    return [url_info for url_info in existing_urls if url_info.get('source', '').startswith(prefix)]
+
+
+def match_checkpoint(page_items, checkpoint_rows):
     """
-    获取单个URL的最终重定向URL
+    比较当前页的列表项和断点记录，判断是否到达了正确的页面
+
+    优先按 infoid 比较，没有 infoid 时按标题比较。新公告发布会让列表整体后移，
+    因此断点首行出现在当前页的任意位置都视为到达，返回其偏移量。
+
+    Returns:
+        int: 断点首行在当前页中的位置，未找到时返回 None
+    """
+    if not page_items or not checkpoint_rows:
+        return None
+    first_row = checkpoint_rows[0]
+    first_infoid = infoid_from_url(first_row.get('final_url'))
+    for index, item in enumerate(page_items):
+        if first_infoid and list_item_infoid(item) == first_infoid:
+            return index
+        if not first_infoid and item.get('title') and item.get('title') == first_row.get('name'):
+            return index
+    return None
+
+
+def verify_checkpoint(page_items, checkpoint_rows, page_number):
+    """
+    跳页后用断点记录校验是否到达了第 page_number 页（同步和异步版本共用）
+
+    Returns:
+        bool: 是否通过校验
+    """
+    shift = match_checkpoint(page_items, checkpoint_rows)
+    if shift is None:
+        print(f"⚠️ 第 {page_number} 页的首行与断点记录不一致，跳页校验失败")
+        return False
+    if shift > 0:
+        print(f"ℹ️ 第 {page_number} 页的断点首行后移了 {shift} 行（期间有新公告发布）")
+    print(f"✅ 已直接跳转到第 {page_number} 页并通过断点校验")
+    return True
+
+
+def new_resolve_stats():
+    """
+    创建解析统计字典
+    """
+    return {
+        'direct_hit': 0,        # 直接构造成功
+        'direct_miss': 0,       # 无法直接构造，需要回退
+        'fallback_success': 0,  # 回退到点击+重定向后成功
+        'fallback_failed': 0,   # 回退后仍失败
+    }
+
+
+def format_resolve_stats(stats):
+    """
+    把解析统计转换为可保存到JSON的摘要
+    """
+    attempted = stats['direct_hit'] + stats['direct_miss']
+    return {
+        'direct_hit': stats['direct_hit'],
+        'direct_miss': stats['direct_miss'],
+        'fallback_success': stats['fallback_success'],
+        'fallback_failed': stats['fallback_failed'],
+        'direct_hit_rate': f"{(stats['direct_hit']/attempted*100):.1f}%" if attempted > 0 else "0%",
+    }
+
+
+def resolve_summary(stats, resolve_mode):
+    """
+    仅在直接解析模式下返回要写入JSON的统计信息
+    """
+    if resolve_mode != "direct":
+        return None
+    return {"resolve": format_resolve_stats(stats)}
+
+
+def new_drift_report():
+    """
+    创建翻页漂移报告
+    """
+    return {
+        'pages': [],              # [{'page': 页码, 'shift': 漂移行数}]
+        'total_shift': 0,         # 漂移行数合计（即翻页期间新发布的公告数的估计）
+        'max_shift': 0,
+        'duplicates_skipped': 0,  # 因重复而跳过的行数
+    }
+
+
+def leading_overlap(page_infoids, seen_infoids):
+    """
+    计算当前页开头有多少行已经获取过
+    """
+    count = 0
+    for infoid in page_infoids:
+        if not infoid or infoid not in seen_infoids:
+            break
+        count += 1
+    return count
+
+
+def record_drift(drift_report, page_number, shift):
+    drift_report['pages'].append({'page': page_number, 'shift': shift})
+    drift_report['total_shift'] += shift
+    drift_report['max_shift'] = max(drift_report['max_shift'], shift)
+
+
+def discovery_statistics(resolve_stats, resolve_mode, drift_report):
+    """
+    汇总要写入JSON statistics 的附加统计
+    """
+    statistics = resolve_summary(resolve_stats, resolve_mode) or {}
+    statistics["drift"] = {
+        'pages_with_drift': len(drift_report['pages']),
+        'total_shift': drift_report['total_shift'],
+        'max_shift': drift_report['max_shift'],
+        'duplicates_skipped': drift_report['duplicates_skipped'],
+    }
+    return statistics
+
+
+def print_drift_report(drift_report):
+    """
+    打印翻页漂移报告
+    """
+    print(f"↪️ 翻页漂移: {len(drift_report['pages'])} 页发生漂移，累计 {drift_report['total_shift']} 行，"
+          f"最大 {drift_report['max_shift']} 行，跳过重复 {drift_report['duplicates_skipped']} 行")
+    for entry in drift_report['pages'][:20]:
+        print(f"   - 第 {entry['page']} 页: 后移 {entry['shift']} 行")
+
+
+def print_resolve_stats(stats):
+    """
+    打印直接解析命中率
+    """
+    summary = format_resolve_stats(stats)
+    print(f"🎯 直接解析命中: {summary['direct_hit']}，未命中: {summary['direct_miss']}，命中率: {summary['direct_hit_rate']}")
+    print(f"🔁 回退点击成功: {summary['fallback_success']}，回退失败: {summary['fallback_failed']}")
+
+class RedirectTracker:
+    """
+    重定向链的记录和结束判断，同步和异步版本共用，只有Playwright调用分开
+
+    通过监听主框架导航 (framenavigated) 和网络响应 (response) 事件实时记录重定向链，
+    当URL在 quiet_period 秒内没有任何导航和响应活动时认为已稳定；
+    一旦URL匹配最终URL格式则立即结束。
+    """
+
+    def __init__(self, page, initial_url, wait_time=5, quiet_period=DEFAULT_QUIET_PERIOD,
+                 final_url_pattern=FINAL_URL_PATTERN, verbose=True):
+        self.page = page
+        self.initial_url = initial_url
+        self.quiet_period = quiet_period
+        self.final_url_pattern = final_url_pattern
+        self.verbose = verbose
+        self.redirect_chain = [initial_url]
+        self.early_exit = False
+        self.started = time.monotonic()
+        self.deadline = self.started + wait_time
+        # 最近一次导航/响应活动的时间
+        self.last_activity = self.started
+
+    def record_url(self, url):
+        if url and url != self.redirect_chain[-1]:
+            if self.verbose:
+                print(f"    检测到重定向: {self.redirect_chain[-1]} -> {url}")
+            self.redirect_chain.append(url)
+
+    def is_main_frame(self, frame):
+        return frame == self.page.main_frame
+
+    def on_frame_navigated(self, frame):
+        if self.is_main_frame(frame):
+            self.last_activity = time.monotonic()
+            self.record_url(frame.url)
+
+    def on_response(self, response):
+        self.last_activity = time.monotonic()
+        try:
+            request = response.request
+            # 记录HTTP 3xx重定向的目标地址
+            if request.is_navigation_request() and self.is_main_frame(request.frame) and 300 <= response.status < 400:
+                location = response.headers.get('location')
+                if location:
+                    self.record_url(urljoin(response.url, location))
+        except Exception:
+            pass
+
+    def attach(self):
+        self.page.on("framenavigated", self.on_frame_navigated)
+        self.page.on("response", self.on_response)
+
+    def detach(self):
+        self.page.remove_listener("framenavigated", self.on_frame_navigated)
+        self.page.remove_listener("response", self.on_response)
+
+    def next_wait(self, current_url):
+        """
+        判断重定向是否结束
+
+        Returns:
+            float: 还需等待下一次主框架导航的秒数；已结束（匹配最终URL、URL已稳定或超时）时返回 None
+        """
+        if self.final_url_pattern and self.final_url_pattern.match(current_url):
+            self.early_exit = True
+            return None
+        now = time.monotonic()
+        quiet_remaining = self.quiet_period - (now - self.last_activity)
+        if quiet_remaining <= 0 or now >= self.deadline:
+            return None
+        return min(quiet_remaining, self.deadline - now)
+
+    def result(self, final_url, page_title):
+        self.record_url(final_url)
+        return {
+            'success': True,
+            'initial_url': self.initial_url,
+            'final_url': final_url,
+            'redirect_chain': self.redirect_chain,
+            'total_redirects': len(self.redirect_chain) - 1,
+            'page_title': page_title,
+            'early_exit': self.early_exit,
+            'elapsed': round(time.monotonic() - self.started, 2)
+        }
+
+    def failure(self, error):
+        return {
+            'success': False,
+            'initial_url': self.initial_url,
+            'final_url': self.initial_url,
+            'error': str(error),
+            'redirect_chain': self.redirect_chain,
+            'total_redirects': 0,
+            'page_title': '获取失败'
+        }
+
+
+def get_final_redirect_url(page, initial_url, wait_time=5, quiet_period=DEFAULT_QUIET_PERIOD,
+                           final_url_pattern=FINAL_URL_PATTERN):
+    """
+    获取单个URL的最终重定向URL（重定向链的记录和结束判断见 RedirectTracker）
     
     Args:
         page: Playwright页面对象
         initial_url: 初始URL
-        wait_time: 等待重定向的时间（秒）
+        wait_time: 等待重定向的最长时间（秒）
+        quiet_period: URL保持稳定多久后认为重定向结束（秒）
+        final_url_pattern: 最终URL的正则，匹配后提前返回；为 None 时只按稳定时间判断
     
     Returns:
         包含重定向信息的字典
     """
-    redirect_chain = [initial_url]
-    current_url = initial_url
-    
+    tracker = RedirectTracker(page, initial_url, wait_time, quiet_period, final_url_pattern)
+    tracker.attach()
     try:
         # 访问初始URL
         page.goto(initial_url, wait_until='domcontentloaded')
-        current_url = page.url
+        tracker.record_url(page.url)
         
-        if current_url != initial_url:
-            redirect_chain.append(current_url)
-        
-        # 等待可能的JavaScript重定向，分段检查
-        for i in range(wait_time * 2):  # 每0.5秒检查一次
-            time.sleep(0.5)
-            new_url = page.url
-            
-            if new_url != current_url:
-                print(f"    检测到重定向: {current_url} -> {new_url}")
-                redirect_chain.append(new_url)
-                current_url = new_url
-        
-        # 最终等待确保页面完全加载
-        try:
-            page.wait_for_load_state('networkidle', timeout=3000)
-        except:
-            pass  # 忽略超时
-        
-        final_url = page.url
-        if final_url != current_url:
-            redirect_chain.append(final_url)
+        while True:
+            wait = tracker.next_wait(page.url)
+            if wait is None:
+                break
+            # 等待下一次主框架导航；超时说明这段时间内没有导航
+            try:
+                page.wait_for_event("framenavigated", predicate=tracker.is_main_frame, timeout=wait * 1000)
+            except PlaywrightTimeoutError:
+                pass
         
         # 获取页面标题
         try:
             page_title = page.title()
-        except:
+        except Exception:
             page_title = "无法获取标题"
         
-        return {
-            'success': True,
-            'initial_url': initial_url,
-            'final_url': final_url,
-            'redirect_chain': redirect_chain,
-            'total_redirects': len(redirect_chain) - 1,
-            'page_title': page_title
-        }
+        return tracker.result(page.url, page_title)
     
     except Exception as e:
-        return {
-            'success': False,
-            'initial_url': initial_url,
-            'final_url': initial_url,
-            'error': str(e),
-            'redirect_chain': redirect_chain,
-            'total_redirects': 0,
-            'page_title': '获取失败'
-        }
+        return tracker.failure(e)
+    finally:
+        tracker.detach()
+
+def page_from_source(source):
+    """
+    从 source（第 N 页第 M 个元素）中提取页码，无法解析时返回 0
+    """
+    if '第 ' in source and ' 页' in source:
+        try:
+            return int(source.split('第 ')[1].split(' 页')[0])
+        except:
+            pass
+    return 0
 
 def load_existing_data(filename):
     """
     加载已存在的数据文件，支持断点续传
     
+    JSONL目录只读取文件末尾，返回最后一页的记录（用于跳页校验和去重），
+    之前的记录已在文件中，不需要再载入内存。
+    
     Args:
-        filename: JSON文件名
+        filename: JSON / JSONL 文件名
         
     Returns:
         tuple: (现有数据列表, 最后处理的页码)
     """
     if os.path.exists(filename):
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            existing_urls = data.get('urls', [])
-            
-            # 计算最后处理的页码
-            last_page = 0
-            if existing_urls:
+            if is_jsonl_catalog(filename):
+                tail_records = read_tail_records(filename)
+                last_page = page_from_source(tail_records[-1].get('source', '')) if tail_records else 0
+                existing_urls = checkpoint_page_rows(tail_records, last_page)
+                meta = load_catalog_meta(filename) or {}
+                total_count = meta.get('record_count', len(existing_urls))
+            else:
+                with open(filename, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                
+                existing_urls = data.get('urls', [])
+                total_count = len(existing_urls)
+                
                 # 从最后一条记录中提取页码
-                last_source = existing_urls[-1].get('source', '')
-                if '第 ' in last_source and ' 页' in last_source:
-                    try:
-                        page_part = last_source.split('第 ')[1].split(' 页')[0]
-                        last_page = int(page_part)
-                    except:
-                        pass
+                last_page = page_from_source(existing_urls[-1].get('source', '')) if existing_urls else 0
             
             print(f"📂 发现已存在的数据文件: {filename}")
-            print(f"📊 已有数据: {len(existing_urls)} 条")
+            print(f"📊 已有数据: {total_count} 条")
             print(f"📄 最后处理页码: {last_page}")
             
             return existing_urls, last_page
@@ -116,47 +507,56 @@ def load_existing_data(filename):
     
     return [], 0
 
-def save_urls_to_json_batch(urls, filename="jyxx_final_urls.json", timebegin=None, is_final=False):
+def save_urls_to_json_batch(urls, filename="jyxx_final_urls.json", timebegin=None, is_final=False, extra_statistics=None):
     """
     批量保存URL数据到JSON文件
     
+    文件名以 .jsonl 结尾时使用追加写入的JSONL目录（见 url_catalog.py），
+    每次只追加新记录并更新 .meta.json，不再重写整个文件。
+    
     Args:
         urls: URL列表
         filename: 输出文件名
         timebegin: 开始时间
         is_final: 是否为最终保存
+        extra_statistics: 附加到 statistics 中的统计信息（如直接解析命中率）
     """
     try:
-        # 统计数据
-        total_count = len(urls)
-        success_count = len([url for url in urls if url.get('final_url') != '获取失败'])
-        failed_count = total_count - success_count
-        
-        # 准备要保存的数据
-        data = {
-            "metadata": {
-                "timebegin": timebegin or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "total_count": total_count,
-                "success_count": success_count,
-                "failed_count": failed_count,
-                "description": "获取重定向后的最终URL数据",
-                "is_complete": is_final
-            },
-            "statistics": {
-                "success_rate": f"{(success_count/total_count*100):.1f}%" if total_count > 0 else "0%",
-            },
-            "urls": urls
-        }
-        
-        # 保存到JSON文件
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if is_jsonl_catalog(filename):
+            data = get_catalog_writer(filename).save(urls, timebegin, is_final, extra_statistics)
+        else:
+            # 统计数据
+            total_count = len(urls)
+            success_count = len([url for url in urls if url.get('final_url') != '获取失败'])
+            failed_count = total_count - success_count
+            
+            # 准备要保存的数据
+            data = {
+                "metadata": {
+                    "timebegin": timebegin or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "total_count": total_count,
+                    "success_count": success_count,
+                    "failed_count": failed_count,
+                    "description": "获取重定向后的最终URL数据",
+                    "is_complete": is_final
+                },
+                "statistics": {
+                    "success_rate": f"{(success_count/total_count*100):.1f}%" if total_count > 0 else "0%",
+                },
+                "urls": urls
+            }
+            if extra_statistics:
+                data["statistics"].update(extra_statistics)
+            
+            # 保存到JSON文件
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
         
         if is_final:
             print(f"\n=== 📄 最终数据已保存到 {filename} ===")
         else:
-            print(f"\n💾 批量保存: {total_count} 条数据已保存到 {filename}")
+            print(f"\n💾 批量保存: {data['metadata']['total_count']} 条数据已保存到 {filename}")
         
         print(f"📅 保存时间: {data['metadata']['timestamp']}")
         print(f"📊 总数量: {data['metadata']['total_count']}")
@@ -170,9 +570,149 @@ def save_urls_to_json_batch(urls, filename="jyxx_final_urls.json", timebegin=Non
         print(f"❌ 保存JSON文件时出错: {e}")
         return False
 
+def click_next_page(main_page, settle_ms=1000):
+    """
+    点击下一页按钮
+
+    Returns:
+        bool: 是否成功翻页
+    """
+    next_button = main_page.query_selector('a.next')
+    if not next_button or 'disabled' in (next_button.get_attribute('class') or ''):
+        return False
+    next_button.click()
+    main_page.wait_for_load_state("networkidle", timeout=8000)
+    main_page.wait_for_timeout(settle_ms)
+    return True
+
+
+def warn_click_fallback(page_count):
+    """
+    无法直接跳页、回退到逐页点击下一页时提示代价，以及需要检查的分页器选择器
+    """
+    print(f"⚠️ 无法直接跳页，回退到逐页点击下一页：需要点击 {page_count} 次，"
+          f"预计约 {page_count * CLICK_SKIP_SECONDS_PER_PAGE} 秒")
+    print("   如果站点分页器有页码输入框，请把它的选择器加入 PAGER_INPUT_SELECTORS / PAGER_GO_SELECTORS")
+
+
+def skip_pages_by_clicking(main_page, count):
+    """
+    逐页点击下一页跳过 count 页（较慢，仅在无法直接跳页时使用）
+    """
+    for skip_page in range(count):
+        try:
+            if not click_next_page(main_page):
+                print(f"⚠️ 只跳过了 {skip_page} 页，从当前页开始")
+                return skip_page
+        except Exception as e:
+            print(f"⚠️ 跳转页面时出错: {e}")
+            return skip_page
+    return count
+
+
+def jump_to_page(main_page, page_number):
+    """
+    通过分页器的页码输入框直接跳到第 page_number 页（从1开始）
+
+    Returns:
+        bool: 是否找到页码输入框并完成跳转
+    """
+    for input_selector in PAGER_INPUT_SELECTORS:
+        page_input = main_page.query_selector(input_selector)
+        if not page_input or not page_input.is_visible():
+            continue
+
+        page_input.fill(str(page_number))
+        go_button = None
+        for go_selector in PAGER_GO_SELECTORS:
+            go_button = main_page.query_selector(go_selector)
+            if go_button and go_button.is_visible():
+                break
+            go_button = None
+
+        if go_button:
+            go_button.click()
+        else:
+            page_input.press("Enter")
+
+        main_page.wait_for_load_state("networkidle", timeout=8000)
+        main_page.wait_for_selector(".info-item", state="attached", timeout=8000)
+        main_page.wait_for_timeout(500)
+        print(f"🔢 通过分页器输入框 {input_selector} 跳到第 {page_number} 页")
+        return True
+    return False
+
+
+def seek_to_page(main_page, page_number, checkpoint_rows=None):
+    """
+    直接跳到第 page_number 页（从1开始），并用断点记录校验是否到达正确页面
+
+    Args:
+        main_page: 列表页
+        page_number: 目标页码（从1开始）
+        checkpoint_rows: 该页已保存的记录，为空时不做校验
+
+    Returns:
+        bool: 是否已到达并通过校验
+    """
+    try:
+        if not jump_to_page(main_page, page_number):
+            print(f"⚠️ 未找到分页器的页码输入框（已尝试 {len(PAGER_INPUT_SELECTORS)} 个选择器）")
+            return False
+    except Exception as e:
+        print(f"⚠️ 直接跳页时出错: {e}")
+        return False
+
+    if not checkpoint_rows:
+        return True
+    page_items = main_page.eval_on_selector_all('[class="info-item"]', LIST_ITEMS_JS)
+    return verify_checkpoint(page_items, checkpoint_rows, page_number)
+
+
+def resolve_by_click(main_page, redirect_page, element):
+    """
+    点击列表项捕获弹出页的初始URL，再用专门的页面跟踪重定向
+
+    Args:
+        main_page: 列表页
+        redirect_page: 用于跟踪重定向的页面
+        element: 列表项元素
+
+    Returns:
+        get_final_redirect_url 返回的重定向信息字典
+    """
+    # 监听新页面打开事件
+    with main_page.expect_popup() as new_page_info:
+        element.click()
+    
+    # 获取新页面和初始URL
+    new_page = new_page_info.value
+    initial_url = new_page.url
+    
+    print(f"    初始URL: {initial_url}")
+    
+    # 关闭弹出的页面，我们用专门的页面来跟踪重定向
+    new_page.close()
+    
+    # 使用专门的页面跟踪重定向
+    print(f"    开始跟踪重定向...")
+    redirect_info = get_final_redirect_url(redirect_page, initial_url, wait_time=3)
+    
+    if redirect_info['success']:
+        print(f"    ✅ 最终URL: {redirect_info['final_url']} (耗时 {redirect_info['elapsed']}s)")
+        if redirect_info['total_redirects'] > 0:
+            print(f"    🔄 经过 {redirect_info['total_redirects']} 次重定向")
+        print(f"    📄 页面标题: {redirect_info['page_title']}")
+    else:
+        print(f"    ❌ 重定向跟踪失败: {redirect_info.get('error', '未知错误')}")
+    
+    return redirect_info
+
 def get_all_popup_urls_with_redirect(target_url, max_pages, link_selector=".class-item", 
                                    batch_size=10, output_filename="jyxx_final_urls.json", 
-                                   resume=True):
+                                   resume=True, resolve_mode="click", resolve_stats=None,
+                                   start_page=0, headless=False, known_infoids=None, stop_after_known=20,
+                                   drift_report=None, blocking_profile=None, blocking_stats=None):
     """
     获取所有匹配元素点击后打开的新标签页URL，并跟踪重定向到最终URL
     支持分批保存和断点续传
@@ -184,13 +724,38 @@ def get_all_popup_urls_with_redirect(target_url, max_pages, link_selector=".clas
         batch_size: 批量保存的页数（每处理多少页保存一次）
         output_filename: 输出文件名
         resume: 是否支持断点续传
+        resolve_mode: URL解析方式
+            "click"  - 逐个点击列表项并跟踪重定向（原有方式）
+            "direct" - 批量读取 opendetailjyxx 参数直接构造最终URL，
+                       仅对无法解析的列表项回退到点击方式
+        resolve_stats: 可选的统计字典（new_resolve_stats()），用于记录直接解析命中/未命中次数
+        start_page: 起始页（从0开始），用于分片处理；断点续传时以已有数据为准
+        headless: 是否使用无头模式
+        known_infoids: 已知的 infoid 集合（增量模式）。已知的列表项会被跳过，
+                       连续遇到 stop_after_known 个已知项后停止翻页
+        stop_after_known: 增量模式下停止翻页所需的连续已知项数量
+        drift_report: 可选的翻页漂移报告字典（new_drift_report()）。每页开头与已获取数据重复的行
+                      会被记录为漂移并跳过，所有重复的 infoid 都只保存一次
+        blocking_profile: 请求拦截配置（见 resource_blocking.py），为 None 时不拦截
+        blocking_stats: 可选的拦截统计字典（new_blocking_stats()）
     
     Returns:
         包含所有URL信息的列表
     """
     # 检查是否需要断点续传
     all_urls = []
-    start_page = 0
+    section = get_list_section(target_url)
+    if resolve_stats is None:
+        resolve_stats = new_resolve_stats()
+    if resolve_mode not in ("click", "direct"):
+        raise ValueError(f"不支持的解析方式: {resolve_mode}")
+    if drift_report is None:
+        drift_report = new_drift_report()
+    if blocking_stats is None:
+        blocking_stats = new_blocking_stats()
+    # 增量模式下连续遇到的已知项数量
+    consecutive_known = 0
+    reached_known = False
     
     if resume:
         existing_urls, last_page = load_existing_data(output_filename)
@@ -203,10 +768,18 @@ def get_all_popup_urls_with_redirect(target_url, max_pages, link_selector=".clas
             else:
                 print("🆕 重新开始处理...")
     
+    # JSONL目录：续传时只追加新记录，重新开始时清空文件
+    if is_jsonl_catalog(output_filename):
+        open_catalog_writer(output_filename, list_offset=len(all_urls), truncate=not all_urls)
+    
+    # 已获取的 infoid，用于检测翻页漂移和去重
+    seen_infoids = {infoid_from_url(url_info.get('final_url')) for url_info in all_urls}
+    seen_infoids.discard(None)
+    
     with sync_playwright() as p:
         # 设置更真实的浏览器指纹
         browser = p.chromium.launch(
-            headless=False,  # 可以改为True进行无头模式
+            headless=headless,
             args=[
                 "--disable-blink-features=AutomationControlled",
                 "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -216,6 +789,8 @@ def get_all_popup_urls_with_redirect(target_url, max_pages, link_selector=".clas
             viewport={"width": 1920, "height": 1080},
             locale="zh-CN"
         )
+        if blocking_profile:
+            install_blocking(context, blocking_profile, blocking_stats)
         
         # 创建主页面
         main_page = context.new_page()
@@ -229,22 +804,18 @@ def get_all_popup_urls_with_redirect(target_url, max_pages, link_selector=".clas
             main_page.wait_for_selector(".info-item", state="attached", timeout=8000)
             main_page.wait_for_timeout(1000)
 
-            # 如果需要跳到指定页面
+            # 如果需要跳到指定页面：先直接跳到最后处理的页并校验，再翻一页
             if start_page > 0:
                 print(f"🔍 正在跳转到第 {start_page + 1} 页...")
-                for skip_page in range(start_page):
-                    try:
-                        next_button = main_page.query_selector('a.next')
-                        if next_button and 'disabled' not in (next_button.get_attribute('class') or ''):
-                            next_button.click()
-                            main_page.wait_for_load_state("networkidle", timeout=8000)
-                            main_page.wait_for_timeout(1000)
-                        else:
-                            print(f"⚠️ 无法跳转到第 {start_page + 1} 页，从当前页开始")
-                            break
-                    except Exception as e:
-                        print(f"⚠️ 跳转页面时出错: {e}")
-                        break
+                checkpoint_rows = checkpoint_page_rows(all_urls, start_page)
+                if seek_to_page(main_page, start_page, checkpoint_rows) and click_next_page(main_page):
+                    print(f"✅ 已到达第 {start_page + 1} 页")
+                else:
+                    warn_click_fallback(start_page)
+                    main_page.goto(target_url, wait_until="domcontentloaded")
+                    main_page.wait_for_load_state("networkidle", timeout=8000)
+                    main_page.wait_for_selector(".info-item", state="attached", timeout=8000)
+                    skip_pages_by_clicking(main_page, start_page)
             
             # 循环处理每一页
             for page_num in range(start_page, max_pages):
@@ -259,8 +830,32 @@ def get_all_popup_urls_with_redirect(target_url, max_pages, link_selector=".clas
                     elements = main_page.query_selector_all('[class="info-item"]')
                     print(f"第 {page_num + 1} 页找到 {len(elements)} 个匹配的元素")
                     
+                    # 一次性读取整页列表项的参数（标题、onclick、日期）
+                    list_items = main_page.eval_on_selector_all('[class="info-item"]', LIST_ITEMS_JS)
+                    
+                    # 翻页期间有新公告发布时，上一页末尾的行会被挤到本页开头
+                    shift = leading_overlap([list_item_infoid(item) for item in list_items], seen_infoids)
+                    if shift:
+                        record_drift(drift_report, page_num + 1, shift)
+                        print(f"↪️ 第 {page_num + 1} 页开头有 {shift} 行已获取过（列表发生漂移），将跳过这些行")
+                    
                     # 处理当前页面的每个元素
                     for i, element in enumerate(elements):
+                        item_infoid = list_item_infoid(list_items[i]) if i < len(list_items) else None
+                        if item_infoid and item_infoid in seen_infoids:
+                            drift_report['duplicates_skipped'] += 1
+                            print(f"  ⏭️ 跳过重复的第 {page_num + 1} 页第 {i+1} 个元素 ({item_infoid})")
+                            continue
+                        
+                        if known_infoids is not None and i < len(list_items):
+                            if item_infoid in known_infoids:
+                                consecutive_known += 1
+                                if consecutive_known >= stop_after_known:
+                                    reached_known = True
+                                    break
+                                continue
+                            consecutive_known = 0
+                        
                         element_info = {
                             'source': f'第 {page_num + 1} 页第 {i+1} 个元素',
                             'name': '未知',
@@ -270,56 +865,72 @@ def get_all_popup_urls_with_redirect(target_url, max_pages, link_selector=".clas
                         try:
                             print(f"  正在处理第 {page_num + 1} 页的第 {i+1} 个元素...")
                             
-                            # 获取标题
-                            title_element = element.query_selector('a')
-                            if title_element:
-                                title = title_element.get_attribute('title') or title_element.inner_text().strip()
-                                element_info['name'] = title
-                                print(f"    标题: {title}")
-                            
-                            # 监听新页面打开事件
-                            with main_page.expect_popup() as new_page_info:
-                                element.click()
-                            
-                            # 获取新页面和初始URL
-                            new_page = new_page_info.value
-                            initial_url = new_page.url
-                            
-                            print(f"    初始URL: {initial_url}")
-                            
-                            # 关闭弹出的页面，我们用专门的页面来跟踪重定向
-                            new_page.close()
-                            
-                            # 使用专门的页面跟踪重定向
-                            print(f"    开始跟踪重定向...")
-                            redirect_info = get_final_redirect_url(redirect_page, initial_url, wait_time=3)
+                            if resolve_mode == "direct" and i < len(list_items):
+                                list_item = list_items[i]
+                                if list_item.get('title'):
+                                    element_info['name'] = list_item['title']
+                                    print(f"    标题: {list_item['title']}")
+                                
+                                final_url = resolve_list_item_direct(list_item, section)
+                                if final_url:
+                                    resolve_stats['direct_hit'] += 1
+                                    element_info['final_url'] = final_url
+                                    print(f"    ⚡ 直接解析: {final_url}")
+                                    seen_infoids.add(item_infoid)
+                                    all_urls.append(element_info)
+                                    continue
+                                
+                                resolve_stats['direct_miss'] += 1
+                                print(f"    ⚠️ 无法直接解析（onclick: {list_item.get('onclick')}），回退到点击方式")
+                            else:
+                                # 获取标题
+                                title_element = element.query_selector('a')
+                                if title_element:
+                                    title = title_element.get_attribute('title') or title_element.inner_text().strip()
+                                    element_info['name'] = title
+                                    print(f"    标题: {title}")
                             
+                            redirect_info = resolve_by_click(main_page, redirect_page, element)
                             element_info['final_url'] = redirect_info['final_url']
                             
-                            if redirect_info['success']:
-                                print(f"    ✅ 最终URL: {redirect_info['final_url']}")
-                                if redirect_info['total_redirects'] > 0:
-                                    print(f"    🔄 经过 {redirect_info['total_redirects']} 次重定向")
-                                print(f"    📄 页面标题: {redirect_info['page_title']}")
-                            else:
-                                print(f"    ❌ 重定向跟踪失败: {redirect_info.get('error', '未知错误')}")
+                            if resolve_mode == "direct":
+                                if redirect_info['success']:
+                                    resolve_stats['fallback_success'] += 1
+                                else:
+                                    resolve_stats['fallback_failed'] += 1
                             
                             # 等待一小段时间，避免操作过快
                             main_page.wait_for_timeout(1000)
                             
                         except Exception as e:
                             print(f"    ❌ 处理第 {page_num + 1} 页第 {i+1} 个元素时出错: {e}")
+                            if resolve_mode == "direct":
+                                resolve_stats['fallback_failed'] += 1
                         
+                        # 无法从列表读取 infoid 的行，用解析后的URL去重
+                        row_infoid = item_infoid or infoid_from_url(element_info['final_url'])
+                        if row_infoid:
+                            if row_infoid in seen_infoids:
+                                drift_report['duplicates_skipped'] += 1
+                                continue
+                            seen_infoids.add(row_infoid)
                         all_urls.append(element_info)
                     
                     print(f"第 {page_num + 1} 页处理完成")
+                    if resolve_mode == "direct":
+                        print_resolve_stats(resolve_stats)
+                    
+                    if reached_known:
+                        print(f"🛑 已连续遇到 {consecutive_known} 个已知公告，停止翻页（本次新增 {len(all_urls)} 条）")
+                        break
                     
                     # 检查是否需要批量保存
                     if (page_num + 1) % batch_size == 0:
                         print(f"\n💾 达到批量保存条件（每{batch_size}页保存一次）")
                         save_success = save_urls_to_json_batch(all_urls, output_filename, 
                                                              datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 
-                                                             is_final=False)
+                                                             is_final=False,
+                                                             extra_statistics=discovery_statistics(resolve_stats, resolve_mode, drift_report))
                         if save_success:
                             print(f"✅ 批量保存成功！已处理 {page_num + 1} 页")
                         else:
@@ -361,7 +972,8 @@ def get_all_popup_urls_with_redirect(target_url, max_pages, link_selector=".clas
                             print("💾 出错时紧急保存数据...")
                             save_urls_to_json_batch(all_urls, output_filename, 
                                                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 
-                                                   is_final=False)
+                                                   is_final=False,
+                                                   extra_statistics=discovery_statistics(resolve_stats, resolve_mode, drift_report))
                             break
                 
                 except Exception as e:
@@ -370,7 +982,8 @@ def get_all_popup_urls_with_redirect(target_url, max_pages, link_selector=".clas
                     print("💾 出错时紧急保存数据...")
                     save_urls_to_json_batch(all_urls, output_filename, 
                                            datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 
-                                           is_final=False)
+                                           is_final=False,
+                                           extra_statistics=discovery_statistics(resolve_stats, resolve_mode, drift_report))
                     break
             
             return all_urls
@@ -382,12 +995,133 @@ def get_all_popup_urls_with_redirect(target_url, max_pages, link_selector=".clas
                 print("💾 异常退出前保存已获取的数据...")
                 save_urls_to_json_batch(all_urls, output_filename, 
                                        datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 
-                                       is_final=False)
+                                       is_final=False,
+                                       extra_statistics=discovery_statistics(resolve_stats, resolve_mode, drift_report))
             return all_urls
         finally:
+            if blocking_profile:
+                print_blocking_stats(blocking_stats)
             print(f"🔚 获取URL完成, 关闭浏览器")
             browser.close()
 
+def observed_page_size(urls):
+    """
+    从 source（第 N 页第 M 个元素）统计每页实际出现的行数，取最大值（最后一页可能不满）
+
+    Returns:
+        int: 每页行数，无法从 source 解析时返回 None
+    """
+    rows_per_page = Counter(page_from_source(url_info.get('source', '')) for url_info in urls)
+    rows_per_page.pop(0, None)
+    return max(rows_per_page.values()) if rows_per_page else None
+
+
+def renumber_sources(urls, page_size=None):
+    """
+    按列表中的当前位置重新生成 source（第 N 页第 M 个元素）
+
+    Args:
+        urls: URL列表
+        page_size: 每页条数，为 None 时按 source 中每页实际出现的行数推断（无法推断时为 DEFAULT_PAGE_SIZE）
+    """
+    page_size = page_size or observed_page_size(urls) or DEFAULT_PAGE_SIZE
+    for index, url_info in enumerate(urls):
+        url_info['source'] = f'第 {index // page_size + 1} 页第 {index % page_size + 1} 个元素'
+    return urls
+
+def refresh_catalog_incremental(target_url, catalog_filename, stop_after_known=20, max_pages=500,
+                                resolve_mode="direct", page_size=None, headless=False, batch_size=1):
+    """
+    增量更新：只获取上次运行之后新发布的公告，并插入到目录文件的最前面
+
+    以已有目录中 final_url 的 infoid 作为水位线，从第1页开始翻页，
+    连续遇到 stop_after_known 个已知公告后停止。
+
+    Args:
+        target_url: 目标网页URL
+        catalog_filename: 已有的目录文件（同时也是输出文件）
+        stop_after_known: 连续多少个已知公告后停止翻页
+        max_pages: 最多翻页数（防止水位线失效时走完全部页面）
+        resolve_mode: URL解析方式
+        page_size: 每页条数，用于重新编号 source；为 None 时按已有目录每页的行数推断
+        headless: 是否使用无头模式
+        batch_size: 每处理多少页把增量数据保存到 .delta.json 文件一次，中断后再次运行时从该文件继续
+
+    Returns:
+        list: 新增的URL列表
+    """
+    if is_jsonl_catalog(catalog_filename):
+        # 新记录要插入到最前面，JSONL目录需要完整读取后重写
+        existing_urls = list(iter_records_from(catalog_filename)) if os.path.exists(catalog_filename) else []
+    else:
+        existing_urls, _ = load_existing_data(catalog_filename)
+    known_infoids = {infoid_from_url(url_info.get('final_url')) for url_info in existing_urls}
+    known_infoids.discard(None)
+    print(f"📌 水位线: 已知 {len(known_infoids)} 个 infoid，连续 {stop_after_known} 个已知项后停止")
+
+    # 增量数据先写入单独的文件，避免中途保存覆盖已有目录；增量数据量小，总是使用JSON格式，
+    # 上次更新中断时从该文件的最后一页继续翻页，已获取的新公告不再重新解析
+    root, _ = os.path.splitext(catalog_filename)
+    delta_filename = f"{root}.delta.json"
+    if os.path.exists(delta_filename):
+        print(f"📂 发现上次中断的增量文件: {delta_filename}")
+    timebegin = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    resolve_stats = new_resolve_stats()
+
+    new_urls = get_all_popup_urls_with_redirect(
+        target_url=target_url,
+        max_pages=max_pages,
+        batch_size=batch_size,
+        output_filename=delta_filename,
+        resume=True,
+        resolve_mode=resolve_mode,
+        resolve_stats=resolve_stats,
+        headless=headless,
+        known_infoids=known_infoids,
+        stop_after_known=stop_after_known,
+    )
+
+    # 上次更新在合并目录之后、删除增量文件之前中断时，续传的增量记录已经在目录中
+    new_urls = [url_info for url_info in new_urls if infoid_from_url(url_info.get('final_url')) not in known_infoids]
+    if not new_urls:
+        print("✅ 没有新公告，目录无需更新")
+        if os.path.exists(delta_filename):
+            os.remove(delta_filename)
+        return []
+
+    # 新记录通常只占第1页的一部分，不能用来推断每页条数：按已有目录推断；
+    # 已有目录为空时只用本次翻过的完整页面（最后一页之前的页）
+    last_new_page = max(page_from_source(url_info.get('source', '')) for url_info in new_urls)
+    page_size = page_size or observed_page_size(existing_urls) or observed_page_size(
+        [url_info for url_info in new_urls if page_from_source(url_info.get('source', '')) < last_new_page]
+    ) or DEFAULT_PAGE_SIZE
+    merged = renumber_sources(new_urls + existing_urls, page_size)
+    extra_statistics = {"new_count": len(new_urls)}
+    extra_statistics.update(resolve_summary(resolve_stats, resolve_mode) or {})
+    if is_jsonl_catalog(catalog_filename):
+        open_catalog_writer(catalog_filename, truncate=True)
+    if save_urls_to_json_batch(merged, catalog_filename, timebegin, is_final=True,
+                               extra_statistics=extra_statistics):
+        print(f"🆕 新增 {len(new_urls)} 条公告，已插入到 {catalog_filename} 最前面")
+        if os.path.exists(delta_filename):
+            os.remove(delta_filename)
+    return new_urls
+
+def compensate_drift(target_url, catalog_filename, drift_report, resolve_mode="direct", headless=False):
+    """
+    补偿翻页漂移：漂移说明遍历期间列表头部有新公告发布，这些公告在本次遍历中被错过，
+    重新从第1页读取，直到遇到已获取的公告为止，并插入到目录最前面
+
+    Returns:
+        list: 补充获取的URL列表
+    """
+    if drift_report['total_shift'] <= 0:
+        return []
+    print(f"🔁 检测到 {drift_report['total_shift']} 行漂移，重新读取列表头部补充遗漏的新公告...")
+    return refresh_catalog_incremental(target_url, catalog_filename,
+                                       stop_after_known=min(drift_report['max_shift'] + 1, 20),
+                                       resolve_mode=resolve_mode, headless=headless)
+
 def print_summary(urls):
     """
     打印处理结果摘要
@@ -418,6 +1152,13 @@ if __name__ == "__main__":
     
     timebegin = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
+    # # 每日增量更新：只获取上次运行后新发布的公告并插入到目录最前面
+    # refresh_catalog_incremental(
+    #     target_url="https://www.cqggzy.com/jyjg/transaction_detail.html",
+    #     catalog_filename="jyjg_final_urls.json",
+    #     stop_after_known=20
+    # )
+    
     # # 获取所有URL及其重定向信息
     # urls = get_all_popup_urls_with_redirect(
     #     target_url=target_url, 
@@ -454,22 +1195,33 @@ if __name__ == "__main__":
     print("-" * 80)
     
     # 获取所有URL及其重定向信息
+    resolve_stats = new_resolve_stats()
+    drift_report = new_drift_report()
     urls = get_all_popup_urls_with_redirect(
         target_url=target_url, 
         max_pages=max_pages,
         batch_size=batch_size,
         output_filename="jyjg_final_urls.json",
-        resume=True  # 支持断点续传
+        resume=True,  # 支持断点续传
+        resolve_mode="direct",  # 直接构造最终URL，无法解析时回退到点击
+        resolve_stats=resolve_stats,
+        drift_report=drift_report,
+        blocking_profile=DISCOVERY_PROFILE  # 屏蔽图片、字体、统计和第三方脚本
     )
     
     if urls:
         # 打印摘要
         print_summary(urls)
+        print_resolve_stats(resolve_stats)
+        print_drift_report(drift_report)
         
         # 最终保存
-        save_success = save_urls_to_json_batch(urls, "jyjg_final_urls.json", timebegin, is_final=True)
+        save_success = save_urls_to_json_batch(urls, "jyjg_final_urls.json", timebegin, is_final=True,
+                                               extra_statistics=discovery_statistics(resolve_stats, "direct", drift_report))
         if save_success:
             print("🎉 最终数据已成功保存到 jyjg_final_urls.json")
+            # 补充遍历期间新发布、因漂移而错过的公告
+            compensate_drift(target_url, "jyjg_final_urls.json", drift_report)
         else:
             print("💥 保存最终数据失败")
     else:
@@ -0,0 +1,458 @@
+# 异步版本的URL获取：主页面负责翻页和捕获弹出页的初始URL，
+# 由多个页面组成的重定向解析池并发跟踪最终URL，结果按列表原始顺序保存
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+import asyncio
+import itertools
+import time
+from datetime import datetime
+
+from host_limiter import HostLimiterPool
+from resource_blocking import DISCOVERY_PROFILE, install_blocking_async, new_blocking_stats, print_blocking_stats
+from url_catalog import is_jsonl_catalog, iter_catalog, open_catalog_writer
+from safe_get_url import (
+    DEFAULT_QUIET_PERIOD,
+    FINAL_URL_PATTERN,
+    LIST_ITEMS_JS,
+    PAGER_GO_SELECTORS,
+    PAGER_INPUT_SELECTORS,
+    RedirectTracker,
+    checkpoint_page_rows,
+    get_list_section,
+    load_existing_data,
+    new_resolve_stats,
+    print_resolve_stats,
+    print_summary,
+    resolve_list_item_direct,
+    resolve_summary,
+    save_urls_to_json_batch,
+    verify_checkpoint,
+    warn_click_fallback,
+)
+
+
+async def get_final_redirect_url_async(page, initial_url, wait_time=5, quiet_period=DEFAULT_QUIET_PERIOD,
+                                       final_url_pattern=FINAL_URL_PATTERN):
+    """
+    get_final_redirect_url 的异步版本，重定向链的记录和结束判断见 RedirectTracker
+
+    Args:
+        page: Playwright异步页面对象
+        initial_url: 初始URL
+        wait_time: 等待重定向的最长时间（秒）
+        quiet_period: URL保持稳定多久后认为重定向结束（秒）
+        final_url_pattern: 最终URL的正则，匹配后提前返回
+
+    Returns:
+        包含重定向信息的字典
+    """
+    # 多个解析页面并发运行，不逐条打印重定向
+    tracker = RedirectTracker(page, initial_url, wait_time, quiet_period, final_url_pattern, verbose=False)
+    tracker.attach()
+    try:
+        await page.goto(initial_url, wait_until='domcontentloaded')
+        tracker.record_url(page.url)
+
+        while True:
+            wait = tracker.next_wait(page.url)
+            if wait is None:
+                break
+            try:
+                await page.wait_for_event("framenavigated", predicate=tracker.is_main_frame, timeout=wait * 1000)
+            except PlaywrightTimeoutError:
+                pass
+
+        try:
+            page_title = await page.title()
+        except Exception:
+            page_title = "无法获取标题"
+
+        return tracker.result(page.url, page_title)
+
+    except Exception as e:
+        return tracker.failure(e)
+    finally:
+        tracker.detach()
+
+
+async def redirect_worker(worker_id, page, queue, all_urls, done_flags, limiters, resolve_stats, resolve_mode):
+    """
+    重定向解析工作协程：从队列中取出 (索引, 初始URL)，解析后写回 all_urls 对应位置
+    """
+    while True:
+        index, initial_url = await queue.get()
+        try:
+            async with limiters.for_url(initial_url):
+                redirect_info = await get_final_redirect_url_async(page, initial_url, wait_time=3)
+
+            all_urls[index]['final_url'] = redirect_info['final_url']
+            if redirect_info['success']:
+                print(f"    ✅ [解析器{worker_id}] {all_urls[index]['source']}: {redirect_info['final_url']} (耗时 {redirect_info['elapsed']}s)")
+            else:
+                print(f"    ❌ [解析器{worker_id}] {all_urls[index]['source']} 重定向跟踪失败: {redirect_info.get('error', '未知错误')}")
+
+            if resolve_mode == "direct":
+                if redirect_info['success']:
+                    resolve_stats['fallback_success'] += 1
+                else:
+                    resolve_stats['fallback_failed'] += 1
+        except Exception as e:
+            print(f"    ❌ [解析器{worker_id}] 处理 {initial_url} 时出错: {e}")
+        finally:
+            done_flags[index] = True
+            queue.task_done()
+
+
+def completed_prefix(done_flags):
+    """
+    返回从头开始连续已完成的记录数，保证保存的数据按原始顺序且没有空洞
+    """
+    for index, done in enumerate(done_flags):
+        if not done:
+            return index
+    return len(done_flags)
+
+
+async def click_next_page_async(main_page, settle_ms=1000):
+    """
+    click_next_page 的异步版本
+    """
+    next_button = await main_page.query_selector('a.next')
+    if not next_button or 'disabled' in (await next_button.get_attribute('class') or ''):
+        return False
+    await next_button.click()
+    await main_page.wait_for_load_state("networkidle", timeout=8000)
+    await main_page.wait_for_timeout(settle_ms)
+    return True
+
+
+async def jump_to_page_async(main_page, page_number):
+    """
+    jump_to_page 的异步版本
+    """
+    for input_selector in PAGER_INPUT_SELECTORS:
+        page_input = await main_page.query_selector(input_selector)
+        if not page_input or not await page_input.is_visible():
+            continue
+
+        await page_input.fill(str(page_number))
+        go_button = None
+        for go_selector in PAGER_GO_SELECTORS:
+            go_button = await main_page.query_selector(go_selector)
+            if go_button and await go_button.is_visible():
+                break
+            go_button = None
+
+        if go_button:
+            await go_button.click()
+        else:
+            await page_input.press("Enter")
+
+        await main_page.wait_for_load_state("networkidle", timeout=8000)
+        await main_page.wait_for_selector(".info-item", state="attached", timeout=8000)
+        await main_page.wait_for_timeout(500)
+        print(f"🔢 通过分页器输入框 {input_selector} 跳到第 {page_number} 页")
+        return True
+    return False
+
+
+async def seek_to_page_async(main_page, page_number, checkpoint_rows=None):
+    """
+    seek_to_page 的异步版本：通过页码输入框直接跳页，并用断点记录校验
+    """
+    try:
+        if not await jump_to_page_async(main_page, page_number):
+            print(f"⚠️ 未找到分页器的页码输入框（已尝试 {len(PAGER_INPUT_SELECTORS)} 个选择器）")
+            return False
+    except Exception as e:
+        print(f"⚠️ 直接跳页时出错: {e}")
+        return False
+
+    if not checkpoint_rows:
+        return True
+    page_items = await main_page.eval_on_selector_all('[class="info-item"]', LIST_ITEMS_JS)
+    return verify_checkpoint(page_items, checkpoint_rows, page_number)
+
+
+async def capture_popup_url(main_page, element):
+    """
+    点击列表项并返回弹出页的初始URL
+    """
+    async with main_page.expect_popup() as new_page_info:
+        await element.click()
+    new_page = await new_page_info.value
+    initial_url = new_page.url
+    await new_page.close()
+    return initial_url
+
+
+async def get_all_popup_urls_with_redirect_async(target_url, max_pages, batch_size=10,
+                                                 output_filename="jyxx_final_urls.json", resume=True,
+                                                 resolve_mode="click", resolve_stats=None,
+                                                 pool_size=4, host_concurrency=4, min_request_interval=0.2,
+                                                 headless=False, blocking_profile=None, blocking_stats=None,
+                                                 resolved_queue=None):
+    """
+    get_all_popup_urls_with_redirect 的异步版本
+
+    主页面持续翻页并把弹出页的初始URL放入队列，pool_size 个解析页面并发跟踪重定向。
+    对同一主机的请求受 host_concurrency 和 min_request_interval 限制，
+    因此吞吐量随解析池大小增长，直到达到站点的礼貌性限制为止。
+
+    Args:
+        target_url: 目标网页URL
+        max_pages: 最大处理页数
+        batch_size: 批量保存的页数（每处理多少页保存一次）
+        output_filename: 输出文件名
+        resume: 是否支持断点续传
+        resolve_mode: "click" 或 "direct"，含义同 get_all_popup_urls_with_redirect
+        resolve_stats: 可选的统计字典（new_resolve_stats()）
+        pool_size: 并发解析重定向的页面数量
+        host_concurrency: 同一主机同时进行的最大请求数
+        min_request_interval: 同一主机相邻请求的最小间隔（秒）
+        headless: 是否使用无头模式
+        blocking_profile: 请求拦截配置（见 resource_blocking.py），为 None 时不拦截
+        blocking_stats: 可选的拦截统计字典（new_blocking_stats()）
+        resolved_queue: 可选的有界 asyncio.Queue（流水线模式，见 pipeline.py）。已完成的记录按列表顺序放入队列
+                        （包括续传时已有的记录），队列满时翻页暂停；结束标记由调用方放入
+
+    Returns:
+        包含所有URL信息的列表（按列表原始顺序）
+    """
+    all_urls = []
+    start_page = 0
+    section = get_list_section(target_url)
+    if resolve_stats is None:
+        resolve_stats = new_resolve_stats()
+    if resolve_mode not in ("click", "direct"):
+        raise ValueError(f"不支持的解析方式: {resolve_mode}")
+    if blocking_stats is None:
+        blocking_stats = new_blocking_stats()
+
+    if resume:
+        existing_urls, last_page = load_existing_data(output_filename)
+        if existing_urls:
+            response = input(f"发现已存在数据（{len(existing_urls)}条，最后处理第{last_page}页），是否继续从第{last_page+1}页开始？(y/n): ").lower()
+            if response == 'y':
+                all_urls = existing_urls
+                start_page = last_page
+                print(f"🔄 从第 {start_page + 1} 页开始继续处理...")
+            else:
+                print("🆕 重新开始处理...")
+
+    # JSONL目录：续传时只追加新记录，重新开始时清空文件
+    catalog_prefix_count = 0
+    if is_jsonl_catalog(output_filename):
+        open_catalog_writer(output_filename, list_offset=len(all_urls), truncate=not all_urls)
+        if all_urls and resolved_queue is not None:
+            # 续传时 all_urls 只有最后一页的记录，之前的记录发给下游时从目录文件中逐条读取
+            catalog_prefix_count = sum(1 for _ in iter_catalog(output_filename)) - len(all_urls)
+
+    # 已有数据视为已完成
+    done_flags = [True] * len(all_urls)
+    limiters = HostLimiterPool(max_concurrency=host_concurrency, min_interval=min_request_interval)
+    # 有界队列：解析池跟不上时翻页会自动暂停
+    queue = asyncio.Queue(maxsize=pool_size * 4)
+    started = time.monotonic()
+    new_count = 0
+    emitted_count = 0
+
+    async def emit_resolved():
+        # 只发送从头开始连续完成的记录，保证下游收到的顺序与目录文件一致
+        nonlocal emitted_count, catalog_prefix_count
+        if resolved_queue is None:
+            return
+        if catalog_prefix_count:
+            count, catalog_prefix_count = catalog_prefix_count, 0
+            for record in itertools.islice(iter_catalog(output_filename), count):
+                await resolved_queue.put(record)
+        prefix = completed_prefix(done_flags)
+        while emitted_count < prefix:
+            await resolved_queue.put(all_urls[emitted_count])
+            emitted_count += 1
+
+    def save_progress():
+        prefix = completed_prefix(done_flags)
+        return save_urls_to_json_batch(all_urls[:prefix], output_filename,
+                                       datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                                       is_final=False,
+                                       extra_statistics=resolve_summary(resolve_stats, resolve_mode))
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=headless,
+            args=[
+                "--disable-blink-features=AutomationControlled",
+                "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+            ]
+        )
+        context = await browser.new_context(
+            viewport={"width": 1920, "height": 1080},
+            locale="zh-CN"
+        )
+        if blocking_profile:
+            await install_blocking_async(context, blocking_profile, blocking_stats)
+
+        main_page = await context.new_page()
+        resolver_pages = [await context.new_page() for _ in range(pool_size)]
+        workers = [
+            asyncio.create_task(redirect_worker(worker_id + 1, resolver_page, queue, all_urls, done_flags,
+                                                limiters, resolve_stats, resolve_mode))
+            for worker_id, resolver_page in enumerate(resolver_pages)
+        ]
+        print(f"🧵 已启动 {pool_size} 个重定向解析器（每主机并发 {host_concurrency}，最小间隔 {min_request_interval}s）")
+
+        try:
+            await main_page.goto(target_url, wait_until="domcontentloaded")
+            await main_page.wait_for_load_state("networkidle", timeout=8000)
+            await main_page.wait_for_selector(".info-item", state="attached", timeout=8000)
+            await main_page.wait_for_timeout(1000)
+
+            # 如果需要跳到指定页面：先直接跳到最后处理的页并校验，再翻一页
+            if start_page > 0:
+                print(f"🔍 正在跳转到第 {start_page + 1} 页...")
+                checkpoint_rows = checkpoint_page_rows(all_urls, start_page)
+                if await seek_to_page_async(main_page, start_page, checkpoint_rows) and await click_next_page_async(main_page):
+                    print(f"✅ 已到达第 {start_page + 1} 页")
+                else:
+                    warn_click_fallback(start_page)
+                    await main_page.goto(target_url, wait_until="domcontentloaded")
+                    await main_page.wait_for_load_state("networkidle", timeout=8000)
+                    await main_page.wait_for_selector(".info-item", state="attached", timeout=8000)
+                    for skip_page in range(start_page):
+                        try:
+                            if not await click_next_page_async(main_page):
+                                print(f"⚠️ 只跳过了 {skip_page} 页，从当前页开始")
+                                break
+                        except Exception as e:
+                            print(f"⚠️ 跳转页面时出错: {e}")
+                            break
+
+            for page_num in range(start_page, max_pages):
+                print(f"\n=== 正在处理第 {page_num + 1} 页 ===")
+
+                try:
+                    await main_page.wait_for_selector(".info-item", state="attached", timeout=8000)
+                    await main_page.wait_for_timeout(1000)
+
+                    elements = await main_page.query_selector_all('[class="info-item"]')
+                    list_items = await main_page.eval_on_selector_all('[class="info-item"]', LIST_ITEMS_JS)
+                    print(f"第 {page_num + 1} 页找到 {len(elements)} 个匹配的元素")
+
+                    for i, element in enumerate(elements):
+                        list_item = list_items[i] if i < len(list_items) else {}
+                        element_info = {
+                            'source': f'第 {page_num + 1} 页第 {i+1} 个元素',
+                            'name': list_item.get('title') or '未知',
+                            'final_url': '获取失败',
+                        }
+                        index = len(all_urls)
+                        all_urls.append(element_info)
+                        done_flags.append(False)
+                        new_count += 1
+
+                        try:
+                            if resolve_mode == "direct":
+                                final_url = resolve_list_item_direct(list_item, section)
+                                if final_url:
+                                    resolve_stats['direct_hit'] += 1
+                                    element_info['final_url'] = final_url
+                                    done_flags[index] = True
+                                    continue
+                                resolve_stats['direct_miss'] += 1
+
+                            initial_url = await capture_popup_url(main_page, element)
+                            print(f"  📥 {element_info['source']} 初始URL: {initial_url}")
+                            # 队列满时在此等待，形成背压
+                            await queue.put((index, initial_url))
+                        except Exception as e:
+                            print(f"    ❌ 处理第 {page_num + 1} 页第 {i+1} 个元素时出错: {e}")
+                            done_flags[index] = True
+                            if resolve_mode == "direct":
+                                resolve_stats['fallback_failed'] += 1
+
+                    print(f"第 {page_num + 1} 页处理完成（队列中待解析: {queue.qsize()}）")
+                    await emit_resolved()
+
+                    if (page_num + 1) % batch_size == 0:
+                        print(f"\n💾 达到批量保存条件（每{batch_size}页保存一次）")
+                        if save_progress():
+                            print(f"✅ 批量保存成功！已保存按顺序完成的 {completed_prefix(done_flags)} 条")
+                        else:
+                            print(f"❌ 批量保存失败！")
+
+                    if page_num < max_pages - 1:
+                        next_button = await main_page.query_selector('a.next')
+                        if not next_button:
+                            print("  ⚠️ 未找到下一页按钮，可能已到达最后一页")
+                            break
+                        if 'disabled' in (await next_button.get_attribute('class') or ''):
+                            print("  ⚠️ 下一页按钮已禁用，可能已到达最后一页")
+                            break
+                        await next_button.scroll_into_view_if_needed()
+                        await next_button.click()
+                        await main_page.wait_for_load_state("networkidle", timeout=8000)
+                        await main_page.wait_for_timeout(2000)
+
+                except Exception as e:
+                    print(f"❌ 处理第 {page_num + 1} 页时出错: {e}")
+                    break
+
+            # 等待队列中剩余的重定向全部解析完成
+            print(f"\n⏳ 翻页结束，等待解析池处理剩余 {queue.qsize()} 个URL...")
+            await queue.join()
+            await emit_resolved()
+            return all_urls
+
+        except Exception as e:
+            print(f"❌ 获取URL时出错: {e}")
+            await emit_resolved()
+            return all_urls
+        finally:
+            # 正常结束时队列已清空；异常退出时未完成的记录不会进入保存的前缀
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+            elapsed = time.monotonic() - started
+            print(f"⏱️ 本次新增 {new_count} 条，耗时 {elapsed:.1f}s，吞吐量 {new_count / elapsed if elapsed > 0 else 0:.2f} 条/秒")
+            if resolve_mode == "direct":
+                print_resolve_stats(resolve_stats)
+            if blocking_profile:
+                print_blocking_stats(blocking_stats)
+            if all_urls:
+                save_progress()
+            print(f"🔚 获取URL完成, 关闭浏览器")
+            await browser.close()
+
+
+# 使用示例
+if __name__ == "__main__":
+    target_url = "https://www.cqggzy.com/jyjg/transaction_detail.html"
+    output_filename = "jyjg_final_urls.json"
+    max_pages = 500
+    batch_size = 1
+
+    print("🚀 开始异步获取URLs并跟踪重定向...")
+    print(f"🎯 目标URL: {target_url}")
+    print("-" * 80)
+
+    timebegin = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    resolve_stats = new_resolve_stats()
+    urls = asyncio.run(get_all_popup_urls_with_redirect_async(
+        target_url=target_url,
+        max_pages=max_pages,
+        batch_size=batch_size,
+        output_filename=output_filename,
+        resume=True,
+        resolve_mode="click",
+        resolve_stats=resolve_stats,
+        pool_size=4,
+        blocking_profile=DISCOVERY_PROFILE,
+    ))
+
+    if urls:
+        print_summary(urls)
+        save_urls_to_json_batch(urls, output_filename, timebegin, is_final=True,
+                                extra_statistics=resolve_summary(resolve_stats, "click"))
+    else:
+        print("💥 没有获取到任何URL数据")
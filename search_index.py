@@ -0,0 +1,416 @@
+# 爬取结果全文索引：SQLite FTS5，中文按相邻两字（bigram）切分，英文和数字按词切分，
+# 每个批次保存后由 crawl_multiple_webpages_to_markdown 增量写入（同一URL重新爬取时覆盖），
+# 支持按相关度（标题权重更高）排序、摘要片段、按分类编号 / 发布日期 / 目录过滤
+# 用法:
+#   python search_index.py query <索引或输出目录> 关键词 [关键词 ...] [--category 014001] [--from 2025-05-01] [--to 2025-05-31] [--catalog jyjg_final_urls.json] [--limit 20]
+#   python search_index.py build <索引> <输出目录> [<输出目录> ...] [--catalog 名称]   # 为已有的爬取结果建立索引
+#   python search_index.py stats <索引或输出目录>
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+import zlib
+from urllib.parse import urlsplit
+
+from crawl_store import CrawlStore, STORE_FILENAME, document_filename
+
+SEARCH_INDEX_FILENAME = "search_index.sqlite"
+
+# 标题的 bm25 权重，正文为 1
+TITLE_WEIGHT = 5.0
+SNIPPET_CHARS = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    catalog TEXT,
+    output_dir TEXT,
+    file TEXT,
+    name TEXT,
+    title TEXT,
+    source TEXT,
+    category TEXT,
+    pub_date TEXT,
+    body BLOB
+);
+CREATE INDEX IF NOT EXISTS docs_category ON docs (category);
+CREATE INDEX IF NOT EXISTS docs_pub_date ON docs (pub_date);
+CREATE INDEX IF NOT EXISTS docs_catalog ON docs (catalog);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5 (title, body, content='', tokenize='unicode61');
+"""
+
+CJK_CHARS = "㐀-䶿一-鿿豈-﫿"
+TOKEN_RUN = re.compile(f"[{CJK_CHARS}]+|[0-9a-z]+")
+CJK_RUN = re.compile(f"[{CJK_CHARS}]+")
+DATE_SEGMENT = re.compile(r"^\d{8}$")
+# save_batch_results 对重复正文只写引用: > 正文与 [batch_001/001_x.md](../batch_001/001_x.md) 相同，不重复保存。
+DUPLICATE_REFERENCE = re.compile(r"^> 正文与 \[([^\]]+)\]")
+
+
+def search_index_filename(output_dir):
+    return os.path.join(output_dir, SEARCH_INDEX_FILENAME)
+
+
+def bigram_tokens(text):
+    """
+    把文本切分为索引用的词元：连续汉字取相邻两字，并在末尾补上最后一个字
+    （"招标公告" -> 招标 标公 公告 告），英文和数字整词保留并转为小写
+
+    Returns:
+        list: 词元列表，顺序与原文一致（连续的 bigram 在索引中位置相邻，可以按短语查询）
+    """
+    tokens = []
+    for run in TOKEN_RUN.findall((text or "").lower()):
+        if not CJK_RUN.match(run):
+            tokens.append(run)
+            continue
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        tokens.append(run[-1])
+    return tokens
+
+
+def tokenized_text(text):
+    return " ".join(bigram_tokens(text))
+
+
+def build_match_query(query):
+    """
+    把用户输入转换为 FTS5 查询：空格分隔的每个关键词都必须出现，
+    多字关键词按 bigram 短语匹配，单个汉字按前缀匹配
+
+    Returns:
+        str: MATCH 表达式，没有可检索的词元时返回 None
+    """
+    terms = []
+    for keyword in query.split():
+        for run in TOKEN_RUN.findall(keyword.lower()):
+            if CJK_RUN.match(run) and len(run) == 1:
+                terms.append(f'"{run}"*')
+            elif CJK_RUN.match(run):
+                terms.append('"' + " ".join(run[i:i + 2] for i in range(len(run) - 1)) + '"')
+            else:
+                terms.append(f'"{run}"')
+    return " AND ".join(terms) if terms else None
+
+
+def url_fields(url):
+    """
+    从最终URL中取出分类编号和发布日期，例如
+    /jyxx/004002/004002008/20250531/<infoid>.html -> ('004002008', '2025-05-31')
+
+    Returns:
+        tuple: (分类编号, 发布日期)，无法识别时为 None
+    """
+    category = pub_date = None
+    for segment in urlsplit(url or "").path.split('/'):
+        if DATE_SEGMENT.match(segment):
+            pub_date = f"{segment[:4]}-{segment[4:6]}-{segment[6:]}"
+        elif segment.isdigit() and len(segment) >= 6 and len(segment) % 3 == 0:
+            category = segment
+    return category, pub_date
+
+
+def highlight_snippet(body, keywords, width=SNIPPET_CHARS):
+    """
+    取正文中第一个关键词附近的片段，关键词用【】标出
+
+    Args:
+        body: 正文
+        keywords: 用户输入的关键词列表
+        width: 关键词前后各保留的字符数
+
+    Returns:
+        str: 单行摘要
+    """
+    text = re.sub(r"\s+", " ", body or "")
+    lowered = text.lower()
+    keywords = [keyword.lower() for keyword in keywords if keyword]
+    positions = [lowered.find(keyword) for keyword in keywords]
+    positions = [position for position in positions if position >= 0]
+    if not positions:
+        return text[:width * 2] + ("..." if len(text) > width * 2 else "")
+    start = max(0, min(positions) - width)
+    end = min(len(text), min(positions) + width)
+    snippet = text[start:end]
+    pattern = re.compile("|".join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)), re.IGNORECASE)
+    snippet = pattern.sub(lambda m: f"【{m.group(0)}】", snippet)
+    return ("..." if start else "") + snippet + ("..." if end < len(text) else "")
+
+
+class SearchIndex:
+    """
+    全文索引
+
+    docs 表保存每个URL的元数据和压缩后的正文（用于摘要），docs_fts 为无内容（contentless）FTS5 表，
+    只保存切分后的词元，rowid 与 docs.id 对应。
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        # 多个爬取进程可以写入同一个索引
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _remove(self, url):
+        # 无内容 FTS5 表删除时需要提供原来的词元
+        row = self.conn.execute("SELECT id, title, body FROM docs WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return
+        body = zlib.decompress(row['body']).decode('utf-8') if row['body'] else ""
+        self.conn.execute(
+            "INSERT INTO docs_fts (docs_fts, rowid, title, body) VALUES ('delete', ?, ?, ?)",
+            (row['id'], tokenized_text(row['title']), tokenized_text(body)),
+        )
+        self.conn.execute("DELETE FROM docs WHERE id = ?", (row['id'],))
+
+    def add_documents(self, results, catalog="", output_dir=""):
+        """
+        索引一批成功的爬取结果，已索引的URL先删除再写入
+
+        Args:
+            results: 爬取结果列表（需要 url 和 content，file 为保存后的相对路径）
+            catalog: 目录名称，用于按目录过滤
+            output_dir: 结果所在的输出目录
+
+        Returns:
+            int: 索引的文档数量
+        """
+        count = 0
+        with self.conn:
+            for result in results:
+                if not result.get('success') or not result.get('url'):
+                    continue
+                body = result.get('content') or ""
+                title = result.get('title') or result.get('name') or ""
+                category, pub_date = url_fields(result['url'])
+                self._remove(result['url'])
+                cursor = self.conn.execute(
+                    "INSERT INTO docs (url, catalog, output_dir, file, name, title, source, category, pub_date, body) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (result['url'], catalog, output_dir, result.get('file'), result.get('name'), title,
+                     result.get('source'), category, pub_date, zlib.compress(body.encode('utf-8'), 6)),
+                )
+                self.conn.execute(
+                    "INSERT INTO docs_fts (rowid, title, body) VALUES (?, ?, ?)",
+                    (cursor.lastrowid, tokenized_text(title), tokenized_text(body)),
+                )
+                count += 1
+        return count
+
+    def search(self, query, category=None, date_from=None, date_to=None, catalog=None, limit=20):
+        """
+        全文检索
+
+        Args:
+            query: 关键词，空格分隔，全部出现的文档才返回
+            category: 分类编号或其前缀（例如 014001 匹配 014001001）
+            date_from: 发布日期下限（含），格式 2025-05-01
+            date_to: 发布日期上限（含）
+            catalog: 目录名称
+            limit: 最多返回的条数
+
+        Returns:
+            list: 按相关度排序的结果字典（url, title, name, category, pub_date, catalog, output_dir, file, score, snippet）
+        """
+        match = build_match_query(query)
+        if match is None:
+            return []
+        sql = ("SELECT docs.*, bm25(docs_fts, ?, 1.0) AS score FROM docs_fts JOIN docs ON docs.id = docs_fts.rowid "
+               "WHERE docs_fts MATCH ?")
+        params = [TITLE_WEIGHT, match]
+        if category:
+            sql += " AND docs.category LIKE ?"
+            params.append(category + "%")
+        if date_from:
+            sql += " AND docs.pub_date >= ?"
+            params.append(date_from)
+        if date_to:
+            sql += " AND docs.pub_date <= ?"
+            params.append(date_to)
+        if catalog:
+            sql += " AND docs.catalog = ?"
+            params.append(catalog)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        keywords = query.split()
+        hits = []
+        for row in self.conn.execute(sql, params):
+            body = zlib.decompress(row['body']).decode('utf-8') if row['body'] else ""
+            hits.append({
+                "url": row['url'],
+                "title": row['title'],
+                "name": row['name'],
+                "category": row['category'],
+                "pub_date": row['pub_date'],
+                "catalog": row['catalog'],
+                "output_dir": row['output_dir'],
+                "file": row['file'],
+                # bm25 越小越相关，取反后越大越相关
+                "score": round(-row['score'], 3),
+                "snippet": highlight_snippet(body, keywords),
+            })
+        return hits
+
+    def stats(self):
+        """
+        各目录的文档数量和索引文件大小
+        """
+        catalogs = {row[0] or "": row[1] for row in self.conn.execute("SELECT catalog, COUNT(*) FROM docs GROUP BY catalog")}
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return {
+            "documents": sum(catalogs.values()),
+            "catalogs": catalogs,
+            "disk_bytes": os.path.getsize(self.db_path),
+        }
+
+
+def read_markdown_file(file_path):
+    """
+    读取 save_batch_results 写出的单页markdown，还原为爬取结果字典
+
+    Returns:
+        dict: 包含 name, url, title, content 的结果，正文只是引用（重复正文）时 content 为引用说明
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        text = f.read()
+    header, _, body = text.partition("\n---\n")
+    result = {"success": True, "content": body.strip()}
+    for line in header.splitlines():
+        line = line.rstrip()
+        if line.startswith("# ") and "name" not in result:
+            result["name"] = line[2:]
+        elif line.startswith("**URL**:"):
+            result["url"] = line[len("**URL**:"):].strip()
+        elif line.startswith("**页面标题**:"):
+            result["title"] = line[len("**页面标题**:"):].strip()
+        elif line.startswith("**来源**:"):
+            result["source"] = line[len("**来源**:"):].strip()
+    return result
+
+
+def iter_output_dir_results(output_dir):
+    """
+    逐个读取输出目录中已保存的结果（sqlite 存储或 batch_*/ 下的单页文件）
+    """
+    db_path = os.path.join(output_dir, STORE_FILENAME)
+    if os.path.exists(db_path):
+        store = CrawlStore(db_path)
+        try:
+            for row in store.iter_documents():
+                if not row['success']:
+                    continue
+                yield {
+                    "success": True,
+                    "url": row['url'],
+                    "name": row['name'],
+                    "title": row['title'],
+                    "source": row['source'],
+                    "file": document_filename(row['batch_num'], row['url_index'], row['name']),
+                    "content": store.get_content(row['content_hash']) if row['content_hash'] else "",
+                }
+        finally:
+            store.close()
+        return
+    for batch_dir in sorted(os.listdir(output_dir)):
+        batch_path = os.path.join(output_dir, batch_dir)
+        if not batch_dir.startswith("batch_") or not os.path.isdir(batch_path):
+            continue
+        for filename in sorted(os.listdir(batch_path)):
+            # 单页文件以全局序号开头，批次汇总等其他文件跳过
+            if filename.endswith(".md") and filename[:1].isdigit():
+                result = read_markdown_file(os.path.join(batch_path, filename))
+                result["file"] = f"{batch_dir}/{filename}"
+                reference = DUPLICATE_REFERENCE.match(result["content"])
+                if reference and os.path.exists(os.path.join(output_dir, reference.group(1))):
+                    # 重复正文按第一次保存的文件索引
+                    result["content"] = read_markdown_file(os.path.join(output_dir, reference.group(1)))["content"]
+                yield result
+
+
+def index_output_dir(index, output_dir, catalog="", chunk_size=500):
+    """
+    为已有的输出目录建立索引
+
+    Returns:
+        int: 索引的文档数量
+    """
+    count = 0
+    chunk = []
+    for result in iter_output_dir_results(output_dir):
+        chunk.append(result)
+        if len(chunk) >= chunk_size:
+            count += index.add_documents(chunk, catalog, output_dir)
+            chunk = []
+    if chunk:
+        count += index.add_documents(chunk, catalog, output_dir)
+    return count
+
+
+def print_hits(hits, elapsed_ms):
+    print(f"🔎 找到 {len(hits)} 条结果 ({elapsed_ms:.1f} ms)")
+    for i, hit in enumerate(hits, 1):
+        print(f"\n{i}. {hit['title'] or hit['name']}  [{hit['score']}]")
+        print(f"   📅 {hit['pub_date'] or '-'}  🏷️ {hit['category'] or '-'}  📚 {hit['catalog'] or '-'}")
+        print(f"   🔗 {hit['url']}")
+        if hit['file']:
+            print(f"   📄 {os.path.join(hit['output_dir'] or '', hit['file'])}")
+        print(f"   {hit['snippet']}")
+
+
+def open_index_path(path):
+    return search_index_filename(path) if os.path.isdir(path) else path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="爬取结果全文检索")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    query_parser = subparsers.add_parser("query", help="检索")
+    query_parser.add_argument("path", help="索引文件或输出目录")
+    query_parser.add_argument("keywords", nargs="+")
+    query_parser.add_argument("--category", help="分类编号或前缀")
+    query_parser.add_argument("--from", dest="date_from", help="发布日期下限，例如 2025-05-01")
+    query_parser.add_argument("--to", dest="date_to", help="发布日期上限")
+    query_parser.add_argument("--catalog", help="目录名称")
+    query_parser.add_argument("--limit", type=int, default=20)
+    build_parser = subparsers.add_parser("build", help="为已有的输出目录建立索引")
+    build_parser.add_argument("path", help="索引文件")
+    build_parser.add_argument("output_dirs", nargs="+")
+    build_parser.add_argument("--catalog", default="", help="目录名称")
+    stats_parser = subparsers.add_parser("stats", help="索引统计")
+    stats_parser.add_argument("path", help="索引文件或输出目录")
+    args = parser.parse_args()
+
+    db_path = open_index_path(args.path)
+    if args.command != "build" and not os.path.exists(db_path):
+        print(f"❌ 没有找到索引文件: {db_path}")
+        sys.exit(1)
+
+    index = SearchIndex(db_path)
+    try:
+        if args.command == "query":
+            started = time.perf_counter()
+            hits = index.search(" ".join(args.keywords), category=args.category, date_from=args.date_from,
+                                date_to=args.date_to, catalog=args.catalog, limit=args.limit)
+            print_hits(hits, (time.perf_counter() - started) * 1000)
+        elif args.command == "build":
+            for output_dir in args.output_dirs:
+                started = time.perf_counter()
+                count = index_output_dir(index, output_dir, args.catalog)
+                print(f"✅ {output_dir}: 索引 {count} 个页面 ({time.perf_counter() - started:.1f} 秒)")
+        elif args.command == "stats":
+            stats = index.stats()
+            print(f"📚 文档数: {stats['documents']}，索引大小: {stats['disk_bytes'] / 1024 / 1024:.2f} MB")
+            for catalog, count in sorted(stats['catalogs'].items()):
+                print(f"   {catalog or '(未命名)'}: {count}")
+    finally:
+        index.close()
@@ -0,0 +1,183 @@
+# 多进程分片获取URL：把页码范围拆分给多个进程，每个进程启动自己的Chromium，
+# 直接跳到起始页并写入各自的分片文件，最后按 infoid 去重合并为一个目录文件
+import multiprocessing
+import os
+from datetime import datetime
+
+from safe_get_url import (
+    get_all_popup_urls_with_redirect,
+    infoid_from_url,
+    new_resolve_stats,
+    save_urls_to_json_batch,
+)
+from url_catalog import iter_catalog, meta_filename
+
+
+def split_page_range(max_pages, shard_count):
+    """
+    把 [0, max_pages) 拆分成 shard_count 个尽量均匀的连续区间
+
+    Returns:
+        list: [(start_page, end_page), ...]，end_page 不包含
+    """
+    shard_count = max(1, min(shard_count, max_pages))
+    base, extra = divmod(max_pages, shard_count)
+    ranges = []
+    start = 0
+    for shard_index in range(shard_count):
+        size = base + (1 if shard_index < extra else 0)
+        ranges.append((start, start + size))
+        start += size
+    return ranges
+
+
+def shard_filename(output_filename, shard_index):
+    """
+    分片文件名，例如 jyjg_final_urls.json -> jyjg_final_urls.shard03.json
+    """
+    root, ext = os.path.splitext(output_filename)
+    return f"{root}.shard{shard_index:02d}{ext}"
+
+
+def run_shard(shard_args):
+    """
+    单个分片的工作进程入口
+
+    Args:
+        shard_args: (shard_index, target_url, start_page, end_page, output_filename, resolve_mode, batch_size)
+
+    Returns:
+        tuple: (shard_index, 分片文件名, 记录数)
+    """
+    shard_index, target_url, start_page, end_page, output_filename, resolve_mode, batch_size = shard_args
+    partial_filename = shard_filename(output_filename, shard_index)
+    timebegin = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"🧩 分片 {shard_index}: 第 {start_page + 1} - {end_page} 页 -> {partial_filename}")
+
+    resolve_stats = new_resolve_stats()
+    urls = get_all_popup_urls_with_redirect(
+        target_url=target_url,
+        max_pages=end_page,
+        batch_size=batch_size,
+        output_filename=partial_filename,
+        resume=False,
+        resolve_mode=resolve_mode,
+        resolve_stats=resolve_stats,
+        start_page=start_page,
+        headless=True,
+    )
+    save_urls_to_json_batch(urls, partial_filename, timebegin, is_final=True)
+    return shard_index, partial_filename, len(urls)
+
+
+def merge_shard_results(partial_filenames, output_filename, timebegin=None):
+    """
+    按分片顺序合并分片文件，并按 infoid 去重
+
+    没有 infoid 的记录（例如获取失败的记录）原样保留。
+
+    Args:
+        partial_filenames: 分片文件列表（按页码顺序）
+        output_filename: 合并后的输出文件
+        timebegin: 开始时间
+
+    Returns:
+        list: 合并后的URL列表
+    """
+    merged = []
+    seen_infoids = set()
+    duplicates = 0
+
+    for partial_filename in partial_filenames:
+        # 分片文件与输出文件格式相同（JSON或JSONL），逐条读取
+        try:
+            for url_info in iter_catalog(partial_filename):
+                infoid = infoid_from_url(url_info.get('final_url'))
+                if infoid:
+                    if infoid in seen_infoids:
+                        duplicates += 1
+                        continue
+                    seen_infoids.add(infoid)
+                merged.append(url_info)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 读取分片文件失败: {partial_filename} - {e}")
+
+    print(f"🔗 合并 {len(partial_filenames)} 个分片: {len(merged)} 条，去除重复 {duplicates} 条")
+    save_urls_to_json_batch(merged, output_filename, timebegin, is_final=True,
+                            extra_statistics={"shards": len(partial_filenames), "duplicates_removed": duplicates})
+    return merged
+
+
+def get_all_urls_sharded(target_url, max_pages, shard_count=4, output_filename="jyxx_final_urls.json",
+                         resolve_mode="direct", batch_size=1, keep_partials=False):
+    """
+    多进程分片获取所有URL
+
+    Args:
+        target_url: 目标网页URL
+        max_pages: 最大处理页数
+        shard_count: 分片（进程）数量
+        output_filename: 合并后的输出文件名
+        resolve_mode: URL解析方式，见 get_all_popup_urls_with_redirect
+        batch_size: 每个分片每处理多少页保存一次
+        keep_partials: 合并后是否保留分片文件（出错分片的文件总是保留）
+
+    Returns:
+        list: 合并后的URL列表
+    """
+    timebegin = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    page_ranges = split_page_range(max_pages, shard_count)
+    shard_args = [
+        (shard_index, target_url, start_page, end_page, output_filename, resolve_mode, batch_size)
+        for shard_index, (start_page, end_page) in enumerate(page_ranges)
+    ]
+
+    print(f"🚀 使用 {len(page_ranges)} 个进程分片处理 {max_pages} 页")
+    # 使用 spawn 启动，避免子进程继承父进程的浏览器状态；
+    # 每个分片单独取结果，一个分片出错时其他分片的结果照常合并
+    shard_results = []
+    with multiprocessing.get_context("spawn").Pool(processes=len(page_ranges)) as pool:
+        pending = [(args[0], pool.apply_async(run_shard, (args,))) for args in shard_args]
+        for shard_index, async_result in pending:
+            try:
+                shard_results.append(async_result.get())
+            except Exception as e:
+                print(f"❌ 分片 {shard_index} 出错: {e}")
+                shard_results.append((shard_index, shard_filename(output_filename, shard_index), None))
+
+    partial_filenames = []
+    for shard_index, partial_filename, count in shard_results:
+        if count is not None:
+            print(f"  ✅ 分片 {shard_index}: {count} 条 ({partial_filename})")
+        elif os.path.exists(partial_filename):
+            print(f"  ⚠️ 分片 {shard_index} 未完成，合并已保存的部分 ({partial_filename})")
+        else:
+            print(f"  ❌ 分片 {shard_index} 没有保存任何记录")
+            continue
+        partial_filenames.append(partial_filename)
+
+    merged = merge_shard_results(partial_filenames, output_filename, timebegin)
+
+    # 未完成分片的文件保留，便于检查和补抓
+    if not keep_partials:
+        for shard_index, partial_filename, count in shard_results:
+            if count is None:
+                continue
+            for filename in (partial_filename, meta_filename(partial_filename)):
+                try:
+                    os.remove(filename)
+                except OSError:
+                    pass
+
+    return merged
+
+
+# 使用示例
+if __name__ == "__main__":
+    urls = get_all_urls_sharded(
+        target_url="https://www.cqggzy.com/jyjg/transaction_detail.html",
+        max_pages=500,
+        shard_count=16,
+        output_filename="jyjg_final_urls.json",
+    )
+    print(f"🏁 共获取 {len(urls)} 条URL")
@@ -0,0 +1,111 @@
+# URL级别爬取状态测试：中断后目录在开头插入新公告，续传时按位置核对URL
+# 用法: python -m pytest test_crawl_state.py
+import asyncio
+import collections
+import glob
+import json
+import os
+
+import pytest
+
+from crawl_state import CrawlState, state_filename
+
+
+def catalog(numbers):
+    return [{'source': f's{i}', 'name': f'n{i}', 'final_url': f'https://h.x/a/20250101/{i}.html'} for i in numbers]
+
+
+def finish(state, url_index, item):
+    state.mark_in_flight(url_index)
+    state.mark_finished(url_index, {'success': True, 'url': item['final_url'], 'content': f"# {item['name']}"})
+
+
+def test_register_resets_positions_whose_url_changed(tmp_path):
+    state = CrawlState(str(tmp_path / "state.sqlite"))
+    try:
+        old = catalog(range(1, 6))
+        assert state.register(old) == 5
+        for i, item in enumerate(old[:3]):
+            finish(state, i + 1, item)
+        state.mark_saved(1, 2)
+
+        # 同一目录再次登记不改变状态
+        assert state.register(old) == 0
+        assert state.first_unsaved_index() == 3
+
+        # 开头插入一条新公告：每个位置上的URL都变了，全部重新抓取
+        new = catalog(range(0, 6))
+        assert state.register(new) == 6
+        assert state.registered_count() == 6
+        assert state.first_unsaved_index() == 1
+        assert state.saved_results() == []
+        assert state.finished_results(1, 6) == {}
+        assert state.counts()['pending'] == 6
+    finally:
+        state.close()
+
+
+def test_finished_results_carry_registered_url(tmp_path):
+    state = CrawlState(str(tmp_path / "state.sqlite"))
+    try:
+        items = catalog(range(1, 4))
+        state.register(items)
+        finish(state, 2, items[1])
+        finished = state.finished_results(1, 3)
+        assert list(finished) == [2]
+        url, result = finished[2]
+        assert url == items[1]['final_url']
+        assert result['resumed'] is True
+
+        # 目录变短时删除多余的位置
+        state.truncate(2)
+        assert state.registered_count() == 2
+    finally:
+        state.close()
+
+
+class Crash(BaseException):
+    pass
+
+
+def test_resume_after_catalog_prepend(tmp_path, monkeypatch):
+    pytest.importorskip("crawl4ai")
+    import safe_get_content
+
+    calls = collections.Counter()
+    crash_url = 'https://h.x/a/20250101/5.html'
+
+    async def fake_fetch(url, source_info="", **kwargs):
+        calls[url] += 1
+        if url == crash_url and calls[url] == 1:
+            # 第二个批次进行中进程崩溃
+            raise Crash()
+        return {'success': True, 'source': source_info, 'url': url, 'title': url,
+                'content': f"# {url}\n\n正文 {url}", 'content_length': 20, 'fetch_method': 'browser'}
+
+    monkeypatch.setattr(safe_get_content, "crawl_single_webpage_to_markdown", fake_fetch)
+    output_dir = str(tmp_path / "out")
+    options = dict(batch_size=3, concurrency=1, min_request_interval=0, http_first=False,
+                   strategy_file=str(tmp_path / "fetch_strategy.json"), cache_dir=None, cpu_workers=0,
+                   output_dir=output_dir)
+
+    with pytest.raises(Crash):
+        asyncio.run(safe_get_content.crawl_multiple_webpages_to_markdown(catalog(range(1, 7)), **options))
+
+    # 每日增量更新在目录开头加入一条新公告后续传
+    asyncio.run(safe_get_content.crawl_multiple_webpages_to_markdown(catalog(range(0, 7)), **options))
+
+    assert calls['https://h.x/a/20250101/0.html'] == 1
+    state = CrawlState(state_filename(output_dir))
+    try:
+        assert state.first_unsaved_index() is None
+        urls = [result['url'] for result in state.saved_results()]
+    finally:
+        state.close()
+    assert urls == [item['final_url'] for item in catalog(range(0, 7))]
+
+    # 结果文件中每个位置对应目录中同一位置的URL，没有重复
+    with open(os.path.join(output_dir, "progress_log.json"), encoding="utf-8") as f:
+        assert json.load(f)['processed_count'] == 7
+    pages = sorted(os.path.basename(path) for path in glob.glob(os.path.join(output_dir, "batch_*", "0*.md")))
+    assert pages == [f"{i + 1:03d}_n{i}.md" for i in range(7)]
@@ -0,0 +1,45 @@
+# 结构化字段测试：金额和日期的批量规范化，字段表按序号和URL覆盖
+# 用法: python -m pytest test_field_extraction.py
+import math
+
+import pandas as pd
+
+from field_extraction import fields_filename, fields_frame, load_fields, normalize_dates, normalize_money, save_fields
+
+
+def test_normalize_money():
+    values = normalize_money(pd.Series(["123.45万元", "¥1,234,567.00元", "壹佰万元整（小写：1000000元）",
+                                        "下浮率 5%", None, "123.45万元"]))
+    assert values.tolist()[:3] == [1234500.0, 1234567.0, 1000000.0]
+    assert math.isnan(values[3]) and math.isnan(values[4])
+    assert values[5] == 1234500.0
+
+
+def test_normalize_dates():
+    texts = pd.Series(["2025年6月3日 9:30", "2025-06-03至2025-06-06", "无"])
+    assert normalize_dates(texts).dt.strftime("%Y-%m-%d").tolist()[:2] == ["2025-06-03", "2025-06-03"]
+    assert normalize_dates(texts, last=True)[1] == pd.Timestamp("2025-06-06")
+    assert pd.isna(normalize_dates(texts)[2])
+
+
+def page(number, budget="10万元"):
+    return {'success': True, 'url': f'https://www.cqggzy.com/jyxx/004005/20250603/{number}.html', 'title': f't{number}',
+            'fields': {'project_name': f'p{number}', 'budget': budget, 'notice_period': '2025年6月3日至2025年6月6日'}}
+
+
+def test_save_fields_replaces_moved_urls(tmp_path):
+    frame = fields_frame([page(1), {'success': False}, page(2)], start_index=0)
+    assert frame["url_index"].tolist() == [1, 3]
+    assert frame["budget"].tolist() == [100000.0, 100000.0]
+    # 没有发布日期字段时取URL中的日期
+    assert frame["publish_date"].dt.strftime("%Y-%m-%d").tolist() == ["2025-06-03", "2025-06-03"]
+    assert save_fields(frame, fields_filename(str(tmp_path))) == 2
+
+    # 目录开头插入新公告后同一批页面整体后移一位重新保存
+    save_fields(fields_frame([page(0), page(1), {'success': False}, page(2, budget="20万元")], start_index=0),
+                fields_filename(str(tmp_path)))
+    stored = load_fields(str(tmp_path))
+    assert stored["url_index"].tolist() == [1, 2, 4]
+    assert stored["project_name"].tolist() == ["p0", "p1", "p2"]
+    assert stored["budget"].tolist() == [100000.0, 100000.0, 200000.0]
+    assert stored["notice_end"][0] == pd.Timestamp("2025-06-06")
@@ -0,0 +1,63 @@
+# 列表接口测试：接口请求失败时不能用空列表覆盖已有目录
+# 用法: python -m pytest test_list_api.py
+import json
+
+import pytest
+
+pytest.importorskip("playwright")
+
+import list_api
+
+TARGET_URL = "https://www.cqggzy.com/jyxx/transaction_detail.html"
+
+
+def existing_catalog(tmp_path):
+    filename = str(tmp_path / "catalog.json")
+    urls = [{'source': '第 1 页第 1 个元素', 'name': 'n1', 'final_url': 'https://www.cqggzy.com/jyxx/1.html'}]
+    list_api.save_urls_to_json_batch(urls, filename, is_final=True)
+    return filename
+
+
+def load_urls(filename):
+    with open(filename, encoding='utf-8') as f:
+        return json.load(f)['urls']
+
+
+def failing_fetch(client, template, page_num, category=None, page_size=None):
+    raise RuntimeError("HTTP 403")
+
+
+def test_stale_template_falls_back_to_dom(tmp_path, monkeypatch):
+    filename = existing_catalog(tmp_path)
+    template_file = str(tmp_path / "template.json")
+    with open(template_file, "w", encoding="utf-8") as f:
+        json.dump({"records_path": ["data"]}, f)
+    captures = []
+    dom_calls = []
+
+    def fake_capture(target_url, headless=True):
+        captures.append(target_url)
+        return None, []
+
+    def fake_dom(**kwargs):
+        dom_calls.append(kwargs)
+        return []
+
+    monkeypatch.setattr(list_api, "fetch_list_page", failing_fetch)
+    monkeypatch.setattr(list_api, "capture_list_api_template", fake_capture)
+    monkeypatch.setattr(list_api, "get_all_popup_urls_with_redirect", fake_dom)
+
+    assert list_api.get_all_urls_via_list_api(TARGET_URL, 5, output_filename=filename, template_file=template_file) == []
+    # 加载的模板失败后重新捕获一次，仍然失败时改用浏览器翻页；都没有结果时已有目录保持不变
+    assert len(captures) == 1
+    assert len(dom_calls) == 1
+    assert load_urls(filename)[0]['name'] == 'n1'
+
+
+def test_dom_fallback_refused_for_category(tmp_path, monkeypatch):
+    filename = existing_catalog(tmp_path)
+    monkeypatch.setattr(list_api, "capture_list_api_template", lambda target_url, headless=True: (None, []))
+    monkeypatch.setattr(list_api, "get_all_popup_urls_with_redirect", lambda **kwargs: pytest.fail("不应改用浏览器翻页"))
+
+    assert list_api.get_all_urls_via_list_api(TARGET_URL, 5, category="014001", output_filename=filename) == []
+    assert load_urls(filename)[0]['name'] == 'n1'
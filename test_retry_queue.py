@@ -0,0 +1,59 @@
+# 重试队列测试：批次仍在抓取时，本批次中失败的URL到期重试
+# 用法: python -m pytest test_retry_queue.py
+import asyncio
+import collections
+
+import pytest
+
+pytest.importorskip("crawl4ai")
+
+import retry_queue
+import safe_get_content
+from crawl_state import CrawlState, state_filename
+
+
+def test_retry_due_while_batch_running(tmp_path, monkeypatch):
+    monkeypatch.setitem(retry_queue.RETRY_POLICY, retry_queue.NETWORK, {"max_attempts": 4, "base_delay": 0.01, "max_delay": 0.01})
+    calls = collections.Counter()
+
+    async def fake_fetch(url, source_info="", **kwargs):
+        calls[url] += 1
+        if url.endswith("/1.html") and calls[url] == 1:
+            # 第一次尝试立即失败；其余URL抓取时间超过重试队列的检查间隔，重试在批次完成前到期
+            return {'success': False, 'source': source_info, 'url': url, 'error': 'net::ERR_CONNECTION_RESET'}
+        await asyncio.sleep(1.5)
+        return {'success': True, 'source': source_info, 'url': url, 'title': url,
+                'content': f"# {url}\n\n正文 {url}", 'content_length': 20, 'fetch_method': 'browser'}
+
+    monkeypatch.setattr(safe_get_content, "crawl_single_webpage_to_markdown", fake_fetch)
+    urls = [{'source': f's{i}', 'name': f'n{i}', 'final_url': f'https://h.x/a/20250101/{i}.html'} for i in range(5)]
+    output_dir = str(tmp_path / "out")
+
+    summary = asyncio.run(safe_get_content.crawl_multiple_webpages_to_markdown(
+        urls, batch_size=5, concurrency=5, min_request_interval=0, http_first=False,
+        strategy_file=str(tmp_path / "fetch_strategy.json"), cache_dir=None, cpu_workers=0, output_dir=output_dir
+    ))
+
+    assert summary['successful'] == 5 and summary['failed'] == 0
+    assert calls['https://h.x/a/20250101/1.html'] == 2
+    state = CrawlState(state_filename(output_dir))
+    try:
+        assert state.first_unsaved_index() is None
+        results = state.saved_results()
+    finally:
+        state.close()
+    assert [result['success'] for result in results] == [True] * 5
+    assert results[1]['attempts'] == 2
+
+
+def test_serve_retries_raises_task_errors(monkeypatch):
+    monkeypatch.setitem(retry_queue.RETRY_POLICY, retry_queue.NETWORK, {"max_attempts": 4, "base_delay": 0.0, "max_delay": 0.0})
+    queue = retry_queue.RetryQueue()
+    assert queue.schedule(1, {'final_url': 'https://h.x/1.html'}, 1, 1,
+                          {'success': False, 'url': 'https://h.x/1.html', 'error': 'net::ERR_CONNECTION_RESET'})
+
+    async def retry_entry(entry):
+        raise RuntimeError("重试出错")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(retry_queue.serve_retries(queue, retry_entry))
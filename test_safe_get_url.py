@@ -0,0 +1,73 @@
+# 目录编号测试：每页条数推断、按位置重新编号，以及增量更新插入新公告后的编号
+# 用法: python -m pytest test_safe_get_url.py
+import json
+import os
+
+import pytest
+
+pytest.importorskip("playwright")
+
+import safe_get_url
+from safe_get_url import observed_page_size, renumber_sources
+
+
+def rows(page_size, count, start_id=1000, first_page=1):
+    return [{'source': f'第 {first_page + i // page_size} 页第 {i % page_size + 1} 个元素', 'name': f'n{start_id + i}',
+             'final_url': f'https://www.cqggzy.com/jyxx/004005/004005001/20250601/{start_id + i}.html'}
+            for i in range(count)]
+
+
+def test_observed_page_size_ignores_short_last_page():
+    assert observed_page_size(rows(15, 40)) == 15
+    assert observed_page_size(rows(15, 7)) == 7
+    assert observed_page_size([{'source': '未知'}]) is None
+
+
+def test_renumber_sources():
+    urls = renumber_sources(rows(15, 40), 15)
+    assert urls[14]['source'] == '第 1 页第 15 个元素'
+    assert urls[15]['source'] == '第 2 页第 1 个元素'
+    # 没有指定时按 source 推断
+    assert renumber_sources(rows(15, 16))[15]['source'] == '第 2 页第 1 个元素'
+    assert renumber_sources([{'source': ''}] * 21)[20]['source'] == '第 2 页第 1 个元素'
+
+
+def test_refresh_keeps_catalog_page_size(tmp_path, monkeypatch):
+    catalog_filename = str(tmp_path / "catalog.json")
+    safe_get_url.save_urls_to_json_batch(rows(15, 60), catalog_filename, is_final=True)
+    new_urls = rows(15, 5, start_id=2000)
+
+    def fake_discovery(**kwargs):
+        assert kwargs['output_filename'] == str(tmp_path / "catalog.delta.json")
+        assert kwargs['resume'] is True
+        return [dict(url_info) for url_info in new_urls]
+
+    monkeypatch.setattr(safe_get_url, "get_all_popup_urls_with_redirect", fake_discovery)
+    added = safe_get_url.refresh_catalog_incremental("https://www.cqggzy.com/jyxx/transaction_detail.html", catalog_filename)
+    assert len(added) == 5
+
+    with open(catalog_filename, encoding='utf-8') as f:
+        merged = json.load(f)['urls']
+    assert len(merged) == 65
+    # 5 条新公告不改变每页15条的编号
+    assert merged[4]['source'] == '第 1 页第 5 个元素'
+    assert merged[15]['source'] == '第 2 页第 1 个元素'
+    assert merged[64]['source'] == '第 5 页第 5 个元素'
+
+    # 合并后、删除增量文件前中断：再次运行时续传的增量记录已在目录中，不重复插入
+    added = safe_get_url.refresh_catalog_incremental("https://www.cqggzy.com/jyxx/transaction_detail.html", catalog_filename)
+    assert added == []
+    assert not os.path.exists(str(tmp_path / "catalog.delta.json"))
+
+
+class NoPagerPage:
+    def query_selector(self, selector):
+        return None
+
+
+def test_seek_without_pager_input_warns(capsys):
+    assert safe_get_url.seek_to_page(NoPagerPage(), 12) is False
+    safe_get_url.warn_click_fallback(11)
+    output = capsys.readouterr().out
+    assert "未找到分页器的页码输入框" in output
+    assert "需要点击 11 次" in output
@@ -0,0 +1,47 @@
+# 全文索引测试：bigram 切分、查询表达式、按分类和日期过滤、同一URL重新索引时覆盖
+# 用法: python -m pytest test_search_index.py
+from search_index import SearchIndex, bigram_tokens, build_match_query, url_fields
+
+URL = "https://www.cqggzy.com/jyxx/004002/004002008/20250531/abc.html"
+
+
+def test_bigram_tokens():
+    assert bigram_tokens("招标公告 WLQ25A") == ["招标", "标公", "公告", "告", "wlq25a"]
+    assert bigram_tokens(None) == []
+
+
+def test_build_match_query():
+    assert build_match_query("招标公告") == '"招标 标公 公告"'
+    assert build_match_query("水 WLQ") == '"水"* AND "wlq"'
+    assert build_match_query("， ！") is None
+
+
+def test_url_fields():
+    assert url_fields(URL) == ("004002008", "2025-05-31")
+    assert url_fields("") == (None, None)
+
+
+def test_search_filters_and_reindex(tmp_path):
+    index = SearchIndex(str(tmp_path / "search_index.sqlite"))
+    try:
+        results = [
+            {'success': True, 'url': URL, 'title': '水源工程招标公告', 'content': '重庆市三峡库区水源工程'},
+            {'success': True, 'url': URL.replace('004002008', '014001001').replace('abc', 'def'),
+             'title': '厨房设备询价公告', 'content': '厨房及生活设施设备'},
+            {'success': False, 'url': 'https://www.cqggzy.com/x.html', 'error': '超时'},
+        ]
+        assert index.add_documents(results, catalog="jyjg_final_urls.json") == 2
+
+        hits = index.search("招标公告")
+        assert [hit['url'] for hit in hits] == [URL]
+        assert index.search("公告", category="014001")[0]['title'] == '厨房设备询价公告'
+        assert index.search("公告", date_from="2025-06-01") == []
+        assert len(index.search("公告", catalog="jyjg_final_urls.json")) == 2
+
+        # 同一URL重新爬取后覆盖旧的正文
+        index.add_documents([{'success': True, 'url': URL, 'title': '水源工程变更公告', 'content': '变更内容'}])
+        assert index.search("招标") == []
+        assert index.search("变更")[0]['url'] == URL
+        assert index.stats()['documents'] == 2
+    finally:
+        index.close()
@@ -0,0 +1,40 @@
+# 分片测试：页码区间拆分，合并分片时按 infoid 去重、读取失败的分片不影响其他分片
+# 用法: python -m pytest test_shard_get_url.py
+import json
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from safe_get_url import save_urls_to_json_batch
+from shard_get_url import merge_shard_results, shard_filename, split_page_range
+
+
+def test_split_page_range():
+    assert split_page_range(10, 3) == [(0, 4), (4, 7), (7, 10)]
+    assert split_page_range(2, 4) == [(0, 1), (1, 2)]
+
+
+def test_shard_filename():
+    assert shard_filename("jyjg_final_urls.json", 3) == "jyjg_final_urls.shard03.json"
+
+
+def row(infoid):
+    return {'source': '', 'name': infoid, 'final_url': f'https://www.cqggzy.com/jyxx/004005/20250601/{infoid}.html'}
+
+
+@pytest.mark.parametrize("ext", [".json", ".jsonl"])
+def test_merge_dedups_by_infoid(tmp_path, ext):
+    output_filename = str(tmp_path / f"urls{ext}")
+    failed = {'source': '', 'name': 'x', 'final_url': '获取失败'}
+    shards = [[row('a'), row('b'), failed], [row('b'), row('c'), failed]]
+    partial_filenames = [shard_filename(output_filename, i) for i in range(len(shards) + 1)]
+    for partial_filename, urls in zip(partial_filenames, shards):
+        save_urls_to_json_batch(urls, partial_filename, is_final=True)
+
+    # 最后一个分片文件不存在（分片进程失败）
+    merged = merge_shard_results(partial_filenames, output_filename)
+    assert [url_info['name'] for url_info in merged] == ['a', 'b', 'x', 'c', 'x']
+    if ext == ".json":
+        with open(output_filename, encoding='utf-8') as f:
+            assert json.load(f)['statistics']['duplicates_removed'] == 1
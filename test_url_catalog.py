@@ -0,0 +1,60 @@
+# JSONL目录测试：追加写入、崩溃后修复半行、流式读取两种格式
+# 用法: python -m pytest test_url_catalog.py
+import json
+
+from url_catalog import (
+    CatalogWriter,
+    compact_catalog,
+    iter_catalog,
+    iter_json_catalog_records,
+    load_catalog_meta,
+    read_tail_records,
+)
+
+
+def records(count, start=0):
+    return [{'source': f'第 {1 + i // 20} 页第 {i % 20 + 1} 个元素', 'name': f'n{i}',
+             'final_url': f'https://h.x/{i}.html' if i % 7 else '获取失败'} for i in range(start, start + count)]
+
+
+def test_writer_appends_only_new_records(tmp_path):
+    filename = str(tmp_path / "c.jsonl")
+    urls = records(30)
+    writer = CatalogWriter(filename, truncate=True)
+    writer.save(urls[:10])
+    writer.save(urls)
+
+    assert list(iter_catalog(filename)) == urls
+    assert list(iter_catalog(filename, skip=25)) == urls[25:]
+    meta = load_catalog_meta(filename)
+    assert meta['record_count'] == 30
+    assert meta['success_count'] == sum(1 for url in urls if url['final_url'] != '获取失败')
+    assert read_tail_records(filename)[-1] == urls[-1]
+
+
+def test_writer_repairs_half_written_line(tmp_path):
+    filename = str(tmp_path / "c.jsonl")
+    urls = records(5)
+    CatalogWriter(filename, truncate=True).save(urls)
+    # 最后一条只写入一半时崩溃，元数据还停留在上一次保存
+    with open(filename, 'ab') as f:
+        f.write(json.dumps(records(1, start=5)[0], ensure_ascii=False).encode('utf-8')[:15])
+
+    writer = CatalogWriter(filename)
+    assert writer.record_count == 5
+    assert list(iter_catalog(filename)) == urls
+
+
+def test_json_catalog_streaming_and_compact(tmp_path):
+    filename = str(tmp_path / "c.jsonl")
+    urls = records(45)
+    CatalogWriter(filename, truncate=True).save(urls, is_final=True)
+
+    json_filename = compact_catalog(filename)
+    with open(json_filename, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['urls'] == urls
+    assert data['metadata']['is_complete'] is True
+    # 小块读取时JSON值跨越缓冲区边界
+    assert list(iter_json_catalog_records(json_filename, chunk_size=7)) == urls
+    assert list(iter_catalog(json_filename, skip=40)) == urls[40:]
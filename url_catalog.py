@@ -0,0 +1,400 @@
+# 追加写入的JSONL目录格式：每行一条 {source, name, final_url} 记录，
+# 元数据和统计信息保存在旁边的 <文件名>.meta.json 中，
+# 可通过 compact_catalog 生成下游工具使用的旧版 {metadata, statistics, urls} JSON；
+# iter_catalog 可逐条读取两种格式的目录，内存占用不随目录增长
+import itertools
+import json
+import os
+from datetime import datetime
+
+# 从文件末尾读取的字节数，足够覆盖最后一页的记录
+TAIL_READ_BYTES = 64 * 1024
+
+# 流式读取旧版JSON目录时每次读取的字符数
+STREAM_CHUNK_CHARS = 64 * 1024
+
+# 已打开的目录写入器，按文件绝对路径索引
+_CATALOG_WRITERS = {}
+
+
+def is_jsonl_catalog(filename):
+    return filename.endswith('.jsonl')
+
+
+def meta_filename(filename):
+    return f"{filename}.meta.json"
+
+
+def is_success_record(record):
+    return record.get('final_url') != '获取失败'
+
+
+def load_catalog_meta(filename):
+    """
+    读取目录的元数据文件，不存在或损坏时返回 None
+    """
+    try:
+        with open(meta_filename(filename), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json_atomic(filename, data):
+    """
+    先写临时文件再替换，避免写到一半崩溃导致文件被截断
+    """
+    temp_filename = f"{filename}.tmp"
+    with open(temp_filename, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_filename, filename)
+
+
+def repair_tail(filename):
+    """
+    截掉文件末尾不完整的一行（写入过程中崩溃留下的半行）
+
+    Returns:
+        int: 修复后的文件大小
+    """
+    size = os.path.getsize(filename)
+    if size == 0:
+        return 0
+    with open(filename, 'rb+') as f:
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            return size
+        start = max(0, size - TAIL_READ_BYTES)
+        while True:
+            f.seek(start)
+            chunk = f.read(size - start)
+            newline_index = chunk.rfind(b'\n')
+            if newline_index >= 0:
+                new_size = start + newline_index + 1
+                break
+            if start == 0:
+                new_size = 0
+                break
+            start = max(0, start - TAIL_READ_BYTES)
+        f.truncate(new_size)
+    print(f"🩹 已截掉 {filename} 末尾不完整的记录 ({size - new_size} 字节)")
+    return new_size
+
+
+def iter_records_from(filename, offset=0):
+    """
+    从指定字节偏移开始逐行读取记录
+    """
+    with open(filename, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line.decode('utf-8'))
+
+
+class JsonStreamReader:
+    """
+    从文件中逐个解码JSON值，内存中只保留尚未解码的一段缓冲区
+    """
+
+    def __init__(self, f, chunk_size=STREAM_CHUNK_CHARS):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def read_more(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+        跳过空白，返回下一个字符，文件结束时返回空字符串
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read_more():
+                return ''
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON格式错误: 应为 {char!r}，实际为 {found!r}")
+        self.pos += 1
+
+    def skip(self, char):
+        """
+        下一个字符是 char 时跳过并返回 True
+        """
+        if self.peek() == char:
+            self.pos += 1
+            return True
+        return False
+
+    def value(self):
+        """
+        解码下一个完整的JSON值，缓冲区不足时继续读取
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.read_more():
+                    continue
+                raise
+            # 数字等值可能正好在缓冲区末尾被截断
+            if end == len(self.buffer) and not self.eof and self.read_more():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_catalog_records(filename, chunk_size=STREAM_CHUNK_CHARS):
+    """
+    逐条读取旧版JSON目录 ({metadata, statistics, urls}) 中 urls 列表的记录，其他字段解码后丢弃
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        reader = JsonStreamReader(f, chunk_size)
+        reader.expect('{')
+        if reader.skip('}'):
+            return
+        while True:
+            key = reader.value()
+            reader.expect(':')
+            if key == 'urls':
+                reader.expect('[')
+                if not reader.skip(']'):
+                    while True:
+                        yield reader.value()
+                        if not reader.skip(','):
+                            reader.expect(']')
+                            break
+            else:
+                reader.value()
+            if not reader.skip(','):
+                reader.expect('}')
+                return
+
+
+def iter_catalog(filename, skip=0):
+    """
+    逐条读取目录记录，支持JSONL目录和旧版JSON目录
+
+    Args:
+        filename: 目录文件，.jsonl 按JSONL读取，其他按旧版JSON读取
+        skip: 跳过前 skip 条记录（断点续传），JSONL目录不解析被跳过的行
+
+    Returns:
+        iterator: 记录字典
+    """
+    if not is_jsonl_catalog(filename):
+        return itertools.islice(iter_json_catalog_records(filename), skip, None)
+    return iter_jsonl_catalog_records(filename, skip)
+
+
+def iter_jsonl_catalog_records(filename, skip=0):
+    with open(filename, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if skip:
+                skip -= 1
+                continue
+            try:
+                yield json.loads(line.decode('utf-8'))
+            except ValueError:
+                # 写入过程中崩溃留下的半行
+                continue
+
+
+def read_tail_records(filename, max_bytes=TAIL_READ_BYTES):
+    """
+    只读取文件末尾 max_bytes 字节中的完整记录，用于O(尾部)断点续传
+    """
+    if not os.path.exists(filename):
+        return []
+    size = os.path.getsize(filename)
+    with open(filename, 'rb') as f:
+        start = max(0, size - max_bytes)
+        f.seek(start)
+        chunk = f.read()
+    lines = chunk.split(b'\n')
+    if start > 0:
+        # 第一行可能只读到一半
+        lines = lines[1:]
+    records = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            records.append(json.loads(line.decode('utf-8')))
+        except ValueError:
+            pass
+    return records
+
+
+class CatalogWriter:
+    """
+    JSONL目录写入器
+
+    每次 save() 只追加列表中尚未写入的记录，并在该批次结束时 fsync 一次，
+    然后原子替换元数据文件。写入器记住自己已写入传入列表的前多少条（list_offset），
+    因此调用方可以继续沿用“每次传入完整列表”的保存方式。
+    """
+
+    def __init__(self, filename, list_offset=0, truncate=False):
+        self.filename = filename
+        self.list_offset = list_offset
+
+        if truncate or not os.path.exists(filename):
+            open(filename, 'wb').close()
+            meta = None
+        else:
+            meta = load_catalog_meta(filename)
+
+        size = repair_tail(filename)
+        if meta and meta.get('byte_size', 0) <= size:
+            self.record_count = meta.get('record_count', 0)
+            self.success_count = meta.get('success_count', 0)
+            self.timebegin = meta.get('metadata', {}).get('timebegin')
+            counted_bytes = meta.get('byte_size', 0)
+        else:
+            self.record_count = 0
+            self.success_count = 0
+            self.timebegin = None
+            counted_bytes = 0
+
+        # 元数据之后追加的记录（上次崩溃前已写入但未更新元数据的部分）只需扫描尾部
+        for record in iter_records_from(filename, counted_bytes):
+            self.record_count += 1
+            self.success_count += 1 if is_success_record(record) else 0
+        self.byte_size = size
+
+    def append(self, records):
+        """
+        追加记录并 fsync
+        """
+        if not records:
+            return
+        data = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records).encode('utf-8')
+        with open(self.filename, 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.byte_size += len(data)
+        self.record_count += len(records)
+        self.success_count += sum(1 for record in records if is_success_record(record))
+
+    def write_meta(self, timebegin=None, is_final=False, extra_statistics=None, last_record=None):
+        """
+        原子更新元数据文件
+        """
+        self.timebegin = self.timebegin or timebegin or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        total_count = self.record_count
+        meta = {
+            "metadata": {
+                "timebegin": self.timebegin,
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "total_count": total_count,
+                "success_count": self.success_count,
+                "failed_count": total_count - self.success_count,
+                "description": "获取重定向后的最终URL数据",
+                "is_complete": is_final
+            },
+            "statistics": {
+                "success_rate": f"{(self.success_count/total_count*100):.1f}%" if total_count > 0 else "0%",
+            },
+            "record_count": total_count,
+            "success_count": self.success_count,
+            "byte_size": self.byte_size,
+            "last_record": last_record,
+        }
+        if extra_statistics:
+            meta["statistics"].update(extra_statistics)
+        write_json_atomic(meta_filename(self.filename), meta)
+        return meta
+
+    def save(self, urls, timebegin=None, is_final=False, extra_statistics=None):
+        """
+        追加 urls 中尚未写入的记录并更新元数据
+        """
+        new_records = urls[self.list_offset:]
+        self.append(new_records)
+        self.list_offset = len(urls)
+        last_record = urls[-1] if urls else None
+        return self.write_meta(timebegin, is_final, extra_statistics, last_record)
+
+
+def open_catalog_writer(filename, list_offset=0, truncate=False):
+    """
+    打开并登记目录写入器，之后对同一文件的 save_urls_to_json_batch 调用都会使用它
+    """
+    writer = CatalogWriter(filename, list_offset=list_offset, truncate=truncate)
+    _CATALOG_WRITERS[os.path.abspath(filename)] = writer
+    return writer
+
+
+def get_catalog_writer(filename):
+    """
+    获取已登记的写入器；没有时新建一个完整重写的写入器
+    """
+    writer = _CATALOG_WRITERS.get(os.path.abspath(filename))
+    if writer is None:
+        writer = open_catalog_writer(filename, list_offset=0, truncate=True)
+    return writer
+
+
+def indent_json(value, level):
+    """
+    生成与 json.dump(indent=2) 嵌套在第 level 层时相同的文本
+    """
+    text = json.dumps(value, ensure_ascii=False, indent=2)
+    return text.replace('\n', '\n' + '  ' * level)
+
+
+def compact_catalog(jsonl_filename, json_filename=None):
+    """
+    把JSONL目录压缩为旧版JSON格式 ({metadata, statistics, urls})，逐条流式写出，内存占用不随目录增长
+
+    Args:
+        jsonl_filename: JSONL目录文件
+        json_filename: 输出的JSON文件名，默认把 .jsonl 换成 .json
+
+    Returns:
+        str: 输出文件名
+    """
+    json_filename = json_filename or jsonl_filename[:-len('.jsonl')] + '.json'
+    meta = load_catalog_meta(jsonl_filename) or {}
+    metadata = meta.get("metadata", {})
+    statistics = meta.get("statistics", {})
+
+    temp_filename = f"{json_filename}.tmp"
+    count = 0
+    with open(temp_filename, 'w', encoding='utf-8') as f:
+        f.write('{\n  "metadata": ' + indent_json(metadata, 1) + ',\n')
+        f.write('  "statistics": ' + indent_json(statistics, 1) + ',\n')
+        f.write('  "urls": [')
+        for record in iter_records_from(jsonl_filename):
+            f.write((',' if count else '') + '\n    ' + indent_json(record, 2))
+            count += 1
+        f.write('\n  ]\n}' if count else ']\n}')
+    os.replace(temp_filename, json_filename)
+
+    print(f"🗜️ 已将 {jsonl_filename} 的 {count} 条记录压缩为 {json_filename}")
+    return json_filename